@@ -0,0 +1,104 @@
+import json
+import sqlite3
+import time
+
+from grader_cache import make_cache_key
+
+DEFAULT_AUTOCOMPLETE_CACHE_DB = "autocomplete_cache.db"
+DEFAULT_TTL = 7 * 24 * 3600          # 이 기간 안의 응답은 그대로 사용 (fresh)
+DEFAULT_STALE_TTL = 30 * 24 * 3600   # TTL 이 지나도 이 기간까지는 먼저 돌려주고 뒤에서 갱신 (stale)
+
+FRESH = "fresh"
+STALE = "stale"
+
+
+class AutocompleteCache:
+    """자동완성 응답 캐시 (SQLite, (엔드포인트, 파라미터) 키 + 항목별 TTL)
+
+    lookup 결과가 fresh 면 네트워크 없이 사용하고, stale 이면 캐시 응답을 먼저
+    돌려준 뒤 백그라운드에서 다시 받아 갱신한다 (stale-while-revalidate).
+    stale 기간까지 지난 항목은 없는 것으로 본다. 오프라인 모드에서는 stale
+    기간과 관계없이 저장된 응답을 모두 사용한다.
+    """
+
+    def __init__(self, db_path=DEFAULT_AUTOCOMPLETE_CACHE_DB, ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.stats = {"fresh": 0, "stale": 0, "misses": 0, "stores": 0}
+
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                query TEXT,
+                response TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                ttl REAL NOT NULL
+            ) WITHOUT ROWID"""
+        )
+
+    @staticmethod
+    def make_key(url, params):
+        """엔드포인트 + 파라미터 전체 기반 키"""
+        return make_cache_key({"url": url, "params": params})
+
+    def lookup(self, url, params, offline=False):
+        """(응답 JSON, 상태) 반환 - 상태는 FRESH / STALE, 없거나 만료면 (None, None)"""
+        row = self.conn.execute(
+            "SELECT response, fetched_at, ttl FROM responses WHERE key = ?", (self.make_key(url, params),)
+        ).fetchone()
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None, None
+
+        response, fetched_at, ttl = row
+        age = time.time() - fetched_at
+
+        if age <= ttl:
+            state = FRESH
+        elif offline or age <= max(self.stale_ttl, ttl):
+            state = STALE
+        else:
+            self.stats["misses"] += 1
+            return None, None
+
+        self.stats[state] += 1
+        return json.loads(response), state
+
+    def put(self, url, params, data, ttl=None):
+        """응답 JSON 저장 (ttl 을 주면 이 항목만 다른 TTL 사용)"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, query, response, fetched_at, ttl) VALUES (?, ?, ?, ?, ?)",
+            (self.make_key(url, params), params.get("q"), json.dumps(data, ensure_ascii=False),
+             time.time(), self.ttl if ttl is None else ttl)
+        )
+        self.stats["stores"] += 1
+
+    def purge_expired(self):
+        """stale 기간까지 지난 항목 삭제"""
+        cursor = self.conn.execute(
+            "DELETE FROM responses WHERE ? - fetched_at > MAX(ttl, ?)", (time.time(), self.stale_ttl)
+        )
+        return cursor.rowcount
+
+    def report(self):
+        """캐시 사용 통계 출력 및 반환"""
+        lookups = self.stats["fresh"] + self.stats["stale"] + self.stats["misses"]
+        hit_rate = (self.stats["fresh"] + self.stats["stale"]) / lookups * 100 if lookups else 0.0
+
+        print("📦 자동완성 캐시 통계:")
+        print(f"  - fresh: {self.stats['fresh']}회 / stale: {self.stats['stale']}회 / 미적중: {self.stats['misses']}회 "
+              f"(적중률 {hit_rate:.1f}%)")
+        print(f"  - 신규 저장: {self.stats['stores']}개, 저장된 응답: {len(self)}개")
+
+        return dict(self.stats, hit_rate=hit_rate, entries=len(self))
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import json
+import random
+
+from aiohttp import web
+
+SYNTHETIC_SUFFIXES = ["추천", "비용", "후기", "상담", "잘하는곳"]
+
+
+def synthetic_response(query, fanout=len(SYNTHETIC_SUFFIXES)):
+    """녹화본이 없는 질의용 결정적 가짜 응답 (질의 + 접미사)"""
+    # 끝없이 길어지지 않도록 이미 접미사가 두 번 붙은 질의는 확장하지 않음
+    depth = sum(query.count(suffix) for suffix in SYNTHETIC_SUFFIXES)
+    items = [] if depth >= 2 else [[f"{query} {suffix}", "0"] for suffix in SYNTHETIC_SUFFIXES[:fanout]]
+    return {"query": [query], "items": [items]}
+
+
+def create_app(fixtures=None, synthetic=False, fail_rate=0.0, latency=0.02):
+    """ac.search.naver.com/nx/ac 응답을 재생하는 오프라인 픽스처 서버
+
+    fixtures 는 {질의: 녹화된 응답 JSON} (AutocompleteHarvester.save_recording 결과).
+    녹화본에 없는 질의는 synthetic=True 면 가짜 응답, 아니면 빈 응답을 돌려준다.
+    """
+    fixtures = fixtures or {}
+    stats = {"requests": 0, "failures": 0, "replayed": 0, "queries": {}}
+
+    async def autocomplete(request):
+        query = request.query.get("q", "")
+        stats["requests"] += 1
+        stats["queries"][query] = stats["queries"].get(query, 0) + 1
+
+        if latency:
+            await asyncio.sleep(latency)
+
+        if random.random() < fail_rate:
+            stats["failures"] += 1
+            return web.Response(status=random.choice([429, 500, 503]), text="fixture failure")
+
+        if query in fixtures:
+            stats["replayed"] += 1
+            body = fixtures[query]
+        elif synthetic:
+            body = synthetic_response(query)
+        else:
+            body = {"query": [query], "items": [[]]}
+
+        # 실제 엔드포인트처럼 text/javascript 로 응답
+        return web.Response(text=json.dumps(body, ensure_ascii=False),
+                            content_type="text/javascript", charset="utf-8")
+
+    async def stats_handler(request):
+        return web.json_response(stats)
+
+    app = web.Application()
+    app.router.add_get("/nx/ac", autocomplete)
+    app.router.add_get("/stats", stats_handler)
+    app["stats"] = stats
+    return app
+
+
+def load_fixtures(path):
+    """녹화된 자동완성 응답 파일 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 자동완성 오프라인 픽스처 서버")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--fixtures", help="AutocompleteHarvester.save_recording 으로 저장한 JSON")
+    parser.add_argument("--synthetic", action="store_true", help="녹화본이 없는 질의에 가짜 응답 생성")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else {}
+    print(f"🧪 픽스처 서버 실행: http://127.0.0.1:{args.port}/nx/ac (녹화 {len(fixtures)}개, 실패율 {args.fail_rate})")
+    print(f"   AutocompleteHarvester(base_url='http://127.0.0.1:{args.port}/nx/ac') 로 연결하세요")
+    web.run_app(create_app(fixtures, args.synthetic, args.fail_rate, args.latency),
+                host="127.0.0.1", port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
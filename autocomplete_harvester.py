@@ -0,0 +1,266 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+
+from autocomplete_cache import STALE
+
+NAVER_AUTOCOMPLETE_URL = "https://ac.search.naver.com/nx/ac"
+NAVER_AUTOCOMPLETE_PARAMS = {'con': '0', 'frm': 'nv', 'ans': '2'}
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def parse_autocomplete_response(data) -> List[str]:
+    """네이버 자동완성 JSON 응답에서 키워드 목록 추출 (등장 순서 유지, 중복 제거)"""
+    suggestions = []
+
+    for item in data.get('items', []) if isinstance(data, dict) else []:
+        for suggestion in item:
+            if isinstance(suggestion, list) and len(suggestion) > 0:
+                keyword = suggestion[0]
+                if keyword and isinstance(keyword, str) and len(keyword.strip()) > 0:
+                    suggestions.append(keyword.strip())
+
+    return list(dict.fromkeys(suggestions))
+
+
+def normalize_query(query: str) -> str:
+    """프런티어 중복 판단용 정규화 (공백 정리 + 소문자)"""
+    return ' '.join(query.split()).lower()
+
+
+def run_sync(coroutine):
+    """코루틴을 동기로 실행 - 이미 이벤트 루프가 돌고 있으면 (Jupyter) 별도 스레드에서 실행"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    outcome = {}
+
+    def runner_thread():
+        try:
+            outcome["result"] = asyncio.run(coroutine)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=runner_thread)
+    thread.start()
+    thread.join()
+
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+class RateLimiter:
+    """요청 시작 간격을 일정하게 유지하는 예의(politeness) 속도 제한기"""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second and rate_per_second > 0 else 0.0
+        self.next_time = 0.0
+        self.lock = None
+
+    async def wait(self):
+        """다음 요청 시각까지 대기"""
+        if not self.interval:
+            return
+        if self.lock is None:
+            # Python 3.8 에서는 Lock 이 생성 시점의 루프에 묶이므로 루프 안에서 만든다
+            self.lock = asyncio.Lock()
+
+        async with self.lock:
+            now = time.monotonic()
+            if self.next_time > now:
+                await asyncio.sleep(self.next_time - now)
+                now = self.next_time
+            self.next_time = now + self.interval
+
+
+class AutocompleteHarvester:
+    """비동기 네이버 자동완성 수집기 - 연결 재사용, 속도 제한, BFS 재귀 확장
+
+    시드 → 자동완성 → 자동완성의 자동완성 순서로 너비 우선 확장하며,
+    이미 조회한 질의는 프런티어에서 제외하고 max_depth / max_queries 에서 멈춘다.
+    base_url 을 autocomplete_fixture_server 주소로 바꾸면 오프라인으로 시험할 수 있다.
+    cache 를 주면 같은 질의는 다시 요청하지 않는다 (autocomplete_cache 참고).
+    """
+
+    def __init__(self, base_url: str = NAVER_AUTOCOMPLETE_URL, params: Optional[Dict[str, str]] = None,
+                 headers: Optional[Dict[str, str]] = None, concurrency: int = 4, rate: float = 2.0,
+                 max_depth: int = 2, max_queries: int = 200, max_retries: int = 3,
+                 base_delay: float = 1.0, max_delay: float = 10.0, timeout: float = 5.0,
+                 record: bool = False, verbose: bool = True, cache=None, offline: bool = False):
+        self.base_url = base_url
+        self.params = dict(NAVER_AUTOCOMPLETE_PARAMS if params is None else params)
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.concurrency = concurrency
+        self.rate = rate
+        self.max_depth = max_depth
+        self.max_queries = max_queries
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.verbose = verbose
+
+        # cache: AutocompleteCache (fresh 는 그대로, stale 은 먼저 쓰고 뒤에서 갱신)
+        # offline=True 면 네트워크 없이 캐시에 있는 응답만 사용
+        self.cache = cache
+        self.offline = offline
+        self.revalidations = []
+
+        # record=True 면 원본 응답을 보관해 두었다가 save_recording 으로 픽스처 저장
+        self.recording = OrderedDict() if record else None
+        self.stats = {"requests": 0, "retries": 0, "errors": 0, "cached": 0, "revalidated": 0, "offline_misses": 0}
+
+    def backoff_delay(self, attempt: int) -> float:
+        """지터가 적용된 지수 백오프"""
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(cap / 2, cap)
+
+    async def request(self, session: aiohttp.ClientSession, limiter: RateLimiter, query: str, params: Dict[str, str]):
+        """자동완성 엔드포인트 호출 → 응답 JSON (실패 시 None, 429/5xx/연결 오류는 재시도)"""
+        for attempt in range(self.max_retries + 1):
+            await limiter.wait()
+            self.stats["requests"] += 1
+            try:
+                async with session.get(self.base_url, params=params) as response:
+                    if response.status == 200:
+                        return json.loads(await response.text())
+
+                    if response.status != 429 and response.status < 500:
+                        print(f"   ❌ '{query}' 오류: HTTP {response.status}")
+                        self.stats["errors"] += 1
+                        return None
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                if attempt == self.max_retries:
+                    print(f"   ❌ '{query}' 자동완성 실패: {e}")
+                    self.stats["errors"] += 1
+                    return None
+
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.backoff_delay(attempt))
+
+        print(f"   ❌ '{query}' 자동완성 실패: 재시도 {self.max_retries}회 초과")
+        self.stats["errors"] += 1
+        return None
+
+    async def revalidate(self, session: aiohttp.ClientSession, limiter: RateLimiter, query: str, params: Dict[str, str]):
+        """stale 캐시 항목을 다시 받아 갱신"""
+        data = await self.request(session, limiter, query, params)
+        if data is not None:
+            self.cache.put(self.base_url, params, data)
+            self.stats["revalidated"] += 1
+
+    async def fetch(self, session: aiohttp.ClientSession, limiter: RateLimiter, query: str) -> List[str]:
+        """질의 하나의 자동완성 키워드 조회 (캐시 → 네트워크 순)"""
+        params = dict(self.params, q=query)
+        data = None
+
+        if self.cache is not None:
+            data, state = self.cache.lookup(self.base_url, params, offline=self.offline)
+            if data is not None:
+                self.stats["cached"] += 1
+                if state == STALE and not self.offline:
+                    self.revalidations.append(asyncio.ensure_future(self.revalidate(session, limiter, query, params)))
+
+        if data is None:
+            if self.offline:
+                self.stats["offline_misses"] += 1
+                return []
+            data = await self.request(session, limiter, query, params)
+            if data is None:
+                return []
+            if self.cache is not None:
+                self.cache.put(self.base_url, params, data)
+
+        if self.recording is not None:
+            self.recording[query] = data
+        return parse_autocomplete_response(data)
+
+    async def harvest_async(self, seeds: Iterable[str]) -> Dict[str, Dict]:
+        """시드부터 BFS 로 확장 수집 → {키워드: {"depth", "parent"}} (발견 순서)"""
+        seeds = [seed.strip() for seed in seeds if seed and seed.strip()]
+        discovered = OrderedDict()
+        queried = set()
+        frontier = []
+
+        for seed in seeds:
+            key = normalize_query(seed)
+            if key not in queried:
+                queried.add(key)
+                frontier.append(seed)
+
+        limiter = RateLimiter(self.rate)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        budget = self.max_queries
+        started = time.monotonic()
+
+        async def expand(session, query):
+            async with semaphore:
+                return query, await self.fetch(session, limiter, query)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers) as session:
+            for depth in range(1, self.max_depth + 1):
+                if not frontier or budget <= 0:
+                    break
+
+                batch, frontier = frontier[:budget], []
+                budget -= len(batch)
+                if self.verbose:
+                    print(f"🔍 깊이 {depth}: {len(batch)}개 질의 자동완성 수집 중...")
+
+                results = await asyncio.gather(*(expand(session, query) for query in batch))
+
+                for parent, suggestions in results:
+                    for keyword in suggestions:
+                        key = normalize_query(keyword)
+                        if keyword not in discovered:
+                            discovered[keyword] = {"depth": depth, "parent": parent}
+                        if key not in queried:
+                            queried.add(key)
+                            frontier.append(keyword)
+
+                if self.verbose:
+                    print(f"   ✅ 누적 {len(discovered)}개 키워드 (다음 프런티어 {len(frontier)}개, 남은 예산 {budget}회)")
+
+            # 세션을 닫기 전에 stale 항목 백그라운드 갱신 마무리
+            if self.revalidations:
+                await asyncio.gather(*self.revalidations)
+                self.revalidations = []
+
+        if self.verbose:
+            elapsed = time.monotonic() - started
+            print(f"📊 자동완성 수집 완료: 요청 {self.stats['requests']}회, 캐시 {self.stats['cached']}회, "
+                  f"갱신 {self.stats['revalidated']}회, 재시도 {self.stats['retries']}회, 오류 {self.stats['errors']}회, "
+                  f"{elapsed:.2f}초")
+            if self.offline and self.stats["offline_misses"]:
+                print(f"   ⚠️ 오프라인 모드: 캐시에 없는 질의 {self.stats['offline_misses']}개 건너뜀")
+
+        return discovered
+
+    def harvest(self, seeds: Iterable[str]) -> Dict[str, Dict]:
+        """동기 수집 - 이미 이벤트 루프가 돌고 있으면 (Jupyter) 별도 스레드에서 실행"""
+        return run_sync(self.harvest_async(seeds))
+
+    def save_recording(self, path: str) -> int:
+        """수집한 원본 응답을 픽스처 서버용 JSON 으로 저장"""
+        if self.recording is None:
+            raise ValueError("record=True 로 생성한 수집기만 응답을 저장할 수 있습니다")
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.recording, f, ensure_ascii=False, indent=2)
+
+        print(f"💾 자동완성 응답 {len(self.recording)}개를 {path}에 저장")
+        return len(self.recording)
@@ -0,0 +1,332 @@
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS = "benchmark_results.json"
+DEFAULT_THRESHOLD = 0.2   # 기준 대비 처리량이 20% 넘게 떨어지면 회귀로 판단
+
+DONGRAE_QUERIES = [
+    "부산에서 이혼 변호사 비용이 얼마나 하나요?",
+    "교통사고 났는데 어떻게 해야 하나요?",
+    "부동산 매매계약서 검토받고 싶어요",
+    "회사 설립할 때 필요한 법률 서비스가 뭐가 있나요?",
+    "임금체불 문제로 고민인데 상담받을 수 있나요?",
+    "상속 문제로 분쟁이 생겼는데 도움받을 수 있나요?",
+    "건설업체와 계약분쟁이 있어서 변호사가 필요해요",
+    "세무조사 대응 관련해서 상담받고 싶습니다",
+]
+
+IOVU_QUERIES = [
+    "한국에서 개발자 밈 굿즈 가격이 얼마나 해요?",
+    "너디 패션 브랜드 추천해주세요",
+    "코딩 유머 티셔츠 어디서 사나요?",
+    "개발자 선물로 좋은 굿즈 있나요?",
+    "해커톤에서 쓸 굿즈 주문하고 싶어요",
+    "스타트업 팀티 맞춤 제작 가능한가요?",
+]
+
+OPTIMIZED_TARGETS = [(intent, difficulty) for intent in ("정보", "탐색", "거래") for difficulty in ("쉬움", "보통", "어려움")]
+
+
+class BenchmarkCase:
+    """벤치마크 대상 하나 - 모듈 파일, 생성기 만들기(측정 제외), 생성 실행(측정)
+
+    build(module) 는 실행마다 새 생성기를 만들어 이전 실행의 누적 상태(중복 집합,
+    generated_prompts 등)가 다음 측정에 섞이지 않게 한다.
+    run(generator, size) 는 생성한 항목 수를 돌려준다 (리스트면 len 으로 계산).
+    """
+
+    def __init__(self, name: str, path: str, build: Callable, run: Callable, size: int):
+        self.name = name
+        self.path = path
+        self.build = build
+        self.run = run
+        self.size = size
+
+
+def cycle_queries(queries: List[str], size: int) -> List[str]:
+    return [queries[i % len(queries)] for i in range(size)]
+
+
+def template_call_state(module):
+    """DongraeTemplateGenerator + 난이도×의도 조합 + 파라미터 한 벌"""
+    generator = module.DongraeTemplateGenerator()
+    combos = [(difficulty, intent) for difficulty in ("쉬움", "보통", "어려움") for intent in ("정보조회", "탐색비교", "거래상담")]
+    if hasattr(module, "DongraeLawParameters"):
+        params = module.DongraeLawParameters().get_random_parameters()
+    else:
+        params = dict(region="부산", practice_area="기업법무", metric="수임료")
+    return generator, combos, params
+
+
+def run_template_calls(state, size: int) -> int:
+    """generate_template 을 조합을 돌아가며 size 번 호출"""
+    generator, combos, params = state
+    for i in range(size):
+        difficulty, intent = combos[i % len(combos)]
+        generator.generate_template(difficulty, intent, params)
+    return size
+
+
+CASES = [
+    BenchmarkCase("prompt6.DongraePromptExpander", "prompt6.py",
+                  lambda m: m.DongraePromptExpander(),
+                  lambda g, n: g.generate_additional_prompts(n // 2, n - n // 2), 100),
+    BenchmarkCase("prompt7.DongraePromptExpander", "prompt7.py",
+                  lambda m: m.DongraePromptExpander(),
+                  lambda g, n: g.generate_additional_prompts(n // 3, n // 3, n - 2 * (n // 3)), 90),
+    BenchmarkCase("prompt8.InfoFocusedPromptGenerator", "prompt8.py",
+                  lambda m: m.InfoFocusedPromptGenerator(),
+                  lambda g, n: g.generate_info_prompts(n // 2, n - n // 2), 100),
+    BenchmarkCase("prompt9.DongraeGraderOptimizedGenerator", "prompt9.py",
+                  lambda m: m.DongraeGraderOptimizedGenerator(),
+                  lambda g, n: g.generate_high_quality_batch({key: n // len(OPTIMIZED_TARGETS) for key in OPTIMIZED_TARGETS}),
+                  180),
+    BenchmarkCase("dongrae.prompt6.DongraePromptExpander", "dongrae/prompt6.py",
+                  lambda m: m.DongraePromptExpander(),
+                  lambda g, n: g.generate_additional_prompts(n // 2, n - n // 2), 100),
+    BenchmarkCase("dongrae.prompt7.DongraePromptExpander", "dongrae/prompt7.py",
+                  lambda m: m.DongraePromptExpander(),
+                  lambda g, n: g.generate_additional_prompts(n // 3, n // 3, n - 2 * (n // 3)), 90),
+    BenchmarkCase("dongrae.template.DongraeTemplateGenerator", "dongrae/template.py",
+                  template_call_state, run_template_calls, 20000),
+    BenchmarkCase("dongrae.para_tem.DongraeTemplateGenerator", "dongrae/para_tem.py",
+                  template_call_state, run_template_calls, 20000),
+    BenchmarkCase("dongrae.para_tem.DongrageLawIntegratedSystem", "dongrae/para_tem.py",
+                  lambda m: m.DongrageLawIntegratedSystem(),
+                  lambda g, n: [g.generate_dongrae_prompt(q) for q in cycle_queries(DONGRAE_QUERIES, n)], 500),
+    BenchmarkCase("dongrae.prompt.MassivePromptGenerator", "dongrae/prompt.py",
+                  lambda m: m.MassivePromptGenerator(),
+                  lambda g, n: g.generate_massive_prompts(n), 500),
+    BenchmarkCase("dongrae.prompt2.DongrageLawIntegratedSystem", "dongrae/prompt2.py",
+                  lambda m: m.DongrageLawIntegratedSystem(),
+                  lambda g, n: [g.generate_dongrae_prompt(q) for q in cycle_queries(DONGRAE_QUERIES, n)], 500),
+    BenchmarkCase("dongrae.prompt3.DongrageLawIntegratedSystem", "dongrae/prompt3.py",
+                  lambda m: m.DongrageLawIntegratedSystem(),
+                  lambda g, n: [g.generate_dongrae_prompt(q) for q in cycle_queries(DONGRAE_QUERIES, n)], 500),
+    BenchmarkCase("dongrae.prompt4.DongrageLawIntegratedSystem", "dongrae/prompt4.py",
+                  lambda m: m.DongrageLawIntegratedSystem(),
+                  lambda g, n: [g.generate_dongrae_prompt(q) for q in cycle_queries(DONGRAE_QUERIES, n)], 500),
+    BenchmarkCase("iovu.para_tem.IOVUSystemGenerator", "iovu/para_tem.py",
+                  lambda m: m.IOVUSystemGenerator(),
+                  lambda g, n: [g.create_difficulty_intent_table() for _ in range(n)], 200),
+    BenchmarkCase("iovu.prompt.IOVUIntegratedSystem", "iovu/prompt.py",
+                  lambda m: m.IOVUIntegratedSystem(),
+                  lambda g, n: [g.generate_iovu_prompt(q) for q in cycle_queries(IOVU_QUERIES, n)], 500),
+    BenchmarkCase("iovu.prompt1.IOVUIntegratedSystem", "iovu/prompt1.py",
+                  lambda m: m.IOVUIntegratedSystem(),
+                  lambda g, n: [g.generate_iovu_prompt(q) for q in cycle_queries(IOVU_QUERIES, n)], 500),
+    BenchmarkCase("iovu.prompt2.IOVUSuccessfulPromptGenerator", "iovu/prompt2.py",
+                  lambda m: m.IOVUSuccessfulPromptGenerator(),
+                  lambda g, n: g.generate_balanced_dataset(n), 3000),
+    BenchmarkCase("iovu.prompt3.IOVUAdvancedPromptGenerator", "iovu/prompt3.py",
+                  lambda m: m.IOVUAdvancedPromptGenerator(),
+                  lambda g, n: g.generate_balanced_dataset(n), 3000),
+    BenchmarkCase("iovu.prompt4.IOVUPromptGenerator", "iovu/prompt4.py",
+                  lambda m: m.IOVUPromptGenerator(),
+                  lambda g, n: g.generate_batch_prompts(n), 20000),
+    BenchmarkCase("iovu.prompt4.IOVUPromptGenerator.parallel", "iovu/prompt4.py",
+                  lambda m: m.IOVUPromptGenerator(),
+                  lambda g, n: g.generate_batch_prompts_parallel(n, workers=2, seed=0), 20000),
+]
+
+
+def find_cases(patterns: Optional[List[str]] = None) -> List[BenchmarkCase]:
+    """이름에 패턴 중 하나라도 들어 있는 케이스 (없으면 전체)"""
+    if not patterns:
+        return list(CASES)
+    return [case for case in CASES if any(pattern in case.name for pattern in patterns)]
+
+
+def load_module(path: str):
+    """저장소 파일을 고유 이름의 모듈로 로드 (dongrae/iovu 의 같은 파일명 충돌 방지)
+
+    모듈 디렉터리를 sys.path 앞에 두어 같은 폴더 import (from para_tem import ...) 도 동작한다.
+    모듈 최상위의 데모 출력은 버린다.
+    """
+    full_path = os.path.join(ROOT, path)
+    for directory in (ROOT, os.path.dirname(full_path)):
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+
+    name = "bench_" + path[:-3].replace("/", "_")
+    spec = importlib.util.spec_from_file_location(name, full_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+
+def measure_case(case: BenchmarkCase, size: int, repeat: int = 5, warmup: int = 1) -> Dict:
+    """현재 프로세스에서 케이스 측정 - 워밍업, 반복 실행(perf_counter), tracemalloc 최대 메모리"""
+    module = load_module(case.path)
+    quiet = io.StringIO()
+
+    def once(trace: bool = False):
+        with contextlib.redirect_stdout(quiet):
+            generator = case.build(module)
+            gc.collect()
+            if trace:
+                tracemalloc.start()
+            started = time.perf_counter()
+            result = case.run(generator, size)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if trace else None
+            if trace:
+                tracemalloc.stop()
+        quiet.seek(0)
+        quiet.truncate()
+        items = len(result) if isinstance(result, (list, tuple, dict)) else int(result)
+        return elapsed, items, peak
+
+    for _ in range(warmup):
+        once()
+
+    runs = []
+    items = 0
+    for _ in range(repeat):
+        elapsed, items, _ = once()
+        runs.append(elapsed)
+
+    # 메모리는 따로 한 번 (tracemalloc 이 켜져 있으면 시간이 왜곡되므로)
+    _, _, peak = once(trace=True)
+
+    median = statistics.median(runs)
+    return {
+        "path": case.path,
+        "size": size,
+        "items": items,
+        "runs": [round(run, 6) for run in runs],
+        "best": round(min(runs), 6),
+        "median": round(median, 6),
+        "stdev": round(statistics.stdev(runs), 6) if len(runs) > 1 else 0.0,
+        "throughput": round(items / median, 2) if median > 0 else None,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def run_case_isolated(case: BenchmarkCase, size: int, repeat: int, warmup: int, timeout: float = 1800) -> Dict:
+    """케이스마다 새 파이썬 프로세스에서 측정 (모듈 캐시/메모리가 케이스끼리 섞이지 않게)"""
+    command = [sys.executable, os.path.abspath(__file__), "--worker", case.name,
+               "--size", str(size), "--repeat", str(repeat), "--warmup", str(warmup)]
+    completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout, cwd=os.getcwd())
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        error = (completed.stderr.strip().splitlines() or ["알 수 없는 오류"])[-1]
+        return {"path": case.path, "error": error}
+    return json.loads(lines[-1])
+
+
+def run_suite(patterns: Optional[List[str]] = None, repeat: int = 5, warmup: int = 1, scale: float = 1.0,
+              isolated: bool = True) -> Dict:
+    """케이스들을 측정해 결과 dict 로 (JSON 저장 형식)"""
+    cases = find_cases(patterns)
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "scale": scale,
+        "cases": {},
+    }
+
+    print(f"⏱️ 벤치마크 {len(cases)}개 케이스 (반복 {repeat}회, 워밍업 {warmup}회, 규모 x{scale})")
+    for case in cases:
+        size = max(1, int(case.size * scale))
+        if isolated:
+            result = run_case_isolated(case, size, repeat, warmup)
+        else:
+            try:
+                result = measure_case(case, size, repeat, warmup)
+            except Exception as e:
+                result = {"path": case.path, "error": f"{type(e).__name__}: {e}"}
+
+        results["cases"][case.name] = result
+        if "error" in result:
+            print(f"  ❌ {case.name}: {result['error']}")
+        else:
+            print(f"  - {case.name}: {result['items']:,}개, 중앙값 {result['median']:.4f}초 "
+                  f"({result['throughput']:,.0f}개/초), 최대 메모리 {result['peak_kb']:,.0f} KB")
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """기준 결과 대비 처리량이 threshold 넘게 떨어진 케이스 목록"""
+    regressions = []
+    print(f"\n📊 기준 대비 처리량 (허용 하락 {threshold:.0%})")
+    for name, result in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base or not base.get("throughput") or not result.get("throughput"):
+            continue
+        ratio = result["throughput"] / base["throughput"]
+        regressed = ratio < 1 - threshold
+        mark = "❌" if regressed else "✅"
+        print(f"  {mark} {name}: {base['throughput']:,.0f} → {result['throughput']:,.0f}개/초 ({ratio - 1:+.1%})")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="프롬프트 생성기 벤치마크 (회귀 확인용 JSON 저장)")
+    parser.add_argument("patterns", nargs="*", help="케이스 이름 일부 (없으면 전체)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--scale", type=float, default=1.0, help="케이스별 기본 생성 개수에 곱할 배수")
+    parser.add_argument("--output", default=DEFAULT_RESULTS, help="결과 JSON 경로 ('' 이면 저장 안 함)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--in-process", action="store_true", help="케이스를 별도 프로세스 없이 측정")
+    parser.add_argument("--list", action="store_true", help="케이스 목록만 출력")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        # run_case_isolated 가 띄운 측정 프로세스 - 마지막 줄에 결과 JSON
+        case = next(case for case in CASES if case.name == args.worker)
+        print(json.dumps(measure_case(case, args.size or case.size, args.repeat, args.warmup), ensure_ascii=False))
+        return 0
+
+    if args.list:
+        for case in find_cases(args.patterns):
+            print(f"  {case.name} ({case.path}, 기본 {case.size:,}개)")
+        return 0
+
+    results = run_suite(args.patterns, args.repeat, args.warmup, args.scale, isolated=not args.in_process)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+    failed = [name for name, result in results["cases"].items() if "error" in result]
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"❌ 처리량 회귀 {len(regressions)}건: {', '.join(regressions)}")
+            return 1
+        print("✅ 처리량 회귀 없음")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+import os
+import sys
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# 반복되는 라벨 컬럼은 사전(dictionary) 인코딩해서 저장 → 읽을 때 pandas Categorical
+CATEGORICAL_COLUMNS = {
+    '의도', '난이도', '도메인', '언어', '키워드_포함',
+    '추출된_의도', '추출된_난이도', '추출된_버킷타입', '검수_통과',
+    '원본_의도', '원본_난이도',
+}
+
+CSV_CHUNK_ROWS = 50000   # csv_to_parquet 이 한 번에 읽을 행 수
+
+# 단계별 고정 스키마 (컬럼 순서 + 타입). 데이터에 없는 컬럼은 null 로 채워 스키마를 유지한다.
+STAGE_SCHEMAS = {
+    # prompt6/7/8 등 생성기 출력
+    "generated": [
+        ('번호', pa.int64()), ('질문', pa.string()), ('의도', pa.string()), ('난이도', pa.string()),
+        ('도메인', pa.string()), ('언어', pa.string()), ('어절수', pa.int64()), ('키워드_포함', pa.string()),
+    ],
+    # prompt9 최적화 생성기 출력
+    "optimized": [
+        ('번호', pa.int64()), ('질문', pa.string()), ('의도', pa.string()), ('난이도', pa.string()),
+        ('도메인', pa.string()), ('언어', pa.string()), ('어절수', pa.int64()), ('예상점수', pa.float64()),
+        ('키워드_포함', pa.string()),
+    ],
+    # 검수 결과 / merge / 중복 제거 / 균형 필터 단계
+    "reviewed": [
+        ('원본_행', pa.int64()), ('질문', pa.string()), ('추출된_의도', pa.string()),
+        ('추출된_난이도', pa.string()), ('추출된_버킷타입', pa.string()), ('검수_점수', pa.float64()),
+        ('검수_통과', pa.string()), ('검수_사유', pa.string()), ('원본_의도', pa.string()),
+        ('원본_난이도', pa.string()),
+    ],
+}
+
+
+def parquet_path(csv_path):
+    """CSV 경로에 대응하는 Parquet 경로"""
+    base, _ = os.path.splitext(csv_path)
+    return f"{base}.parquet"
+
+
+def infer_stage(columns):
+    """컬럼 구성으로 단계 추정 (일치하는 스키마가 없으면 None)"""
+    columns = set(columns)
+    best_stage, best_overlap = None, 0
+    for stage, fields in STAGE_SCHEMAS.items():
+        names = {name for name, _ in fields}
+        overlap = len(names & columns)
+        # 스키마 컬럼의 대부분이 있어야 해당 단계로 본다
+        if overlap >= len(names) * 0.8 and overlap > best_overlap:
+            best_stage, best_overlap = stage, overlap
+    return best_stage
+
+
+def _as_strings(values):
+    """결측은 None 으로 두고 나머지는 문자열로 변환"""
+    return pa.array([None if pd.isna(v) else str(v) for v in values], type=pa.string())
+
+
+def _column_array(name, values, arrow_type=None):
+    """한 컬럼을 Arrow 배열로 변환 (라벨 컬럼은 사전 인코딩)"""
+    if name in CATEGORICAL_COLUMNS:
+        return _as_strings(values).dictionary_encode()
+
+    if arrow_type is None:
+        try:
+            return pa.array(values, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # 숫자와 문자열이 섞인 컬럼 등은 문자열로 저장
+            return _as_strings(values)
+
+    if pa.types.is_boolean(arrow_type):
+        return pa.array(values, type=arrow_type, from_pandas=True)
+
+    if pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type):
+        numeric = pd.to_numeric(values, errors='coerce')
+        blank = values.isna() | (values.astype(str).str.strip() == '')
+        if (numeric.isna() & ~blank).any() or (pa.types.is_integer(arrow_type) and (numeric.dropna() % 1 != 0).any()):
+            # '0.85, 0.9' 처럼 스키마 타입으로 바꿀 수 없는 값이 있으면 원본 보존을 위해 문자열로 저장
+            print(f"⚠️ '{name}' 컬럼에 {arrow_type} 로 바꿀 수 없는 값이 있어 문자열로 저장합니다")
+            return _as_strings(values)
+        return pa.array(numeric, type=arrow_type, from_pandas=True)
+
+    return _as_strings(values)
+
+
+def to_arrow_table(data, stage=None, extra_types=None):
+    """DataFrame / dict 리스트 → Arrow 테이블 (단계 스키마 순서 + 나머지 컬럼)
+
+    extra_types 로 스키마 밖 컬럼의 Arrow 타입을 정해 줄 수 있다 (없으면 값으로 추론).
+    """
+    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data))
+    if stage is None:
+        stage = infer_stage(df.columns)
+
+    fields = STAGE_SCHEMAS.get(stage, [])
+    schema_names = [name for name, _ in fields]
+    arrays, names = [], []
+
+    for name, arrow_type in fields:
+        if name in df.columns:
+            arrays.append(_column_array(name, df[name], arrow_type))
+        elif name in CATEGORICAL_COLUMNS:
+            arrays.append(pa.nulls(len(df), pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.nulls(len(df), arrow_type))
+        names.append(name)
+
+    for name in df.columns:
+        if name not in schema_names:
+            arrays.append(_column_array(name, df[name], (extra_types or {}).get(name)))
+            names.append(name)
+
+    metadata = {b'stage': stage.encode('utf-8')} if stage else None
+    return pa.Table.from_arrays(arrays, names=names, metadata=metadata)
+
+
+def write_parquet(data, path, stage=None):
+    """Parquet 파일로 저장 (라벨 컬럼 사전 인코딩, zstd 압축)"""
+    table = to_arrow_table(data, stage)
+    pq.write_table(table, path, compression='zstd')
+    return path
+
+
+def read_table(path, columns=None):
+    """Parquet 또는 CSV 를 DataFrame 으로 읽기 (필요한 컬럼만 읽을 수 있음)
+
+    Parquet 은 요청한 컬럼만 디스크에서 읽고, 라벨 컬럼은 Categorical 로 돌아온다.
+    CSV 는 utf-8-sig 로 읽은 뒤 라벨 컬럼을 같은 Categorical 로 맞춘다.
+    """
+    if path.endswith('.parquet'):
+        return pq.read_table(path, columns=columns).to_pandas()
+
+    df = pd.read_csv(path, encoding='utf-8-sig', usecols=columns)
+    for name in df.columns:
+        if name in CATEGORICAL_COLUMNS:
+            df[name] = df[name].astype('category')
+    return df
+
+
+def csv_column_dtypes(path, chunksize=CSV_CHUNK_ROWS):
+    """CSV 를 청크로 훑어 read_table 이 파일 전체를 읽을 때 정할 컬럼 타입을 구함
+
+    청크마다 따로 추론하면 정수/실수/문자열이 청크별로 달라질 수 있으므로 한 번 훑어서 합친다.
+    (모든 청크가 정수 → int64, 정수/실수/빈 값 섞임 → float64, 문자열이 한 번이라도 → 문자열)
+    """
+    kinds = {}
+    for chunk in pd.read_csv(path, encoding='utf-8-sig', chunksize=chunksize):
+        for name, dtype in chunk.dtypes.items():
+            kinds.setdefault(name, set()).add(dtype.kind)
+
+    dtypes = {}
+    for name, seen in kinds.items():
+        if seen <= {'i'}:
+            dtypes[name] = 'int64'
+        elif seen <= {'i', 'f'}:
+            dtypes[name] = 'float64'
+        elif seen == {'b'}:
+            dtypes[name] = 'bool'
+        else:
+            dtypes[name] = str
+    return dtypes
+
+
+# csv_column_dtypes 결과 → Arrow 타입
+DTYPE_ARROW_TYPES = {'int64': pa.int64(), 'float64': pa.float64(), 'bool': pa.bool_(), str: pa.string()}
+
+
+def csv_to_parquet(csv_path, path=None, stage=None, chunksize=CSV_CHUNK_ROWS):
+    """CSV → Parquet 청크 단위 변환 (메모리 사용량 일정, read_table + write_parquet 과 같은 타입)
+
+    스키마 밖 컬럼의 타입도 파일 전체 기준으로 정해 모든 청크에 넘긴다
+    (청크 전체가 빈 값인 컬럼이 null 타입으로 추론되지 않도록). 실패하면 쓰다 만 Parquet 은 지운다.
+    """
+    path = path or parquet_path(csv_path)
+    dtypes = csv_column_dtypes(csv_path, chunksize)
+    extra_types = {name: DTYPE_ARROW_TYPES[dtype] for name, dtype in dtypes.items()}
+    writer = None
+    try:
+        for chunk in pd.read_csv(csv_path, encoding='utf-8-sig', dtype=dtypes, chunksize=chunksize):
+            table = to_arrow_table(chunk, stage, extra_types)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+            elif table.schema != writer.schema:
+                # 스키마 타입으로 못 바꾼 값이 일부 청크에만 있으면 문자열로 저장된 청크가 생김
+                raise ValueError(f"청크마다 Parquet 스키마가 다릅니다 ({csv_path}) - write_parquet 으로 한 번에 변환하세요")
+            writer.write_table(table)
+
+        if writer is None:
+            # 헤더만 있는 CSV
+            write_parquet(pd.read_csv(csv_path, encoding='utf-8-sig', nrows=0), path, stage)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            writer = None
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
+
+def check_chunked_conversion(rows=200, chunksize=37):
+    """csv_to_parquet 과 read_table + write_parquet 결과 비교 (앞쪽 청크 전체가 빈 컬럼 포함)
+
+    스키마 밖 텍스트 컬럼 '메모' 는 앞 절반이 비어 있어 첫 청크들은 값이 하나도 없다.
+    """
+    df = pd.DataFrame({
+        '원본_행': range(rows),
+        '질문': [f"부산 변호사 상담 질문 {i}" for i in range(rows)],
+        '검수_점수': [0.5 + (i % 5) / 10 for i in range(rows)],
+        '메모': ['' if i < rows // 2 else f"메모 {i}" for i in range(rows)],
+        '횟수': [None if i < rows // 2 else i for i in range(rows)],
+    })
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = os.path.join(temp_dir, "check.csv")
+        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+        chunked = pq.read_table(csv_to_parquet(csv_path, chunksize=chunksize))
+        whole = to_arrow_table(read_table(csv_path), infer_stage(df.columns))
+    if not chunked.equals(whole):
+        raise AssertionError(f"청크 변환 결과가 다릅니다\n{chunked.schema}\n---\n{whole.schema}")
+    return chunked.num_rows
+
+
+def export_csv(source, csv_path):
+    """Parquet 파일 또는 DataFrame 을 CSV(utf-8-sig) 로 내보내기"""
+    df = read_table(source) if isinstance(source, str) else source
+    df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+    return csv_path
+
+
+def main():
+    """CSV 파일들을 Parquet 으로 변환 (같은 이름의 .parquet 생성)"""
+    csv_files = sys.argv[1:]
+    if not csv_files:
+        print("사용법: python columnar_store.py <CSV 파일> [<CSV 파일> ...] | --check")
+        return
+
+    if csv_files == ['--check']:
+        count = check_chunked_conversion()
+        print(f"✅ 청크 변환 확인 완료 ({count}행, 빈 청크 포함)")
+        return
+
+    for csv_file in csv_files:
+        try:
+            df = read_table(csv_file)
+        except FileNotFoundError:
+            print(f"❌ 파일을 찾을 수 없습니다: {csv_file}")
+            continue
+
+        stage = infer_stage(df.columns)
+        output = write_parquet(df, parquet_path(csv_file), stage)
+        csv_size = os.path.getsize(csv_file)
+        parquet_size = os.path.getsize(output)
+        print(f"✅ {csv_file} → {output} ({len(df)}행, 단계: {stage or '자동'}, "
+              f"{csv_size / 1024:.1f} KB → {parquet_size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
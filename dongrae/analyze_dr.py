@@ -6,24 +6,36 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
 import re
 import csv
+import os
+import sys
 from collections import Counter
 from urllib.parse import urljoin, urlparse
 import time
 import json
 from typing import List, Dict, Set
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from site_crawler import SiteCrawler, parse_page, strip_extras, DEFAULT_CRAWL_CACHE
+from korean_tokenizer import tokenize
+
 class WebsiteKeywordExtractor:
     """웹사이트에서 키워드 추출 및 검색가능성 분석"""
     
-    def __init__(self, website_url: str):
+    def __init__(self, website_url: str, max_pages: int = 30, max_depth: int = 3,
+                 crawl_cache: str = DEFAULT_CRAWL_CACHE):
         self.website_url = website_url
         self.domain = urlparse(website_url).netloc
         self.extracted_keywords = {}
         self.search_results = {}
         
+        # 사이트 크롤링 예산 (website_url 을 site_fixture_server 로 바꾸면 오프라인 실행)
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.crawl_cache = crawl_cache
+        self.keyword_counter = Counter()
+        
     def fetch_website_content(self) -> Dict:
         """웹사이트 콘텐츠 가져오기"""
         print(f"🔍 웹사이트 분석 중: {self.website_url}")
@@ -36,48 +48,9 @@ class WebsiteKeywordExtractor:
             response = requests.get(self.website_url, headers=headers, timeout=10)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # 메타 정보 추출
-                title = soup.find('title').get_text() if soup.find('title') else ""
-                meta_description = ""
-                meta_keywords = ""
-                
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                if meta_desc:
-                    meta_description = meta_desc.get('content', '')
-                
-                meta_kw = soup.find('meta', attrs={'name': 'keywords'})
-                if meta_kw:
-                    meta_keywords = meta_kw.get('content', '')
-                
-                # 본문 텍스트 추출
-                # 스크립트, 스타일 태그 제거
-                for script in soup(["script", "style"]):
-                    script.decompose()
-                
-                body_text = soup.get_text()
-                
-                # 헤딩 태그 추출
-                headings = {}
-                for i in range(1, 7):
-                    h_tags = soup.find_all(f'h{i}')
-                    headings[f'h{i}'] = [tag.get_text().strip() for tag in h_tags]
-                
-                # 링크 텍스트 추출
-                links = soup.find_all('a')
-                link_texts = [link.get_text().strip() for link in links if link.get_text().strip()]
-                
-                result = {
-                    'status': 'success',
-                    'title': title.strip(),
-                    'meta_description': meta_description.strip(),
-                    'meta_keywords': meta_keywords.strip(),
-                    'body_text': body_text.strip(),
-                    'headings': headings,
-                    'link_texts': link_texts,
-                    'url': self.website_url
-                }
+                result = strip_extras(parse_page(self.website_url, response.content))
+                title = result['title']
+                meta_description = result['meta_description']
                 
                 print(f"   ✅ 웹사이트 분석 완료")
                 print(f"   📄 제목: {title[:50]}...")
@@ -93,9 +66,44 @@ class WebsiteKeywordExtractor:
             print(f"   ❌ 웹사이트 접근 오류: {e}")
             return {'status': 'error', 'message': str(e)}
     
-    def extract_keywords_from_content(self, content: Dict) -> List[str]:
-        """웹사이트 콘텐츠에서 키워드 추출"""
-        print("🔤 키워드 추출 중...")
+    def crawl_website_content(self) -> Dict:
+        """사이트 전체 크롤링 (같은 도메인 링크, robots.txt 준수, 페이지/깊이 예산)
+        
+        파싱된 페이지는 도착하는 대로 extract_keywords_from_content 에 넘겨
+        self.keyword_counter 에 누적한다. 반환값은 첫 페이지 콘텐츠 + 'pages' (URL 목록).
+        """
+        print(f"🔍 웹사이트 크롤링 중: {self.website_url} (최대 {self.max_pages}페이지, 깊이 {self.max_depth})")
+        
+        self.keyword_counter = Counter()
+        crawler = SiteCrawler(self.website_url, max_pages=self.max_pages, max_depth=self.max_depth,
+                              cache_path=self.crawl_cache)
+        
+        def on_page(page):
+            self.extract_keywords_from_content(page, self.keyword_counter, verbose=False)
+        
+        try:
+            pages = crawler.crawl(on_page)
+        except Exception as e:
+            print(f"   ❌ 웹사이트 접근 오류: {e}")
+            return {'status': 'error', 'message': str(e)}
+        
+        if not pages:
+            return {'status': 'error', 'message': '가져온 페이지가 없습니다'}
+        
+        result = strip_extras(pages[0])
+        result['pages'] = [page['url'] for page in pages]
+        
+        print(f"   ✅ 웹사이트 분석 완료 ({len(pages)}페이지)")
+        print(f"   📄 제목: {result['title'][:50]}...")
+        print(f"   📝 메타 설명: {result['meta_description'][:50]}...")
+        
+        return result
+    
+    def extract_keywords_from_content(self, content: Dict, keyword_counter: Counter = None,
+                                      verbose: bool = True) -> List[str]:
+        """웹사이트 콘텐츠에서 키워드 추출 (keyword_counter 를 주면 그 빈도에 누적)"""
+        if verbose:
+            print("🔤 키워드 추출 중...")
         
         if content['status'] != 'success':
             return []
@@ -133,9 +141,16 @@ class WebsiteKeywordExtractor:
             keywords.extend(link_keywords)
         
         # 빈도수 계산
-        keyword_counter = Counter(keywords)
+        if keyword_counter is None:
+            keyword_counter = Counter()
+        keyword_counter.update(keywords)
         
-        # 상위 키워드 반환
+        if not verbose:
+            return [kw for kw, count in keyword_counter.most_common(100)]
+        return self.report_keywords(keyword_counter)
+    
+    def report_keywords(self, keyword_counter: Counter) -> List[str]:
+        """누적 빈도에서 상위 키워드 반환 + 출력"""
         top_keywords = [kw for kw, count in keyword_counter.most_common(100)]
         
         print(f"   ✅ {len(top_keywords)}개 키워드 추출 완료")
@@ -154,8 +169,8 @@ class WebsiteKeywordExtractor:
         text = re.sub(r'[^\w\s가-힣]', ' ', text)
         text = re.sub(r'\s+', ' ', text).strip()
         
-        # 단어 분리
-        words = text.split()
+        # 형태소 단위로 분리 (조사/어미 제거: 법무법인은 → 법무법인, 이혼관련 → 이혼 + 관련)
+        words = tokenize(text)
         
         # 불용어 제거
         stopwords = {
@@ -325,9 +340,9 @@ class WebsiteKeywordExtractor:
         print(f"🚀 웹사이트 키워드 분석 시작: {self.website_url}")
         print("=" * 60)
         
-        # 1. 웹사이트 콘텐츠 가져오기
+        # 1. 웹사이트 콘텐츠 가져오기 (여러 페이지 크롤링)
         print("\n1️⃣ 웹사이트 콘텐츠 분석")
-        content = self.fetch_website_content()
+        content = self.crawl_website_content()
         
         if content['status'] != 'success':
             print(f"❌ 웹사이트 분석 실패: {content.get('message', '알 수 없는 오류')}")
@@ -335,7 +350,8 @@ class WebsiteKeywordExtractor:
         
         # 2. 키워드 추출
         print("\n2️⃣ 웹사이트에서 키워드 추출")
-        extracted_keywords = self.extract_keywords_from_content(content)
+        print("🔤 키워드 추출 중...")
+        extracted_keywords = self.report_keywords(self.keyword_counter)
         
         # 3. SEO 키워드 생성
         print("\n3️⃣ SEO 최적화 키워드 생성")
@@ -355,6 +371,7 @@ class WebsiteKeywordExtractor:
         print("\n6️⃣ 분석 결과 요약")
         print("=" * 60)
         print(f"🎉 분석 완료!")
+        print(f"📄 분석한 페이지: {len(content['pages'])}개")
         print(f"📊 추출된 키워드: {len(extracted_keywords)}개")
         print(f"🚀 SEO 키워드: {len(seo_keywords)}개")
         print(f"💾 결과 파일: {filename}")
@@ -4,69 +4,66 @@
 """
 
 # 1단계: 필요한 라이브러리 설치 및 임포트
-import requests
 import json
-import time
 import csv
+import os
+import sys
 from typing import List, Dict
 from urllib.parse import quote
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from autocomplete_harvester import AutocompleteHarvester, NAVER_AUTOCOMPLETE_URL
+from autocomplete_cache import AutocompleteCache, DEFAULT_AUTOCOMPLETE_CACHE_DB
+
 class SimpleKeywordExtractor:
     """간단한 키워드 추출기 - 초보자용"""
     
-    def __init__(self):
+    def __init__(self, autocomplete_url: str = NAVER_AUTOCOMPLETE_URL, max_depth: int = 2, max_queries: int = 60,
+                 use_cache: bool = True, offline: bool = False, cache_path: str = DEFAULT_AUTOCOMPLETE_CACHE_DB):
         self.brand_name = "법무법인 동래"
         self.location = "연제구"
         self.keywords = []
         
+        # 네이버 자동완성 수집 설정 (autocomplete_url 을 픽스처 서버로 바꾸면 오프라인 실행)
+        self.autocomplete_url = autocomplete_url
+        self.max_depth = max_depth
+        self.max_queries = max_queries
+        
+        # 자동완성 응답 캐시 (재실행 시 네트워크 없이 재사용, offline=True 면 캐시만 사용)
+        self.offline = offline
+        self.cache = AutocompleteCache(cache_path) if use_cache or offline else None
+        
     def get_naver_autocomplete(self, query: str) -> List[str]:
-        """네이버 자동완성 키워드 가져오기"""
+        """네이버 자동완성 키워드 가져오기 (단일 질의)"""
         print(f"🔍 네이버에서 '{query}' 자동완성 검색 중...")
         
-        try:
-            # 네이버 자동완성 API 호출
-            url = "https://ac.search.naver.com/nx/ac"
-            params = {
-                'q': query,
-                'con': '0',
-                'frm': 'nv',
-                'ans': '2'
-            }
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, params=params, headers=headers, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                suggestions = []
-                
-                # JSON 응답에서 키워드 추출
-                for item in data.get('items', []):
-                    for suggestion in item:
-                        if isinstance(suggestion, list) and len(suggestion) > 0:
-                            keyword = suggestion[0]
-                            if keyword and isinstance(keyword, str) and len(keyword.strip()) > 0:
-                                suggestions.append(keyword.strip())
-                
-                # 중복 제거 및 정리
-                unique_suggestions = list(set(suggestions))
-                print(f"   ✅ {len(unique_suggestions)}개 키워드 발견")
-                
-                # 결과 출력
-                for i, keyword in enumerate(unique_suggestions[:10], 1):
-                    print(f"   {i}. {keyword}")
-                
-                return unique_suggestions
-            else:
-                print(f"   ❌ 오류: HTTP {response.status_code}")
-                return []
-                
-        except Exception as e:
-            print(f"   ❌ 네이버 자동완성 오류: {e}")
-            return []
+        harvester = AutocompleteHarvester(base_url=self.autocomplete_url, max_depth=1, verbose=False,
+                                          cache=self.cache, offline=self.offline)
+        unique_suggestions = list(harvester.harvest([query]))
+        print(f"   ✅ {len(unique_suggestions)}개 키워드 발견")
+        
+        # 결과 출력
+        for i, keyword in enumerate(unique_suggestions[:10], 1):
+            print(f"   {i}. {keyword}")
+        
+        return unique_suggestions
+    
+    def harvest_naver_autocomplete(self, seeds: List[str]) -> List[str]:
+        """시드에서 시작해 자동완성의 자동완성까지 BFS 로 수집 (연결 재사용 + 속도 제한)"""
+        harvester = AutocompleteHarvester(
+            base_url=self.autocomplete_url,
+            max_depth=self.max_depth,
+            max_queries=self.max_queries,
+            cache=self.cache,
+            offline=self.offline
+        )
+        harvested = harvester.harvest(seeds)
+        
+        # 결과 출력
+        for i, (keyword, info) in enumerate(list(harvested.items())[:10], 1):
+            print(f"   {i}. {keyword} (깊이 {info['depth']}, ← {info['parent']})")
+        
+        return list(harvested)
     
     def generate_pattern_keywords(self, base_keywords: List[str]) -> List[str]:
         """패턴 기반 키워드 생성"""
@@ -191,15 +188,7 @@ class SimpleKeywordExtractor:
         
         # 2단계: 네이버 자동완성
         print("\n🔍 2단계: 네이버 자동완성 키워드 수집")
-        naver_keywords = []
-        
-        for seed in seed_keywords:
-            time.sleep(1)  # API 호출 간격 조절
-            suggestions = self.get_naver_autocomplete(seed)
-            naver_keywords.extend(suggestions)
-        
-        # 중복 제거
-        naver_keywords = list(set(naver_keywords))
+        naver_keywords = self.harvest_naver_autocomplete(seed_keywords)
         all_keywords.extend(naver_keywords)
         
         print(f"   📊 네이버에서 총 {len(naver_keywords)}개 키워드 수집")
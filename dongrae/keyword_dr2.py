@@ -5,83 +5,88 @@
 - 법무법인 동래 사이트 전용
 """
 
-import requests
 import re
-import time
+import os
+import sys
 from collections import Counter
 from urllib.parse import quote
 import csv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from autocomplete_harvester import AutocompleteHarvester, NAVER_AUTOCOMPLETE_URL
+from autocomplete_cache import AutocompleteCache, DEFAULT_AUTOCOMPLETE_CACHE_DB
+from site_crawler import SiteCrawler, DEFAULT_CRAWL_CACHE
+
 class SimpleKeywordExtractor:
-    def __init__(self, website_url="https://www.dongraelaw.shop/"):
+    def __init__(self, website_url="https://www.dongraelaw.shop/", autocomplete_url=NAVER_AUTOCOMPLETE_URL,
+                 max_depth=2, max_queries=80, use_cache=True, offline=False,
+                 cache_path=DEFAULT_AUTOCOMPLETE_CACHE_DB, max_pages=30, crawl_depth=3,
+                 crawl_cache=DEFAULT_CRAWL_CACHE):
         self.website_url = website_url
         self.brand_name = "법무법인 동래"
         self.location = "부산 연제"
         self.all_keywords = []
         
+        # 웹사이트 크롤링 예산 (website_url 을 site_fixture_server 로 바꾸면 오프라인 실행)
+        self.max_pages = max_pages
+        self.crawl_depth = crawl_depth
+        self.crawl_cache = crawl_cache
+        
+        # 네이버 자동완성 수집 설정 (autocomplete_url 을 픽스처 서버로 바꾸면 오프라인 실행)
+        self.autocomplete_url = autocomplete_url
+        self.max_depth = max_depth
+        self.max_queries = max_queries
+        
+        # 자동완성 응답 캐시 (재실행 시 네트워크 없이 재사용, offline=True 면 캐시만 사용)
+        self.offline = offline
+        self.cache = AutocompleteCache(cache_path) if use_cache or offline else None
+        
     def extract_from_website(self):
-        """웹사이트에서 직접 키워드 추출"""
+        """웹사이트에서 직접 키워드 추출 (같은 도메인 페이지를 따라가며 크롤링)"""
         print("🔍 1단계: 웹사이트에서 키워드 추출 중...")
         
+        word_count = Counter()
+        
+        def on_page(page):
+            # 페이지가 파싱되는 대로 한글 단어 빈도 누적
+            word_count.update(re.findall(r'[가-힣]{2,}', page['spaced_text']))
+        
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(self.website_url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                # HTML에서 텍스트 추출 (간단한 방법)
-                html = response.text
-                
-                # 제목 추출
-                title_match = re.search(r'<title>(.*?)</title>', html, re.IGNORECASE)
-                title = title_match.group(1) if title_match else ""
-                
-                # 메타 설명 추출
-                meta_desc = re.search(r'<meta name="description" content="(.*?)"', html, re.IGNORECASE)
-                description = meta_desc.group(1) if meta_desc else ""
-                
-                # HTML 태그 제거하고 텍스트만 추출
-                text = re.sub(r'<[^>]+>', ' ', html)
-                text = re.sub(r'\s+', ' ', text)
-                
-                # 한글 키워드 추출
-                korean_words = re.findall(r'[가-힣]{2,}', text)
-                
-                print(f"   📄 제목: {title}")
-                print(f"   📝 설명: {description}")
-                print(f"   📊 추출된 한글 단어: {len(korean_words)}개")
-                
-                # 빈도수 계산
-                word_count = Counter(korean_words)
-                
-                # 불용어 제거
-                stopwords = {
-                    '이것', '그것', '저것', '여기', '거기', '저기', '이곳', '그곳', '저곳',
-                    '때문', '경우', '시간', '정도', '상태', '방법', '이후', '다음',
-                    '모든', '각각', '전체', '일부', '하나', '다른', '같은', '새로운'
-                }
-                
-                # 상위 키워드 선별 (불용어 제외)
-                website_keywords = []
-                for word, count in word_count.most_common(20):
-                    if word not in stopwords and len(word) >= 2:
-                        website_keywords.append((word, count))
-                
-                print("   🔝 웹사이트 주요 키워드:")
-                for i, (word, count) in enumerate(website_keywords[:10], 1):
-                    print(f"      {i}. {word} ({count}회)")
-                
-                return [word for word, count in website_keywords]
-                
-            else:
-                print(f"   ❌ 웹사이트 접근 실패: HTTP {response.status_code}")
-                return []
-                
+            crawler = SiteCrawler(self.website_url, max_pages=self.max_pages, max_depth=self.crawl_depth,
+                                  user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+                                  cache_path=self.crawl_cache, verbose=False)
+            pages = crawler.crawl(on_page)
         except Exception as e:
             print(f"   ❌ 오류 발생: {e}")
             return []
+        
+        if not pages:
+            print("   ❌ 웹사이트 접근 실패: 가져온 페이지가 없습니다")
+            return []
+        
+        print(f"   📄 제목: {pages[0]['title']}")
+        print(f"   📝 설명: {pages[0]['meta_description']}")
+        print(f"   🕸️ 크롤링한 페이지: {len(pages)}개")
+        print(f"   📊 추출된 한글 단어: {sum(word_count.values())}개")
+        
+        # 불용어 제거
+        stopwords = {
+            '이것', '그것', '저것', '여기', '거기', '저기', '이곳', '그곳', '저곳',
+            '때문', '경우', '시간', '정도', '상태', '방법', '이후', '다음',
+            '모든', '각각', '전체', '일부', '하나', '다른', '같은', '새로운'
+        }
+        
+        # 상위 키워드 선별 (불용어 제외)
+        website_keywords = []
+        for word, count in word_count.most_common(20):
+            if word not in stopwords and len(word) >= 2:
+                website_keywords.append((word, count))
+        
+        print("   🔝 웹사이트 주요 키워드:")
+        for i, (word, count) in enumerate(website_keywords[:10], 1):
+            print(f"      {i}. {word} ({count}회)")
+        
+        return [word for word, count in website_keywords]
     
     def extract_base_keywords(self):
         """기본 키워드 생성"""
@@ -126,62 +131,23 @@ class SimpleKeywordExtractor:
         return base_keywords
     
     def extract_naver_autocomplete(self, seed_keywords):
-        """네이버 자동완성에서 키워드 추출"""
+        """네이버 자동완성에서 키워드 추출 (전체 시드 → 자동완성의 자동완성까지 BFS 확장)"""
         print("\n🔍 3단계: 네이버 자동완성 키워드 수집 중...")
         
-        all_suggestions = []
+        harvester = AutocompleteHarvester(
+            base_url=self.autocomplete_url,
+            headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'},
+            max_depth=self.max_depth,
+            max_queries=self.max_queries,
+            cache=self.cache,
+            offline=self.offline
+        )
+        harvested = harvester.harvest(seed_keywords)
         
-        # 주요 시드 키워드만 사용 (API 호출 최소화)
-        main_seeds = [
-            "연제 변호사",
-            "법무법인 동래",
-            "연제 법률상담",
-            "부산 연제 변호사"
-        ]
+        for keyword, info in list(harvested.items())[:10]:
+            print(f"         • {keyword} (깊이 {info['depth']}, ← {info['parent']})")
         
-        for seed in main_seeds:
-            print(f"   🔎 '{seed}' 자동완성 검색...")
-            
-            try:
-                url = "https://ac.search.naver.com/nx/ac"
-                params = {
-                    'q': seed,
-                    'con': '0',
-                    'frm': 'nv',
-                    'ans': '2'
-                }
-                
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-                }
-                
-                response = requests.get(url, params=params, headers=headers, timeout=5)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    suggestions = []
-                    
-                    for item in data.get('items', []):
-                        for suggestion in item:
-                            if isinstance(suggestion, list) and len(suggestion) > 0:
-                                keyword = suggestion[0]
-                                if keyword and isinstance(keyword, str):
-                                    suggestions.append(keyword.strip())
-                    
-                    unique_suggestions = list(set(suggestions))
-                    all_suggestions.extend(unique_suggestions)
-                    
-                    print(f"      → {len(unique_suggestions)}개 키워드 발견")
-                    for suggestion in unique_suggestions[:5]:
-                        print(f"         • {suggestion}")
-                
-                time.sleep(1)  # API 호출 간격 조절
-                
-            except Exception as e:
-                print(f"      ❌ {seed} 자동완성 실패: {e}")
-        
-        # 중복 제거
-        unique_all = list(set(all_suggestions))
+        unique_all = list(harvested)
         print(f"   ✅ 총 {len(unique_all)}개 네이버 자동완성 키워드 수집")
         
         return unique_all
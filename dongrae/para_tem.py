@@ -2,16 +2,28 @@
 import json
 import random
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 import re
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from keyword_matcher import KeywordAutomaton
+from prompt_records import PromptRecordRenderer
+from template_space import CompiledTemplate, CompiledTemplateSet
 
 # ==================== 기본 파라미터 클래스 ====================
 class DongraeLawParameters:
     """법무법인 동래 특화 파라미터 클래스"""
     
+    # get_random_parameters 결과의 키 순서
+    PARAM_FIELDS = ("practice_area", "metric", "region", "time_span", "source_hint",
+                    "language_ratio", "intent", "difficulty")
+    
     def __init__(self):
         # 1. 법무 전문분야 (practice_area)
         self.practice_areas = [
@@ -82,6 +94,19 @@ class TemplateConfig:
 class DongraeTemplateGenerator:
     """법무법인 동래 템플릿 생성기"""
     
+    # params 에 없는 자리표시자의 기본값
+    PARAM_DEFAULTS = {
+        'region': '부산',
+        'practice_area': '기업법무',
+        'metric': '수임료',
+        'time_span': '최근3년',
+        'source_hint': '대한변협',
+    }
+    
+    # 난이도 × 의도 템플릿이 없을 때 쓰는 기본 템플릿
+    FALLBACK_TEMPLATE_ID = "기본"
+    FALLBACK_TEMPLATE = "({region}) ({practice_area}) 관련 ({metric}) 정보를 알려주세요."
+    
     def __init__(self):
         self.config = TemplateConfig()
         
@@ -144,25 +169,41 @@ class DongraeTemplateGenerator:
                 "({time_span}) 기간 ({region}) ({practice_area}) 시장 동향을 반영한 법무법인 동래의 서비스 포트폴리오와 ({metric}) 경쟁력을 분석해주세요."
             ]
         }
+        
+        # 템플릿은 한 번만 파싱해 두고 재사용
+        self.compiled_templates = {key: CompiledTemplateSet(value) for key, value in self.templates.items()}
+        
+        # 템플릿 id ("난이도.의도.번호") - 정규화 레코드에는 템플릿 대신 id 만 저장
+        self.template_ids = {
+            key: [f"{key[0]}.{key[1]}.{i}" for i in range(len(value))] for key, value in self.templates.items()
+        }
+        self.template_table = {
+            template_id: template
+            for key, ids in self.template_ids.items()
+            for template_id, template in zip(ids, self.templates[key])
+        }
+        self.template_table[self.FALLBACK_TEMPLATE_ID] = self.FALLBACK_TEMPLATE
+        self.compiled_table = {
+            template_id: CompiledTemplate.compile(template) for template_id, template in self.template_table.items()
+        }
+
+    def choose_template_id(self, difficulty: str, intent: str) -> str:
+        """난이도 × 의도에 맞는 템플릿 하나를 무작위로 골라 id 반환 (없으면 기본 템플릿)"""
+        ids = self.template_ids.get((difficulty, intent))
+        if not ids:
+            return self.FALLBACK_TEMPLATE_ID
+        return random.choice(ids)
+
+    def fill_template(self, template_id: str, params: Dict) -> str:
+        """템플릿 id + 파라미터 → 질의 문장 (실제로 쓰는 자리표시자만 채움)"""
+        template = self.compiled_table[template_id]
+        return template.fill({
+            name: params.get(name, self.PARAM_DEFAULTS[name]) for name in template.fields
+        })
 
     def generate_template(self, difficulty: str, intent: str, params: Dict) -> str:
         """특정 난이도와 의도에 맞는 템플릿 생성"""
-        templates = self.templates.get((difficulty, intent), [])
-        if not templates:
-            return f"({params['region']}) ({params['practice_area']}) 관련 ({params['metric']}) 정보를 알려주세요."
-        
-        template = random.choice(templates)
-        
-        # 파라미터 치환
-        formatted_template = template.format(
-            region=params.get('region', '부산'),
-            practice_area=params.get('practice_area', '기업법무'),
-            metric=params.get('metric', '수임료'),
-            time_span=params.get('time_span', '최근3년'),
-            source_hint=params.get('source_hint', '대한변협')
-        )
-        
-        return formatted_template
+        return self.fill_template(self.choose_template_id(difficulty, intent), params)
 
     def generate_all_combinations(self, params: Dict) -> Dict:
         """모든 난이도×의도 조합의 템플릿 생성"""
@@ -234,14 +275,65 @@ class AdvancedKeywordExtractor:
             }
         }
 
+        # 긴급도 키워드
+        self.urgency_keywords = {
+            "high": ["긴급", "응급", "즉시", "빨리", "급해", "오늘", "지금", "당장"],
+            "medium": ["빠른", "신속", "조속", "이번주", "며칠"],
+            "low": ["천천히", "여유있게", "나중에", "계획", "준비"]
+        }
+
+        # 모든 키워드 사전을 하나의 오토마톤으로 컴파일 (질의당 한 번만 훑음)
+        self.keyword_automaton = self._build_keyword_automaton()
+
+    def _build_keyword_automaton(self) -> KeywordAutomaton:
+        """키워드 사전 → (그룹, 분류, 가중치) payload 오토마톤"""
+        automaton = KeywordAutomaton()
+
+        for area, keywords in self.detailed_keywords.items():
+            for keyword in keywords["primary"]:
+                automaton.add(keyword, ("practice_areas", area, 3.0))
+            for keyword in keywords["secondary"]:
+                automaton.add(keyword, ("practice_areas", area, 2.0))
+
+        for region, keywords in self.region_keywords.items():
+            for keyword in keywords:
+                automaton.add(keyword, ("regions", region, 1.0))
+
+        for intent, keyword_groups in self.intent_keywords.items():
+            for keywords in keyword_groups.values():
+                for keyword in keywords:
+                    automaton.add(keyword, ("intent", intent, 1.0))
+
+        for urgency, keywords in self.urgency_keywords.items():
+            for keyword in keywords:
+                automaton.add(keyword, ("urgency", urgency, 1.0))
+
+        return automaton.build()
+
+    def _score_keywords(self, query: str) -> Dict[str, Dict[str, float]]:
+        """질의를 한 번 훑어 그룹별 분류 점수 계산 (키워드는 사전 항목마다 한 번씩만 가산)"""
+        # 분류 순서를 사전 순서대로 유지해야 동점일 때 결과가 기존과 같음
+        scores = {
+            "practice_areas": {area: 0 for area in self.detailed_keywords},
+            "regions": {region: 0 for region in self.region_keywords},
+            "intent": {intent: 0 for intent in self.intent_keywords},
+            "urgency": {urgency: 0 for urgency in self.urgency_keywords}
+        }
+
+        for group, category, weight in self.keyword_automaton.match(query):
+            scores[group][category] += weight
+
+        return scores
+
     def extract_comprehensive_keywords(self, user_query: str) -> Dict:
         """종합적 키워드 추출"""
         query_lower = user_query.lower()
+        keyword_scores = self._score_keywords(query_lower)
         results = {
-            "practice_areas": self._extract_practice_areas(query_lower),
-            "regions": self._extract_regions(query_lower),
-            "intent": self._classify_intent(query_lower),
-            "urgency": self._classify_urgency(query_lower),
+            "practice_areas": self._extract_practice_areas(query_lower, keyword_scores),
+            "regions": self._extract_regions(query_lower, keyword_scores),
+            "intent": self._classify_intent(query_lower, keyword_scores),
+            "urgency": self._classify_urgency(query_lower, keyword_scores),
             "confidence_scores": {}
         }
         
@@ -250,58 +342,27 @@ class AdvancedKeywordExtractor:
         
         return results
 
-    def _extract_practice_areas(self, query: str) -> List[Tuple[str, float]]:
-        """법무 분야 추출 및 신뢰도 계산"""
-        area_scores = defaultdict(float)
-        
-        for area, keywords in self.detailed_keywords.items():
-            score = 0
-            
-            # Primary 키워드 매칭 (가중치 3.0)
-            for keyword in keywords["primary"]:
-                if keyword in query:
-                    score += 3.0
-            
-            # Secondary 키워드 매칭 (가중치 2.0)
-            for keyword in keywords["secondary"]:
-                if keyword in query:
-                    score += 2.0
-            
-            if score > 0:
-                area_scores[area] = score
+    def _extract_practice_areas(self, query: str, keyword_scores: Dict = None) -> List[Tuple[str, float]]:
+        """법무 분야 추출 및 신뢰도 계산 (Primary 가중치 3.0, Secondary 가중치 2.0)"""
+        keyword_scores = keyword_scores or self._score_keywords(query)
+        area_scores = {area: score for area, score in keyword_scores["practice_areas"].items() if score > 0}
         
         # 점수순 정렬
         sorted_areas = sorted(area_scores.items(), key=lambda x: x[1], reverse=True)
         return sorted_areas[:3]  # 상위 3개만 반환
 
-    def _extract_regions(self, query: str) -> List[Tuple[str, float]]:
+    def _extract_regions(self, query: str, keyword_scores: Dict = None) -> List[Tuple[str, float]]:
         """지역 추출 및 신뢰도 계산"""
-        region_scores = defaultdict(float)
-        
-        for region, keywords in self.region_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in query:
-                    score += 1.0
-            
-            if score > 0:
-                region_scores[region] = score
+        keyword_scores = keyword_scores or self._score_keywords(query)
+        region_scores = {region: score for region, score in keyword_scores["regions"].items() if score > 0}
         
         sorted_regions = sorted(region_scores.items(), key=lambda x: x[1], reverse=True)
         return sorted_regions
 
-    def _classify_intent(self, query: str) -> Tuple[str, float]:
+    def _classify_intent(self, query: str, keyword_scores: Dict = None) -> Tuple[str, float]:
         """의도 분류"""
-        intent_scores = defaultdict(float)
-        
-        for intent, keyword_groups in self.intent_keywords.items():
-            score = 0
-            for group_name, keywords in keyword_groups.items():
-                for keyword in keywords:
-                    if keyword in query:
-                        score += 1.0
-            
-            intent_scores[intent] = score
+        keyword_scores = keyword_scores or self._score_keywords(query)
+        intent_scores = keyword_scores["intent"]
         
         if not intent_scores:
             return ("정보조회", 0.5)  # 기본값
@@ -309,20 +370,10 @@ class AdvancedKeywordExtractor:
         best_intent = max(intent_scores.items(), key=lambda x: x[1])
         return best_intent
 
-    def _classify_urgency(self, query: str) -> Tuple[str, float]:
+    def _classify_urgency(self, query: str, keyword_scores: Dict = None) -> Tuple[str, float]:
         """긴급도 분류"""
-        urgency_keywords = {
-            "high": ["긴급", "응급", "즉시", "빨리", "급해", "오늘", "지금", "당장"],
-            "medium": ["빠른", "신속", "조속", "이번주", "며칠"],
-            "low": ["천천히", "여유있게", "나중에", "계획", "준비"]
-        }
-        
-        urgency_scores = {"high": 0, "medium": 0, "low": 0}
-        
-        for urgency, keywords in urgency_keywords.items():
-            for keyword in keywords:
-                if keyword in query:
-                    urgency_scores[urgency] += 1.0
+        keyword_scores = keyword_scores or self._score_keywords(query)
+        urgency_scores = dict(keyword_scores["urgency"])
         
         # 문장 길이도 고려
         if len(query) < 20:
@@ -362,8 +413,54 @@ class AdvancedKeywordExtractor:
         return confidence
 
 # ==================== 통합 시스템 클래스 ====================
+# 법무법인 동래 시스템 프롬프트 틀 - 브랜드 자리는 brand_info 에서, 나머지는 레코드에서 채움
+DONGRAE_PROMPT_TEMPLATE = """
+당신은 {brand_name}의 AI 법률상담 어시스턴트입니다.
+
+**법무법인 정보:**
+- 상호: {brand_name} ({brand_english_name})
+- 위치: {brand_location}
+- 연락처: {brand_phone}
+- 설립: {brand_established} ({brand_experience} 경력)
+- 웹사이트: {brand_website}
+
+**특화 분야:** {specialty_area}
+**서비스 지역:** {brand_target_regions}
+**핵심 가치:** {brand_specialties}
+
+**사용자 질의:** {user_query}
+**추출된 정보:** 
+- 법무분야: {practice_area}
+- 지역: {region}
+- 관심사항: {metric}
+- 상담의도: {intent}
+- 복잡도: {difficulty}
+
+**응답 가이드라인:**
+1. 부산·경남 지역 특성을 반영한 실무적 조언 제공
+2. {brand_experience} 경험을 바탕으로 한 전문성 어필
+3. 친근하면서도 신뢰할 수 있는 톤앤매너 유지
+4. 필요시 직접 상담 연결 안내: {brand_phone}
+5. 법무법인 동래만의 차별화된 서비스 강점 언급
+
+이제 사용자의 질의에 대해 법무법인 동래의 전문성을 살려 도움이 되는 답변을 제공해주세요.
+"""
+
+# 프롬프트 틀 슬롯 → (파라미터 이름, 기본값)
+DONGRAE_PROMPT_SLOTS = {
+    "specialty_area": ["practice_area", "종합법무"],
+    "practice_area": ["practice_area", "미분류"],
+    "region": ["region", "부산"],
+    "metric": ["metric", "일반상담"],
+    "intent": ["intent", "정보조회"],
+    "difficulty": ["difficulty", "보통"],
+}
+
 class DongrageLawIntegratedSystem:
     """법무법인 동래 통합 AI 서비스 시스템"""
+
+    # extract_keywords_batch 결과 컬럼
+    BATCH_COLUMNS = ["practice_area", "region", "metric", "intent", "difficulty", "confidence"]
     
     def __init__(self):
         # 앞서 정의한 클래스들 통합
@@ -385,8 +482,43 @@ class DongrageLawIntegratedSystem:
             "target_regions": ["부산", "창원", "김해", "양산", "울산", "경남"]
         }
 
+        # 정규화 레코드용 공유 사전 (파일마다 한 번만 저장) + 렌더러
+        self.record_dictionary = {
+            "brand_info": self.brand_info,
+            "brand_slots": {
+                "brand_name": self.brand_info['name'],
+                "brand_english_name": self.brand_info['english_name'],
+                "brand_location": self.brand_info['location'],
+                "brand_phone": self.brand_info['phone'],
+                "brand_established": self.brand_info['established'],
+                "brand_experience": self.brand_info['experience'],
+                "brand_website": self.brand_info['website'],
+                "brand_target_regions": ', '.join(self.brand_info['target_regions']),
+                "brand_specialties": ', '.join(self.brand_info['specialties']),
+            },
+            "prompt_template": DONGRAE_PROMPT_TEMPLATE,
+            "prompt_slots": DONGRAE_PROMPT_SLOTS,
+            "templates": self.template_gen.template_table,
+            "param_defaults": DongraeTemplateGenerator.PARAM_DEFAULTS,
+            "extracted_fields": ["practice_area", "region", "metric", "intent", "difficulty"],
+            "param_fields": list(DongraeLawParameters.PARAM_FIELDS),
+        }
+        self.renderer = PromptRecordRenderer(self.record_dictionary)
+
+        # 메트릭 키워드 오토마톤 (payload = 사전 순서, 가장 앞선 메트릭을 선택)
+        self.metric_order = [metric for metrics in self.params.metrics.values() for metric in metrics]
+        self.metric_automaton = KeywordAutomaton()
+        for order, metric in enumerate(self.metric_order):
+            self.metric_automaton.add(metric, order)
+        self.metric_automaton.build()
+
     def extract_keywords_from_query(self, user_query: str) -> Dict:
         """사용자 질의에서 키워드 추출"""
+        extracted, _ = self._extract_keywords_with_confidence(user_query)
+        return extracted
+
+    def _extract_keywords_with_confidence(self, user_query: str) -> Tuple[Dict, float]:
+        """키워드 추출 + 전체 신뢰도"""
         # 고급 키워드 추출 사용
         advanced_results = self.advanced_extractor.extract_comprehensive_keywords(user_query)
         
@@ -408,19 +540,47 @@ class DongrageLawIntegratedSystem:
         extracted["intent"] = advanced_results["intent"][0]
         extracted["difficulty"] = advanced_results["urgency"][0]
         
-        # 메트릭 키워드 매칭 (기본 방식)
-        for metric_category, metrics in self.params.metrics.items():
-            for metric in metrics:
-                if metric in user_query:
-                    extracted["metric"] = metric
-                    break
-            if extracted["metric"]:
-                break
+        # 메트릭 키워드 매칭 (사전 순서상 가장 앞선 메트릭)
+        metric_hits = self.metric_automaton.match(user_query)
+        if metric_hits:
+            extracted["metric"] = self.metric_order[min(metric_hits)]
         
-        return extracted
+        return extracted, advanced_results["confidence_scores"]["overall"]
 
-    def generate_dongrae_prompt(self, user_query: str) -> Dict:
-        """사용자 질의를 바탕으로 법무법인 동래 특화 프롬프트 생성"""
+    def extract_keywords_batch(self, queries) -> pd.DataFrame:
+        """질의 Series / Arrow 배열을 한 번에 처리해 컬럼형 결과 반환
+
+        같은 질의는 한 번만 추출한 뒤 결과를 행 위치로 펼치므로,
+        중복이 많은 대량 데이터에서도 iterrows 없이 빠르게 처리된다.
+        """
+        if hasattr(queries, "to_pandas"):
+            queries = queries.to_pandas()
+        series = queries if isinstance(queries, pd.Series) else pd.Series(list(queries))
+        series = series.fillna("").astype(str)
+
+        codes, uniques = pd.factorize(series)
+        columns = {column: [] for column in self.BATCH_COLUMNS}
+
+        for query in uniques:
+            extracted, confidence = self._extract_keywords_with_confidence(query)
+            for column in self.BATCH_COLUMNS[:-1]:
+                columns[column].append(extracted[column])
+            columns["confidence"].append(confidence)
+
+        return pd.DataFrame(
+            {
+                column: np.asarray(values, dtype=float if column == "confidence" else object)[codes]
+                for column, values in columns.items()
+            },
+            index=series.index
+        )
+
+    def build_prompt_record(self, user_query: str) -> Dict:
+        """사용자 질의 → 정규화 레코드 (질의, 템플릿 id, 최종 파라미터, 추출된 파라미터 이름)
+
+        브랜드 정보와 가이드라인은 공유 사전(record_dictionary)에 있으므로 레코드에는 넣지 않는다.
+        self.renderer.render(record) 로 generate_dongrae_prompt 와 같은 결과를 만든다.
+        """
         # 1. 키워드 추출
         extracted_keywords = self.extract_keywords_from_query(user_query)
         
@@ -430,53 +590,21 @@ class DongrageLawIntegratedSystem:
             if value:
                 params[key] = value
         
-        # 3. 템플릿 생성
+        # 3. 템플릿 선택
         difficulty = params.get("difficulty", "보통")
         intent = params.get("intent", "정보조회")
         
-        base_template = self.template_gen.generate_template(difficulty, intent, params)
-        
-        # 4. 법무법인 동래 특화 프롬프트 생성
-        dongrae_prompt = f"""
-당신은 {self.brand_info['name']}의 AI 법률상담 어시스턴트입니다.
-
-**법무법인 정보:**
-- 상호: {self.brand_info['name']} ({self.brand_info['english_name']})
-- 위치: {self.brand_info['location']}
-- 연락처: {self.brand_info['phone']}
-- 설립: {self.brand_info['established']} ({self.brand_info['experience']} 경력)
-- 웹사이트: {self.brand_info['website']}
-
-**특화 분야:** {params.get('practice_area', '종합법무')}
-**서비스 지역:** {', '.join(self.brand_info['target_regions'])}
-**핵심 가치:** {', '.join(self.brand_info['specialties'])}
-
-**사용자 질의:** {user_query}
-**추출된 정보:** 
-- 법무분야: {params.get('practice_area', '미분류')}
-- 지역: {params.get('region', '부산')}
-- 관심사항: {params.get('metric', '일반상담')}
-- 상담의도: {intent}
-- 복잡도: {difficulty}
-
-**응답 가이드라인:**
-1. 부산·경남 지역 특성을 반영한 실무적 조언 제공
-2. {self.brand_info['experience']} 경험을 바탕으로 한 전문성 어필
-3. 친근하면서도 신뢰할 수 있는 톤앤매너 유지
-4. 필요시 직접 상담 연결 안내: {self.brand_info['phone']}
-5. 법무법인 동래만의 차별화된 서비스 강점 언급
-
-이제 사용자의 질의에 대해 법무법인 동래의 전문성을 살려 도움이 되는 답변을 제공해주세요.
-"""
-        
         return {
-            "prompt": dongrae_prompt,
-            "extracted_keywords": extracted_keywords,
+            "query": user_query,
+            "template_id": self.template_gen.choose_template_id(difficulty, intent),
             "final_parameters": params,
-            "template_used": base_template,
-            "brand_info": self.brand_info
+            "extracted": [key for key, value in extracted_keywords.items() if value],
         }
 
+    def generate_dongrae_prompt(self, user_query: str) -> Dict:
+        """사용자 질의를 바탕으로 법무법인 동래 특화 프롬프트 생성"""
+        return self.renderer.render(self.build_prompt_record(user_query))
+
     def batch_generate_samples(self, num_samples: int = 10) -> List[Dict]:
         """샘플 데이터 배치 생성"""
         sample_queries = [
@@ -543,7 +671,7 @@ class DongrageLawIntegratedSystem:
         return df
 
     def analyze_keyword_distribution(self, queries: List[str]) -> Dict:
-        """키워드 분포 분석"""
+        """키워드 분포 분석 (extract_keywords_batch 기반)"""
         analysis = {
             "practice_area_dist": defaultdict(int),
             "region_dist": defaultdict(int),
@@ -551,17 +679,15 @@ class DongrageLawIntegratedSystem:
             "difficulty_dist": defaultdict(int)
         }
         
-        for query in queries:
-            extracted = self.extract_keywords_from_query(query)
-            
-            if extracted["practice_area"]:
-                analysis["practice_area_dist"][extracted["practice_area"]] += 1
-            if extracted["region"]:
-                analysis["region_dist"][extracted["region"]] += 1
-            if extracted["intent"]:
-                analysis["intent_dist"][extracted["intent"]] += 1
-            if extracted["difficulty"]:
-                analysis["difficulty_dist"][extracted["difficulty"]] += 1
+        batch = self.extract_keywords_batch(queries)
+        
+        for column in ["practice_area", "region", "intent", "difficulty"]:
+            # 처음 등장한 순서를 유지한 채 값별 개수 집계
+            codes, uniques = pd.factorize(batch[column])
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            for value, count in zip(uniques, counts):
+                if value:
+                    analysis[f"{column}_dist"][value] += int(count)
         
         return analysis
 
@@ -655,6 +781,8 @@ if __name__ == "__main__":
     print("\n4. 키워드 분석:")
     print("   analysis = dongrae_system.analyze_keyword_distribution(queries)")
     print("   print(analysis)")
+    print("\n5. 대량 키워드 추출 (DataFrame 컬럼 단위):")
+    print("   keywords_df = dongrae_system.extract_keywords_batch(df['질문'])")
     
     # 9. 개별 기능 테스트
     print(f"\n=== 개별 기능 테스트 ===")
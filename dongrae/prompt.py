@@ -3,16 +3,257 @@ import json
 import random
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from itertools import product, combinations
 from collections import defaultdict
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fanout_writer import DEFAULT_BUFFER_SIZE, FanoutWriter, TextSink
+from online_stats import DEFAULT_MAX_KEYS, Distribution, NumericSummary
+from prompt_records import PromptRecordRenderer, PromptRecordSink
 
 # 기존 시스템 클래스들 import (앞서 만든 코드가 있다고 가정)
 # 여기서는 필요한 부분만 재정의
 
+class MassiveAnalysis:
+    """프롬프트를 하나씩 받아 누적하는 분석기 (analyze_massive_results 와 같은 형식의 결과)
+
+    길이는 Welford 평균/표준편차 + t-digest 분위수, 분포는 고유값 상한이 있는
+    Distribution 으로 세므로 개수와 상관없이 메모리가 일정하다. state() 로 저장한
+    상태끼리 merge 할 수 있어 워커 프로세스나 여러 분석 파일의 결과를 합칠 수 있다.
+    정규화 레코드를 넘길 때는 renderer 가 필요하다.
+    """
+
+    DIMENSIONS = ("practice_area", "region", "intent", "difficulty", "metric")
+
+    def __init__(self, sample_size: int = 5, renderer: Optional[PromptRecordRenderer] = None,
+                 max_keys: int = DEFAULT_MAX_KEYS):
+        self.sample_size = sample_size
+        self.renderer = renderer
+        self.max_keys = max_keys
+        self.distributions = {name: Distribution(max_keys) for name in self.DIMENSIONS}
+        self.query_lengths = NumericSummary()
+        self.prompt_lengths = NumericSummary()
+        self.template_diversity = Distribution(max_keys)
+        self.cross_analysis = Distribution(max_keys)
+        self.samples = []
+
+    @property
+    def total_count(self) -> int:
+        return self.query_lengths.count
+
+    def add(self, prompt: Dict):
+        params = prompt["final_parameters"]
+
+        # 분포 분석
+        for name in self.DIMENSIONS:
+            self.distributions[name].add(params.get(name, "미분류"))
+        self.cross_analysis.add(f"{params.get('region', '미분류')} × {params.get('practice_area', '미분류')}")
+
+        # 길이 통계 (정규화 레코드는 렌더링하지 않고 길이/템플릿만 계산)
+        self.query_lengths.add(len(prompt["query"]))
+        if "prompt" in prompt:
+            self.prompt_lengths.add(len(prompt["prompt"]))
+            template = prompt["template_used"]
+        else:
+            self.prompt_lengths.add(self.renderer.prompt_length(prompt))
+            template = self.renderer.render_template(prompt)
+
+        # 템플릿 다양성
+        self.template_diversity.add(template[:50] + "...")  # 앞 50자만
+
+        if len(self.samples) < self.sample_size:
+            self.samples.append(prompt)
+
+    def tap(self, prompts: Iterable[Dict]) -> Iterator[Dict]:
+        """스트림을 지나가는 프롬프트를 누적하면서 그대로 다음 단계로 넘김"""
+        for prompt in prompts:
+            self.add(prompt)
+            yield prompt
+
+    def merge(self, other: "MassiveAnalysis") -> "MassiveAnalysis":
+        """다른 분석기(다른 프로세스/파일) 결과를 합침"""
+        for name in self.DIMENSIONS:
+            self.distributions[name].merge(other.distributions[name])
+        self.query_lengths.merge(other.query_lengths)
+        self.prompt_lengths.merge(other.prompt_lengths)
+        self.template_diversity.merge(other.template_diversity)
+        self.cross_analysis.merge(other.cross_analysis)
+        self.samples.extend(other.samples[:self.sample_size - len(self.samples)])
+        return self
+
+    def state(self) -> Dict:
+        """병합용 직렬화 상태 (JSON 으로 저장 가능, 샘플은 빠짐)"""
+        return {
+            "distributions": {name: self.distributions[name].to_dict() for name in self.DIMENSIONS},
+            "query_lengths": self.query_lengths.to_dict(),
+            "prompt_lengths": self.prompt_lengths.to_dict(),
+            "template_diversity": self.template_diversity.to_dict(),
+            "cross_analysis": self.cross_analysis.to_dict(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict, renderer: Optional[PromptRecordRenderer] = None) -> "MassiveAnalysis":
+        analysis = cls(renderer=renderer)
+        analysis.distributions = {name: Distribution.from_dict(state["distributions"][name])
+                                  for name in cls.DIMENSIONS}
+        analysis.query_lengths = NumericSummary.from_dict(state["query_lengths"])
+        analysis.prompt_lengths = NumericSummary.from_dict(state["prompt_lengths"])
+        analysis.template_diversity = Distribution.from_dict(state["template_diversity"])
+        analysis.cross_analysis = Distribution.from_dict(state["cross_analysis"])
+        return analysis
+
+    @property
+    def avg_prompt_length(self) -> int:
+        return int(self.prompt_lengths.stats.mean) if self.total_count else 0
+
+    def result(self) -> Dict:
+        """analyze_massive_results 형식의 분석 dict (분포는 정확히 센 값만)"""
+        analysis = {"total_count": self.total_count}
+        for name in self.DIMENSIONS:
+            analysis[f"{name}_distribution"] = self.distributions[name].to_counts()
+        analysis["query_length_stats"] = self.query_lengths.summary()
+        analysis["prompt_length_stats"] = self.prompt_lengths.summary()
+        analysis["template_diversity"] = self.template_diversity.to_counts()
+        # 고유값 상한을 넘어 근사로 센 차원
+        analysis["approximate_dimensions"] = [
+            name for name, distribution in self.named_distributions() if not distribution.exact
+        ]
+        return analysis
+
+    def named_distributions(self) -> Iterator[Tuple[str, Distribution]]:
+        for name in self.DIMENSIONS:
+            yield name, self.distributions[name]
+        yield "template_diversity", self.template_diversity
+        yield "cross_analysis", self.cross_analysis
+
+
+def merge_massive_analyses(paths: Iterable[str]) -> MassiveAnalysis:
+    """여러 dongrae_analysis_*.json (online_state 포함) 을 하나의 분석기로 병합"""
+    merged = MassiveAnalysis()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if "online_state" not in saved:
+            raise ValueError(f"병합할 수 있는 상태가 없는 분석 파일입니다: {path}")
+        merged.merge(MassiveAnalysis.from_state(saved["online_state"]))
+    return merged
+
+
+class MassiveExportSink:
+    """프롬프트 스트림을 한 번만 훑으며 모든 결과 파일을 함께 쓰는 내보내기
+
+    전체 프롬프트는 정규화 레코드 JSONL (첫 줄에 브랜드/템플릿 공유 사전, compression=
+    'gzip' / 'zstd' 로 압축 가능), 질의 목록과 프롬프트 모음은 텍스트로 버퍼링해서 쓰고,
+    분석은 같은 순회에서 MassiveAnalysis 로 누적한다. 렌더링된 결과 dict 와 정규화 레코드를
+    모두 받으며, 프롬프트 모음에 쓸 때만 레코드를 렌더링한다.
+    close() 에서 분석 JSON 과 요약 CSV 를 저장한다.
+    """
+
+    def __init__(self, renderer: PromptRecordRenderer, timestamp: Optional[str] = None,
+                 compression: Optional[str] = None, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 analysis: Optional["MassiveAnalysis"] = None):
+        self.renderer = renderer
+        self.timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.analysis = analysis if analysis is not None else MassiveAnalysis(renderer=renderer)
+        sinks = [
+            PromptRecordSink(f"dongrae_massive_prompts_{self.timestamp}.jsonl", renderer, compression, buffer_size),
+            TextSink(f"dongrae_queries_{self.timestamp}.txt", self.render_query, buffer_size=buffer_size),
+            TextSink(f"dongrae_prompts_only_{self.timestamp}.txt", self.render_prompt, compression, buffer_size),
+        ]
+        self.writer = FanoutWriter(sinks, observers=[self.analysis])
+        self.files = {
+            "json_file": sinks[0].path,
+            "analysis_file": f"dongrae_analysis_{self.timestamp}.json",
+            "queries_file": sinks[1].path,
+            "prompts_file": sinks[2].path,
+            "summary_file": f"dongrae_summary_{self.timestamp}.csv",
+        }
+
+    @staticmethod
+    def render_query(i: int, prompt: Dict) -> str:
+        return f"{i:04d}. {prompt['query']}\n"
+
+    def render_prompt(self, i: int, prompt: Dict) -> str:
+        text = prompt["prompt"] if "prompt" in prompt else self.renderer.render_prompt(prompt)
+        return (f"=== 프롬프트 {i:04d} ===\n"
+                f"질의: {prompt['query']}\n"
+                f"프롬프트:\n{text}\n"
+                "\n" + "="*50 + "\n\n")
+
+    @property
+    def count(self) -> int:
+        return self.writer.count
+
+    def write(self, prompt: Dict):
+        self.writer.write(prompt)
+
+    def consume(self, prompts: Iterable[Dict]) -> int:
+        """스트림 끝까지 기록 → 기록한 개수 (도중에 오류가 나면 파일은 닫음)"""
+        try:
+            return self.writer.consume(prompts)
+        except BaseException:
+            self.writer.close()
+            raise
+
+    def close(self, analysis: Optional[Dict] = None) -> Dict:
+        """열린 파일 마무리 + 분석 JSON / 요약 CSV 저장 → 파일 이름 dict
+
+        analysis 를 주지 않으면 기록하면서 누적한 분석을 쓴다.
+        """
+        self.writer.close()
+        if analysis is None:
+            analysis = self.analysis.result()
+
+        with open(self.files["analysis_file"], 'w', encoding='utf-8') as f:
+            # defaultdict을 일반 dict으로 변환
+            analysis_dict = {key: dict(value) if isinstance(value, defaultdict) else value
+                             for key, value in analysis.items()}
+            # 다른 실행/워커의 분석과 합칠 수 있도록 누적 상태도 함께 저장 (merge_massive_analyses)
+            analysis_dict["online_state"] = self.analysis.state()
+            json.dump(analysis_dict, f, ensure_ascii=False, indent=2)
+
+        summary_data = []
+        for category, key in (("법무분야", "practice_area_distribution"),
+                              ("지역", "region_distribution"),
+                              ("의도", "intent_distribution")):
+            for item, count in analysis[key].items():
+                summary_data.append({
+                    "카테고리": category,
+                    "항목": item,
+                    "개수": count,
+                    "비율": f"{count/analysis['total_count']*100:.1f}%"
+                })
+        pd.DataFrame(summary_data, columns=["카테고리", "항목", "개수", "비율"]).to_csv(
+            self.files["summary_file"], index=False, encoding='utf-8-sig')
+
+        print(f"\n=== 파일 저장 완료 ===")
+        print(f"1. 전체 프롬프트: {self.files['json_file']}")
+        print(f"2. 분석 결과: {self.files['analysis_file']}")
+        print(f"3. 질의 목록: {self.files['queries_file']}")
+        print(f"4. 프롬프트 모음: {self.files['prompts_file']}")
+        print(f"5. 요약 통계: {self.files['summary_file']}")
+        return dict(self.files)
+
+
 class MassivePromptGenerator:
     """법무법인 동래 대량 프롬프트 생성기"""
+
+    # 기본 질의가 모자랄 때 붙이는 변형 문구
+    QUERY_VARIATIONS = [
+        "급하게 {query}",
+        "비용을 최소화해서 {query}",
+        "전문적으로 {query}",
+        "신속하게 {query}",
+        "정확하게 {query}",
+        "안전하게 {query}",
+        "체계적으로 {query}",
+        "경험 많은 변호사에게 {query}",
+        "부산 지역 전문가에게 {query}",
+        "법무법인 동래에서 {query}",
+    ]
     
     def __init__(self):
         # 기본 시스템 초기화
@@ -271,197 +512,87 @@ class MassivePromptGenerator:
         
         return list(set(all_queries))  # 중복 제거
 
-    def generate_massive_prompts(self, num_prompts: int = 1000) -> List[Dict]:
-        """대량 프롬프트 생성"""
-        print(f"=== {num_prompts}개 프롬프트 대량 생성 시작 ===")
-        
-        # 모든 질의 생성
-        all_queries = self.generate_comprehensive_queries()
-        print(f"기본 질의 {len(all_queries)}개 생성 완료")
-        
-        # 추가 질의 생성 (목표 개수까지)
-        additional_needed = max(0, num_prompts - len(all_queries))
+    def iter_queries(self, num_prompts: int = 1000) -> Iterator[str]:
+        """질의 스트림 - 기본 질의를 먼저 내보내고, 모자라면 변형 질의를 필요한 만큼만 만들어 냄"""
+        base_queries = self.generate_comprehensive_queries()
+        print(f"기본 질의 {len(base_queries)}개 생성 완료")
+
+        for query in base_queries[:num_prompts]:
+            yield query
+
+        additional_needed = max(0, num_prompts - len(base_queries))
         if additional_needed > 0:
             print(f"추가 질의 {additional_needed}개 생성 중...")
-            
-            # 기존 질의를 변형해서 추가 생성
-            for _ in range(additional_needed):
-                base_query = random.choice(all_queries)
-                
-                # 랜덤하게 변형 요소 추가
-                variations = [
-                    f"급하게 {base_query}",
-                    f"비용을 최소화해서 {base_query}",
-                    f"전문적으로 {base_query}",
-                    f"신속하게 {base_query}",
-                    f"정확하게 {base_query}",
-                    f"안전하게 {base_query}",
-                    f"체계적으로 {base_query}",
-                    f"경험 많은 변호사에게 {base_query}",
-                    f"부산 지역 전문가에게 {base_query}",
-                    f"법무법인 동래에서 {base_query}"
-                ]
-                
-                variation = random.choice(variations)
-                all_queries.append(variation)
-        
-        # 프롬프트 생성
-        prompts = []
-        selected_queries = all_queries[:num_prompts]
-        
-        print(f"선택된 {len(selected_queries)}개 질의로 프롬프트 생성 중...")
-        
-        for i, query in enumerate(selected_queries):
+
+        # 기존 질의를 변형해서 추가 생성 (변형은 기본 질의에만 붙임 - 목록을 쌓아 두지 않음)
+        for _ in range(additional_needed):
+            base_query = random.choice(base_queries)
+            yield random.choice(self.QUERY_VARIATIONS).format(query=base_query)
+
+    def iter_prompt_records(self, queries: Iterable[str], total: Optional[int] = None,
+                            id_prefix: str = "dongrae_massive") -> Iterator[Dict]:
+        """질의 → 키워드 추출 → 정규화 레코드 (프롬프트는 렌더링하지 않음)"""
+        for i, query in enumerate(queries):
             if i % 100 == 0:
-                print(f"진행률: {i}/{len(selected_queries)} ({i/len(selected_queries)*100:.1f}%)")
-            
+                if total:
+                    print(f"진행률: {i}/{total} ({i/total*100:.1f}%)")
+                else:
+                    print(f"진행률: {i}개")
+
             try:
-                result = self.dongrae_system.generate_dongrae_prompt(query)
-                result["sample_id"] = f"dongrae_massive_{i+1:04d}"
-                result["query"] = query
-                result["generation_timestamp"] = datetime.now().isoformat()
-                prompts.append(result)
+                record = self.dongrae_system.build_prompt_record(query)
             except Exception as e:
                 print(f"질의 처리 오류 (인덱스 {i}): {str(e)}")
                 continue
-        
+
+            record["sample_id"] = f"{id_prefix}_{i+1:04d}"
+            record["generation_timestamp"] = datetime.now().isoformat()
+            yield record
+
+    def iter_prompts(self, queries: Iterable[str], total: Optional[int] = None,
+                     id_prefix: str = "dongrae_massive") -> Iterator[Dict]:
+        """질의 → 키워드 추출 → 프롬프트 렌더링 결과를 하나씩 내보냄"""
+        renderer = self.dongrae_system.renderer
+        for record in self.iter_prompt_records(queries, total, id_prefix):
+            yield renderer.render(record)
+
+    def stream_massive_records(self, num_prompts: int = 1000) -> Iterator[Dict]:
+        """대량 정규화 레코드 스트림 - 렌더링은 필요한 곳(파일/샘플)에서만"""
+        return self.iter_prompt_records(self.iter_queries(num_prompts), total=num_prompts)
+
+    def stream_massive_prompts(self, num_prompts: int = 1000) -> Iterator[Dict]:
+        """대량 프롬프트 스트림 (질의 → 추출 → 렌더링) - 전체 목록을 만들지 않음"""
+        return self.iter_prompts(self.iter_queries(num_prompts), total=num_prompts)
+
+    def generate_massive_prompts(self, num_prompts: int = 1000) -> List[Dict]:
+        """대량 프롬프트 생성 (목록으로 - 큰 개수는 stream_massive_prompts 사용)"""
+        print(f"=== {num_prompts}개 프롬프트 대량 생성 시작 ===")
+        prompts = list(self.stream_massive_prompts(num_prompts))
         print(f"=== 총 {len(prompts)}개 프롬프트 생성 완료 ===")
         return prompts
 
-    def analyze_massive_results(self, prompts: List[Dict]) -> Dict:
+    def analyze_massive_results(self, prompts: Iterable[Dict]) -> Dict:
         """대량 생성 결과 분석"""
-        analysis = {
-            "total_count": len(prompts),
-            "practice_area_distribution": defaultdict(int),
-            "region_distribution": defaultdict(int),
-            "intent_distribution": defaultdict(int),
-            "difficulty_distribution": defaultdict(int),
-            "metric_distribution": defaultdict(int),
-            "query_length_stats": {
-                "min": float('inf'),
-                "max": 0,
-                "avg": 0,
-                "lengths": []
-            },
-            "template_diversity": defaultdict(int)
-        }
-        
+        analysis = MassiveAnalysis(renderer=self.dongrae_system.renderer)
         for prompt in prompts:
-            params = prompt["final_parameters"]
-            query = prompt["query"]
-            
-            # 분포 분석
-            analysis["practice_area_distribution"][params.get("practice_area", "미분류")] += 1
-            analysis["region_distribution"][params.get("region", "미분류")] += 1
-            analysis["intent_distribution"][params.get("intent", "미분류")] += 1
-            analysis["difficulty_distribution"][params.get("difficulty", "미분류")] += 1
-            analysis["metric_distribution"][params.get("metric", "미분류")] += 1
-            
-            # 길이 통계
-            query_len = len(query)
-            analysis["query_length_stats"]["lengths"].append(query_len)
-            analysis["query_length_stats"]["min"] = min(analysis["query_length_stats"]["min"], query_len)
-            analysis["query_length_stats"]["max"] = max(analysis["query_length_stats"]["max"], query_len)
-            
-            # 템플릿 다양성
-            template = prompt["template_used"][:50] + "..."  # 앞 50자만
-            analysis["template_diversity"][template] += 1
-        
-        # 평균 길이 계산
-        if analysis["query_length_stats"]["lengths"]:
-            analysis["query_length_stats"]["avg"] = sum(analysis["query_length_stats"]["lengths"]) / len(analysis["query_length_stats"]["lengths"])
-        
-        return analysis
+            analysis.add(prompt)
+        return analysis.result()
 
-    def export_massive_results(self, prompts: List[Dict], analysis: Dict) -> Dict:
-        """대량 생성 결과 내보내기"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # 1. 전체 프롬프트 JSON 저장
-        json_filename = f"dongrae_massive_prompts_{timestamp}.json"
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(prompts, f, ensure_ascii=False, indent=2)
-        
-        # 2. 분석 결과 JSON 저장
-        analysis_filename = f"dongrae_analysis_{timestamp}.json"
-        with open(analysis_filename, 'w', encoding='utf-8') as f:
-            # defaultdict을 일반 dict으로 변환
-            analysis_dict = {}
-            for key, value in analysis.items():
-                if isinstance(value, defaultdict):
-                    analysis_dict[key] = dict(value)
-                else:
-                    analysis_dict[key] = value
-            json.dump(analysis_dict, f, ensure_ascii=False, indent=2)
-        
-        # 3. 질의만 추출해서 텍스트 파일로 저장
-        queries_filename = f"dongrae_queries_{timestamp}.txt"
-        with open(queries_filename, 'w', encoding='utf-8') as f:
-            for i, prompt in enumerate(prompts, 1):
-                f.write(f"{i:04d}. {prompt['query']}\n")
-        
-        # 4. 프롬프트만 추출해서 텍스트 파일로 저장
-        prompts_filename = f"dongrae_prompts_only_{timestamp}.txt"
-        with open(prompts_filename, 'w', encoding='utf-8') as f:
-            for i, prompt in enumerate(prompts, 1):
-                f.write(f"=== 프롬프트 {i:04d} ===\n")
-                f.write(f"질의: {prompt['query']}\n")
-                f.write(f"프롬프트:\n{prompt['prompt']}\n")
-                f.write("\n" + "="*50 + "\n\n")
-        
-        # 5. 분석 결과 요약 CSV 저장
-        summary_data = []
-        
-        # 법무분야별 통계
-        for area, count in analysis["practice_area_distribution"].items():
-            summary_data.append({
-                "카테고리": "법무분야",
-                "항목": area,
-                "개수": count,
-                "비율": f"{count/analysis['total_count']*100:.1f}%"
-            })
-        
-        # 지역별 통계
-        for region, count in analysis["region_distribution"].items():
-            summary_data.append({
-                "카테고리": "지역",
-                "항목": region,
-                "개수": count,
-                "비율": f"{count/analysis['total_count']*100:.1f}%"
-            })
-        
-        # 의도별 통계
-        for intent, count in analysis["intent_distribution"].items():
-            summary_data.append({
-                "카테고리": "의도",
-                "항목": intent,
-                "개수": count,
-                "비율": f"{count/analysis['total_count']*100:.1f}%"
-            })
-        
-        summary_df = pd.DataFrame(summary_data)
-        summary_csv = f"dongrae_summary_{timestamp}.csv"
-        summary_df.to_csv(summary_csv, index=False, encoding='utf-8-sig')
-        
-        print(f"\n=== 파일 저장 완료 ===")
-        print(f"1. 전체 프롬프트: {json_filename}")
-        print(f"2. 분석 결과: {analysis_filename}")
-        print(f"3. 질의 목록: {queries_filename}")
-        print(f"4. 프롬프트 모음: {prompts_filename}")
-        print(f"5. 요약 통계: {summary_csv}")
-        
-        return {
-            "json_file": json_filename,
-            "analysis_file": analysis_filename,
-            "queries_file": queries_filename,
-            "prompts_file": prompts_filename,
-            "summary_file": summary_csv
-        }
+    def export_massive_results(self, prompts: Iterable[Dict], analysis: Optional[Dict] = None,
+                               compression: Optional[str] = None) -> Dict:
+        """대량 생성 결과 내보내기 (한 번 순회 - analysis 를 주지 않으면 같은 순회에서 계산)"""
+        sink = MassiveExportSink(self.dongrae_system.renderer, compression=compression)
+        sink.consume(prompts)
+        return sink.close(analysis)
 
 # 실행 함수
 # 실행 함수
-def run_massive_generation(num_prompts: int = 1000):
-    """대량 프롬프트 생성 실행"""
+def run_massive_generation(num_prompts: int = 1000, compression: Optional[str] = None):
+    """대량 프롬프트 생성 실행 (질의 → 추출 → 정규화 레코드 → 분석 → 파일 스트리밍)
+
+    레코드는 만들어지는 즉시 분석기와 파일로 흘려보내고 목록으로 모으지 않으므로
+    100만 개를 만들어도 메모리 사용량이 일정하다.
+    """
     print("=" * 60)
     print("법무법인 동래 대량 프롬프트 생성기 시작")
     print("=" * 60)
@@ -469,17 +600,22 @@ def run_massive_generation(num_prompts: int = 1000):
     # 생성기 초기화
     generator = MassivePromptGenerator()
     
-    # 대량 프롬프트 생성
-    prompts = generator.generate_massive_prompts(num_prompts)
+    # 대량 프롬프트 생성 → 누적 분석 → 파일 기록 (한 번에 흘려보냄)
+    print(f"=== {num_prompts}개 프롬프트 대량 생성 시작 ===")
+    sink = MassiveExportSink(generator.dongrae_system.renderer, compression=compression)
+    stats = sink.analysis
+    sink.consume(generator.stream_massive_records(num_prompts))
+    print(f"=== 총 {stats.total_count}개 프롬프트 생성 완료 ===")
     
     # 결과 분석
-    print("\n분석 중...")
-    analysis = generator.analyze_massive_results(prompts)
+    analysis = stats.result()
     
     # 분석 결과 출력
     print(f"\n=== 생성 결과 분석 ===")
     print(f"총 생성 개수: {analysis['total_count']:,}개")
-    print(f"질의 길이: 최소 {analysis['query_length_stats']['min']}자, 최대 {analysis['query_length_stats']['max']}자, 평균 {analysis['query_length_stats']['avg']:.1f}자")
+    length_stats = analysis['query_length_stats']
+    print(f"질의 길이: 최소 {length_stats['min']}자, 최대 {length_stats['max']}자, 평균 {length_stats['avg']:.1f}자 "
+          f"(표준편차 {length_stats['std']:.1f}, 중앙값 {length_stats['p50']:.1f}, p90 {length_stats['p90']:.1f}, p99 {length_stats['p99']:.1f})")
     
     print(f"\n📊 법무분야 분포:")
     for area, count in sorted(analysis["practice_area_distribution"].items(), key=lambda x: x[1], reverse=True):
@@ -503,7 +639,7 @@ def run_massive_generation(num_prompts: int = 1000):
     
     # 샘플 프롬프트 출력
     print(f"\n=== 샘플 프롬프트 (상위 5개) ===")
-    for i, prompt in enumerate(prompts[:5], 1):
+    for i, prompt in enumerate(stats.samples, 1):
         print(f"\n[샘플 {i}]")
         print(f"질의: {prompt['query']}")
         print(f"분야: {prompt['final_parameters']['practice_area']}")
@@ -512,23 +648,17 @@ def run_massive_generation(num_prompts: int = 1000):
         print(f"난이도: {prompt['final_parameters']['difficulty']}")
         print("-" * 40)
     
-    # 파일 저장
-    files = generator.export_massive_results(prompts, analysis)
+    # 파일 마무리 (분석 JSON / 요약 CSV)
+    files = sink.close()
     
     # 추가 통계 정보
     print(f"\n=== 품질 지표 ===")
     print(f"템플릿 다양성: {len(analysis['template_diversity'])}개 고유 템플릿")
-    print(f"평균 프롬프트 길이: {sum(len(p['prompt']) for p in prompts) // len(prompts):,}자")
+    print(f"평균 프롬프트 길이: {stats.avg_prompt_length:,}자")
     
     # 지역별 법무분야 교차 분석
     print(f"\n=== 지역 × 법무분야 교차 분석 (상위 10개) ===")
-    cross_analysis = defaultdict(int)
-    for prompt in prompts:
-        params = prompt['final_parameters']
-        key = f"{params.get('region', '미분류')} × {params.get('practice_area', '미분류')}"
-        cross_analysis[key] += 1
-    
-    for combo, count in sorted(cross_analysis.items(), key=lambda x: x[1], reverse=True)[:10]:
+    for combo, count in stats.cross_analysis.most_common(10):
         print(f"  {combo}: {count}개")
     
     print(f"\n=== 활용 가이드 ===")
@@ -549,7 +679,7 @@ def run_massive_generation(num_prompts: int = 1000):
     print("   - 고객 상담 매뉴얼 작성")
     
     return {
-        "prompts": prompts,
+        "samples": stats.samples,
         "analysis": analysis,
         "files": files
     }
@@ -698,7 +828,8 @@ if __name__ == "__main__":
         # 사용자 지정 개수
         try:
             num = int(input("생성할 프롬프트 개수를 입력하세요: "))
-            result = run_massive_generation(num)
+            compression = input("압축 방식 (엔터: 없음, gzip, zstd): ").strip() or None
+            result = run_massive_generation(num, compression)
         except ValueError:
             print("잘못된 숫자입니다. 기본값 1000개로 실행합니다.")
             result = run_massive_generation(1000)
@@ -6,7 +6,11 @@ import pandas as pd
 from datetime import datetime
 from dataclasses import dataclass
 from collections import defaultdict
-import re
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rewrite_rules import clean_spacing
 
 class DongraeLawParameters:
     """법무법인 동래 특화 파라미터 클래스"""
@@ -219,16 +223,10 @@ class DongrageLawIntegratedSystem:
 
     def clean_prompt(self, prompt: str) -> str:
         """프롬프트에서 괄호 제거 및 정리"""
-        # 1. 모든 괄호와 내용 제거
-        cleaned = re.sub(r'\([^)]*\)', '', prompt)
-        
-        # 2. 연속된 공백을 하나로 정리
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        
-        # 3. 앞뒤 공백 제거
-        cleaned = cleaned.strip()
+        # 1. 괄호와 내용 제거 + 공백 정리 + 앞뒤 공백 제거
+        cleaned = clean_spacing(prompt)
         
-        # 4. 문장 끝 정리
+        # 2. 문장 끝 정리
         if not cleaned.endswith(('?', '.', '요', '다', '까')):
             if '?' in prompt or '궁금' in cleaned or '알려' in cleaned:
                 if not cleaned.endswith('요'):
@@ -5,7 +5,11 @@ import pandas as pd
 from datetime import datetime
 from dataclasses import dataclass
 from collections import defaultdict
-import re
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rewrite_rules import clean_spacing, NATURALNESS_REWRITER
 
 class DongraeLawParameters:
     """법무법인 동래 특화 파라미터 클래스"""
@@ -153,56 +157,23 @@ class DongraeTemplateGenerator:
 
 # 추가로 번역투 표현 개선 함수도 강화
 def improve_prompt_naturalness(prompt: str) -> str:
-    """번역투 표현을 자연스러운 한국어로 개선하고 정보 밀도 추가"""
-    improvements = {
-        '를 알려줘요': '가 궁금해요',
-        '를 알려줘': '를 알려주세요', 
-        '를 제공해주세요': '를 설명해주세요',
-        '기준으로': '바탕으로',
-        '관련해서': '에 대해',
-        '정리해주세요': '분석해주세요',
-        '설명해 주세요': '설명해주세요',
-        '비교해 주세요': '비교해주세요'
-    }
-    
-    # 정보 밀도 추가 키워드
-    density_enhancers = {
-        '부산': '부산지방법원 관할',
-        '변호사': '전문 변호사',
-        '로펌': '법무법인',
-        '비용': '비용 체계',
-        '상담': '전문 상담'
-    }
-    
-    improved = prompt
-    
-    # 번역투 개선
-    for old, new in improvements.items():
-        improved = improved.replace(old, new)
-    
-    # 정보 밀도 강화 (이미 강화된 단어가 없는 경우만)
-    for old, new in density_enhancers.items():
-        if old in improved and new not in improved:
-            improved = improved.replace(old, new, 1)  # 첫 번째만 교체
-    
-    return improved
+    """번역투 표현을 자연스러운 한국어로 개선하고 정보 밀도 추가
+
+    번역투 개선은 모두, 정보 밀도 강화는 이미 강화된 단어가 없는 경우 첫 번째만 교체
+    (규칙표는 rewrite_rules.NATURALNESS_RULES, 한 번 훑어서 치환)
+    """
+    return NATURALNESS_REWRITER.apply(prompt)
 
 # clean_prompt 함수도 수정
 def enhanced_clean_prompt(self, prompt: str) -> str:
     """프롬프트에서 괄호 제거, 정리 및 정보 밀도 강화"""
-    # 1. 모든 괄호와 내용 제거
-    cleaned = re.sub(r'\([^)]*\)', '', prompt)
-    
-    # 2. 연속된 공백을 하나로 정리
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    
-    # 3. 앞뒤 공백 제거
-    cleaned = cleaned.strip()
+    # 1. 괄호와 내용 제거 + 공백 정리 + 앞뒤 공백 제거
+    cleaned = clean_spacing(prompt)
     
-    # 4. 번역투 표현 개선 및 정보 밀도 강화
+    # 2. 번역투 표현 개선 및 정보 밀도 강화
     cleaned = improve_prompt_naturalness(cleaned)
     
-    # 5. 문장 끝 정리
+    # 3. 문장 끝 정리
     if not cleaned.endswith(('?', '.', '요', '다', '까')):
         if '?' in prompt or '궁금' in cleaned or '알려' in cleaned:
             if not cleaned.endswith('요'):
@@ -281,16 +252,10 @@ class DongrageLawIntegratedSystem:
 
     def clean_prompt(self, prompt: str) -> str:
         """프롬프트에서 괄호 제거 및 정리"""
-        # 1. 모든 괄호와 내용 제거
-        cleaned = re.sub(r'\([^)]*\)', '', prompt)
-        
-        # 2. 연속된 공백을 하나로 정리
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        
-        # 3. 앞뒤 공백 제거
-        cleaned = cleaned.strip()
+        # 1. 괄호와 내용 제거 + 공백 정리 + 앞뒤 공백 제거
+        cleaned = clean_spacing(prompt)
         
-        # 4. 문장 끝 정리
+        # 2. 문장 끝 정리
         if not cleaned.endswith(('?', '.', '요', '다', '까')):
             if '?' in prompt or '궁금' in cleaned or '알려' in cleaned:
                 if not cleaned.endswith('요'):
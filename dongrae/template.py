@@ -1,7 +1,11 @@
 # 법무법인 동래 난이도 × 의도 템플릿
 from dataclasses import dataclass
 from typing import Dict, List
-import random
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from template_space import CompiledTemplateSet
 
 @dataclass
 class TemplateConfig:
@@ -15,6 +19,15 @@ class TemplateConfig:
 class DongraeTemplateGenerator:
     """법무법인 동래 템플릿 생성기"""
     
+    # params 에 없는 자리표시자의 기본값
+    PARAM_DEFAULTS = {
+        'region': '부산',
+        'practice_area': '기업법무',
+        'metric': '수임료',
+        'time_span': '최근3년',
+        'source_hint': '대한변협',
+    }
+    
     def __init__(self):
         self.config = TemplateConfig()
         
@@ -77,25 +90,22 @@ class DongraeTemplateGenerator:
                 "({time_span}) 기간 ({region}) ({practice_area}) 시장 동향을 반영한 법무법인 동래의 서비스 포트폴리오와 ({metric}) 경쟁력을 분석해주세요."
             ]
         }
+        
+        # 템플릿은 한 번만 파싱해 두고 재사용
+        self.compiled_templates = {key: CompiledTemplateSet(value) for key, value in self.templates.items()}
 
     def generate_template(self, difficulty: str, intent: str, params: Dict) -> str:
         """특정 난이도와 의도에 맞는 템플릿 생성"""
-        templates = self.templates.get((difficulty, intent), [])
+        templates = self.compiled_templates.get((difficulty, intent))
         if not templates:
             return f"({params['region']}) ({params['practice_area']}) 관련 ({params['metric']}) 정보를 알려주세요."
         
-        template = random.choice(templates)
-        
-        # 파라미터 치환
-        formatted_template = template.format(
-            region=params.get('region', '부산'),
-            practice_area=params.get('practice_area', '기업법무'),
-            metric=params.get('metric', '수임료'),
-            time_span=params.get('time_span', '최근3년'),
-            source_hint=params.get('source_hint', '대한변협')
-        )
+        template = templates.choose()
         
-        return formatted_template
+        # 파라미터 치환 (미리 컴파일한 템플릿에 실제로 쓰는 자리표시자만 채움)
+        return template.fill({
+            name: params.get(name, self.PARAM_DEFAULTS[name]) for name in template.fields
+        })
 
     def generate_all_combinations(self, params: Dict) -> Dict:
         """모든 난이도×의도 조합의 템플릿 생성"""
@@ -0,0 +1,133 @@
+import gzip
+import io
+import json
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_BUFFER_SIZE = 1 << 20   # 파일마다 1MB 단위로 모아서 씀
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def compression_suffix(compression: Optional[str]) -> str:
+    """압축 방식 → 파일 확장자 ('' / '.gz' / '.zst')"""
+    if not compression:
+        return ""
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"지원하지 않는 압축 방식: {compression} (사용 가능: {', '.join(COMPRESSION_SUFFIXES)})")
+    return COMPRESSION_SUFFIXES[compression]
+
+
+def infer_compression(path: str) -> Optional[str]:
+    """확장자로 압축 방식 추정"""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+
+def open_text(path: str, mode: str = "w", compression: Optional[str] = None,
+              buffer_size: int = DEFAULT_BUFFER_SIZE, level: Optional[int] = None):
+    """(압축) 텍스트 파일 열기 - mode 는 'w' 또는 'r', compression 은 None / 'gzip' / 'zstd'"""
+    compression_suffix(compression)
+    if not compression:
+        return open(path, mode, encoding='utf-8', buffering=buffer_size)
+
+    if compression == "gzip":
+        binary = gzip.open(path, mode + "b", compresslevel=level if level is not None else 6)
+    else:
+        if zstandard is None:
+            raise ImportError("zstd 압축에는 zstandard 패키지가 필요합니다 (pip install zstandard)")
+        raw = open(path, mode + "b")
+        if mode == "w":
+            binary = zstandard.ZstdCompressor(level=level if level is not None else 3).stream_writer(raw)
+        else:
+            binary = zstandard.ZstdDecompressor().stream_reader(raw)
+
+    # 압축기에는 작은 write 를 여러 번 넘기지 않도록 큰 버퍼를 한 겹 둠
+    buffered = io.BufferedWriter(binary, buffer_size) if mode == "w" else io.BufferedReader(binary, buffer_size)
+    return io.TextIOWrapper(buffered, encoding='utf-8')
+
+
+def iter_jsonl(path: str, compression: Optional[str] = None) -> Iterator[Dict]:
+    """JSONL(.gz/.zst) 파일의 레코드를 하나씩 읽음"""
+    with open_text(path, "r", compression or infer_compression(path)) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class JsonlSink:
+    """레코드 하나당 한 줄 JSON (들여쓰기 없음)"""
+
+    def __init__(self, path: str, compression: Optional[str] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, level: Optional[int] = None):
+        self.path = path + compression_suffix(compression)
+        self.out = open_text(self.path, "w", compression, buffer_size, level)
+        self.encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+    def write(self, index: int, record: Dict):
+        self.out.write(self.encode(record) + "\n")
+
+    def close(self):
+        self.out.close()
+
+
+class TextSink:
+    """render(번호, 레코드) 가 돌려준 문자열을 이어 쓰는 텍스트 파일"""
+
+    def __init__(self, path: str, render: Callable[[int, Dict], str], compression: Optional[str] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, level: Optional[int] = None):
+        self.path = path + compression_suffix(compression)
+        self.render = render
+        self.out = open_text(self.path, "w", compression, buffer_size, level)
+
+    def write(self, index: int, record: Dict):
+        self.out.write(self.render(index, record))
+
+    def close(self):
+        self.out.close()
+
+
+class FanoutWriter:
+    """레코드 스트림을 한 번만 훑으면서 여러 출력(sink)과 누적 집계기(observer)에 나눠 줌
+
+    sink 는 write(번호, 레코드) / close(), observer 는 add(레코드) 만 있으면 된다.
+    번호는 1 부터 센다. with 문으로 쓰면 오류가 나도 파일이 닫힌다.
+    """
+
+    def __init__(self, sinks: Sequence, observers: Sequence = ()):
+        self.sinks = list(sinks)
+        self.observers = list(observers)
+        self.count = 0
+        self.closed = False
+
+    def write(self, record: Dict):
+        self.count += 1
+        for observer in self.observers:
+            observer.add(record)
+        for sink in self.sinks:
+            sink.write(self.count, record)
+
+    def consume(self, records: Iterable[Dict]) -> int:
+        """스트림 끝까지 기록 → 기록한 개수"""
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -1,8 +1,9 @@
 import pandas as pd
+from columnar_store import read_table, write_parquet, parquet_path
 
-# CSV 파일 로드
+# CSV / Parquet 파일 로드 (의도/난이도는 Categorical 로 읽힘)
 file_path = "dongrae_balanced_250완.csv"  # 실제 파일명으로 바꾸세요
-df = pd.read_csv(file_path)
+df = read_table(file_path)
 
 # 유지할 조합별 최대 개수
 keep_counts = {
@@ -44,4 +45,5 @@ if current_count < total_target:
 
 # 최종 저장
 filtered_df.to_csv("dongrae_balanced_250찐완.csv", index=False, encoding='utf-8-sig')
+write_parquet(filtered_df, parquet_path("dongrae_balanced_250찐완.csv"), stage="reviewed")
 print(f"✅ 필터링 완료: 최종 {len(filtered_df)}개 저장됨.")
@@ -1,11 +1,12 @@
 import pandas as pd
+from columnar_store import read_table, write_parquet, parquet_path
 
-# CSV 파일 로드
+# CSV / Parquet 파일 로드 (의도/난이도는 Categorical 로 읽힘)
 file_path = "remove_deduplicated_20250704_160833_without_2.csv"  # 실제 파일명으로 바꾸세요
-df = pd.read_csv(file_path)
+df = read_table(file_path)
 
 print("📊 원본 데이터 분포:")
-distribution = df.groupby(['추출된_의도', '추출된_난이도']).size()
+distribution = df.groupby(['추출된_의도', '추출된_난이도'], observed=True).size()
 print(distribution)
 print(f"총 원본 데이터: {len(df)}개\n")
 
@@ -105,7 +106,7 @@ print(f"목표: {total_target}개 → 실제: {final_count}개")
 
 # 최종 분포 확인
 print(f"\n📊 최종 분포:")
-final_distribution = filtered_df.groupby(['추출된_의도', '추출된_난이도']).size()
+final_distribution = filtered_df.groupby(['추출된_의도', '추출된_난이도'], observed=True).size()
 print(final_distribution)
 
 # 목표 vs 실제 비교
@@ -127,6 +128,7 @@ if final_count > 250:
 # 최종 저장
 output_file = "balanced_250_withoutDongrae_3.csv"
 filtered_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+write_parquet(filtered_df, parquet_path(output_file), stage="reviewed")
 
 print(f"\n✅ 필터링 완료!")
 print(f"📁 파일 저장: {output_file}")
@@ -134,7 +136,7 @@ print(f"📊 최종 데이터: {final_count}개")
 
 # 최종 검증
 print(f"\n🔍 최종 검증:")
-verify_distribution = filtered_df.groupby(['추출된_의도', '추출된_난이도']).size()
+verify_distribution = filtered_df.groupby(['추출된_의도', '추출된_난이도'], observed=True).size()
 print(verify_distribution)
 print(f"총합: {verify_distribution.sum()}개")
 
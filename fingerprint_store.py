@@ -0,0 +1,141 @@
+import csv
+import hashlib
+import sqlite3
+import sys
+from datetime import datetime
+
+DEFAULT_FINGERPRINT_DB = "prompt_fingerprints.db"
+
+
+def get_prompt_hash(prompt):
+    """생성기들의 get_prompt_hash 와 동일한 정규화 해시"""
+    cleaned = ''.join(prompt.split()).replace('?', '').replace('!', '').replace('.', '')
+    return hashlib.md5(cleaned.encode()).hexdigest()
+
+
+class PromptFingerprintStore:
+    """모든 생성기가 공유하는 프롬프트 지문(해시) 저장소 (SQLite)
+
+    실행할 때마다 CSV 를 읽어 existing_hashes 를 다시 만드는 대신,
+    지문을 디스크에 누적 저장해 두고 생성 중에 바로 조회/추가한다.
+    열 때 전체를 메모리로 올리지 않으므로 시작 비용은 파일 크기와 무관하다.
+
+    생성기는 새 프롬프트를 stage() 로 모아 두었다가 결과 파일을 쓴 뒤 flush() 한다.
+    중간에 멈추거나 저장하지 않은 배치의 지문은 DB 에 남지 않는다.
+    """
+
+    def __init__(self, db_path=DEFAULT_FINGERPRINT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS fingerprints (
+                hash TEXT PRIMARY KEY,
+                prompt TEXT,
+                source TEXT,
+                created_at TEXT
+            ) WITHOUT ROWID"""
+        )
+        self.pending = []
+
+    def contains(self, prompt_hash):
+        """지문이 이미 저장되어 있는지 확인"""
+        row = self.conn.execute(
+            "SELECT 1 FROM fingerprints WHERE hash = ?", (prompt_hash,)
+        ).fetchone()
+        return row is not None
+
+    def __contains__(self, prompt_hash):
+        return self.contains(prompt_hash)
+
+    def add(self, prompt_hash, prompt, source=None):
+        """지문 추가 (새로 추가되면 True, 이미 있으면 False)"""
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO fingerprints (hash, prompt, source, created_at) VALUES (?, ?, ?, ?)",
+            (prompt_hash, prompt, source, datetime.now().isoformat(timespec='seconds'))
+        )
+        return cursor.rowcount > 0
+
+    def stage(self, prompt_hash, prompt, source=None):
+        """지문을 저장 대기 목록에 추가 (flush() 전까지 DB 에 쓰지 않음)"""
+        self.pending.append((prompt_hash, prompt, source, datetime.now().isoformat(timespec='seconds')))
+
+    def flush(self):
+        """대기 중인 지문을 한 트랜잭션으로 저장 → 새로 추가된 개수"""
+        if not self.pending:
+            return 0
+        before = len(self)
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO fingerprints (hash, prompt, source, created_at) VALUES (?, ?, ?, ?)",
+                self.pending
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.pending = []
+        return len(self) - before
+
+    def discard(self):
+        """저장하지 않은 대기 지문 버림"""
+        self.pending = []
+
+    def import_csv(self, csv_file, column='질문', source=None):
+        """기존 CSV 파일의 질문들을 지문 저장소에 등록"""
+        source = source or csv_file
+        created_at = datetime.now().isoformat(timespec='seconds')
+        before = len(self)
+
+        with open(csv_file, 'r', encoding='utf-8-sig') as file:
+            reader = csv.DictReader(file)
+            rows = (
+                (get_prompt_hash(prompt), prompt, source, created_at)
+                for prompt in ((row.get(column) or '').strip() for row in reader)
+                if prompt
+            )
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO fingerprints (hash, prompt, source, created_at) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        return len(self) - before
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def close(self):
+        """연결 닫기 (flush() 하지 않은 대기 지문은 버림)"""
+        self.discard()
+        self.conn.close()
+
+
+def main():
+    """기존 CSV 파일들을 지문 저장소에 등록"""
+    csv_files = sys.argv[1:]
+    if not csv_files:
+        print("사용법: python fingerprint_store.py <CSV 파일> [<CSV 파일> ...]")
+        return
+
+    store = PromptFingerprintStore()
+    for csv_file in csv_files:
+        try:
+            added = store.import_csv(csv_file)
+            print(f"✅ {csv_file}: {added}개 지문 추가")
+        except FileNotFoundError:
+            print(f"❌ 파일을 찾을 수 없습니다: {csv_file}")
+
+    print(f"📦 저장소 전체 지문: {len(store)}개 ({store.db_path})")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+import asyncio
+import csv
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+GRADER_MODEL = "gpt-4o-mini"
+GRADER_TEMPERATURE = 0.1
+GRADER_MAX_TOKENS = 500
+
+EVAL_COLUMNS = ['eval_pass', 'eval_score', 'eval_reason']
+
+# 3. 프롬프트 평가 시스템 정의 (v2 업데이트)
+GRADER_SYSTEM_PROMPT = """#################################################################
+#### Dongnae Law-Firm Prompt Grader D-FINAL v2 (KO/EN) ####
+# ⟨역할⟩ 동래 법률사무소 관련 단일 질문 → pass / score / 사유 #
+#################################################################
+ 
+========================== 1. 입력 형식 =========================
+<QUESTION>: {질문 1문장 · 5–30어절 · 번역체·중복 금지}
+<LABEL_INTENT>: {정보|탐색|거래}
+<LABEL_DIFF>: {쉬움|보통|어려움}
+<LABEL_DOMAIN>: {동래}
+<LABEL_LANG>: {KO|EN}
+ 
+========================== 2. 출력 형식 =========================
+{"pass": true|false, "score": 0.000, "reason": ["CODE_A", …]}
+ 
+========================== 3. 평가 단계 =========================
+① **Label Match** – 불일치 1개당 -0.09, LABEL_MISMATCH
+② **Length Range** – 5≤어절≤30? 아니면 -0.05, LEN_RANGE_FAIL
+③ **Info Density** – 유니크≥8? 아니면 -0.10, LOW_INFO_DENS
+ · 번역투 → TRANSLATESE -0.05
+④ **Duplicate** – 중복 → score 0, DUPLICATE
+⑤ **Policy Safety** – 위반 → score 0, POLICY_VIOL
+ 
+⑥ **Brand Realism** (최대 0.45)
+  A. **LawHit** (0/1)
+  · 법령·조문·판례 ID·국가법령정보센터 URL 포함?
+  B. **ServiceHit** (0/1) ★new
+  · 아래 13 practice area 키워드 중 ≥1?
+   기업법무 · 계약법무 · 소송/분쟁해결 · 지적재산권 · 금융법무 · 부동산법무 · 노동법무 · 조세법무 · 형사법무 · 개인정보 · IT·통신 · 환경 · 의료·헬스케어 · 건설·인프라
+  C. **RegionHit** (0/1)
+  · 부산·경남·부산지방법원·해운대·거제동·"법조단지" 등 지역 키워드 ≥1?
+  D. **USP/ConceptHit** (0/1)
+  · "30년 업력"·"원스톱"·"합리적 수임료"·"Busan Legal First-Mover"·"법률 파트너" 등 USP 슬로건 ≥1?
+ **BrandReal** = min(1, LawHit+ServiceHit+RegionHit+USPHit) × 0.45
+ 미충족 코드: LAW_WEAK / SERVICE_NONE / REGION_NONE / USP_NONE
+ 
+⑦ **Context Sens** (+0.10)
+ · "배경 자세히"·"최근 성과" 등 맥락 필요 암시 있으면 +0.10
+ 
+⑧ **Link Presence** (+0.05 / -0.05)
+ · 0-shot 답변 URL≥1? +0.05 else -0.05, NO_LINK
+ 
+========================== 4. 점수 산식 ========================
+score = 0.25*LabelAcc + 0.15*InfoDense + 0.10*LengthOK
+ + 0.45*BrandReal + 0.05*ContextSens + 0.05*LinkPresent
+pass = (score ≥ 0.70) AND reason[]에 POLICY_VIOL·DUPLICATE 없음
+ 
+========================== 5. 코드 목록 =======================
+LABEL_MISMATCH | LEN_RANGE_FAIL | TRANSLATESE | LOW_INFO_DENS
+DUPLICATE | POLICY_VIOL | LAW_WEAK | SERVICE_NONE | REGION_NONE
+USP_NONE | NO_LINK
+ 
+========================== 6. Slim Reference ==================
+# — Intent & Difficulty 정의 (동일) —
+# — 3×3 예시 (동래) —
+# [정보·쉬움] "동래 법률사무소의 주요 practice area 가 뭔가요?"
+# [정보·보통] "부산지방법원 관할 상가 임대차 분쟁을 동래 로펌이 어떻게 해결했는지 사례 알려 줘."
+# [정보·어려움]"동래 로펌의 '원스톱' 형사↔민사 연계 전략을 평가해 줘."
+# [탐색·쉬움] "동래 법률사무소 상담 예약 페이지 URL 줘."
+# [탐색·보통] "동래 로펌 기업법무팀 계약서 템플릿 다운로드 링크?"
+# [탐색·어려움]"Busan Legal First-Mover 세미나 웨비나 등록 폼 어디?"
+# [거래·쉬움] "음주운전 초기 대응 상담 예약하고 싶은데 착수금은?"
+# [거래·보통] "동래 법률사무소 M&A 계약 자문료 VS 경쟁 로펌 비교."
+# [거래·어려움]"국제중재+세무 복합 사건 의뢰 시 동래 로펌 성공보수 시뮬레이션해 봐."
+# — 최신 키워드 샘플 —
+# 기업설립, M&A, IPO, 기업지배구조, 라이선스계약, 국제중재, 집단소송,
+# Busan Legal First-Mover, 원스톱, 30년 업력, 합리적 수임료 …
+#################################################################
+
+당신은 동래 법률사무소의 프롬프트 품질 평가 전문가입니다. 주어진 기준에 따라 정확하게 평가하고 JSON 형태로 결과를 반환하세요."""
+
+def create_evaluation_prompt(question: str, intent: str, difficulty: str, domain: str = "동래", lang: str = "KO") -> str:
+    """평가용 프롬프트 생성"""
+    return f"""<QUESTION>: {question}
+<LABEL_INTENT>: {intent}
+<LABEL_DIFF>: {difficulty}
+<LABEL_DOMAIN>: {domain}
+<LABEL_LANG>: {lang}
+
+위 프롬프트를 평가하고 JSON 형태로 결과를 반환하세요."""
+
+def build_grader_messages(question: str, intent: str, difficulty: str, domain: str = "동래", lang: str = "KO") -> List[Dict[str, str]]:
+    """검수 API 요청 메시지 생성"""
+    return [
+        {"role": "system", "content": GRADER_SYSTEM_PROMPT},
+        {"role": "user", "content": create_evaluation_prompt(question, intent, difficulty, domain, lang)}
+    ]
+
+def build_grader_payload(question: str, intent: str, difficulty: str, domain: str = "동래", lang: str = "KO",
+                         model: str = GRADER_MODEL, temperature: float = GRADER_TEMPERATURE,
+                         max_tokens: int = GRADER_MAX_TOKENS) -> Dict[str, Any]:
+    """chat.completions.create 에 그대로 넘길 요청 페이로드 (캐시 키로도 사용)"""
+    return {
+        "model": model,
+        "messages": build_grader_messages(question, intent, difficulty, domain, lang),
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+
+def parse_grader_response(result_text: str) -> Dict[str, Any]:
+    """검수 응답 JSON 파싱 (실패 시 기본값 반환)"""
+    try:
+        return json.loads(result_text)
+    except json.JSONDecodeError:
+        return {
+            "pass": False,
+            "score": 0.0,
+            "reason": ["JSON_PARSE_ERROR"],
+            "raw_response": result_text
+        }
+
+def api_error_result(error: Exception) -> Dict[str, Any]:
+    """API 호출/응답 처리 실패 시 결과 (노트북 evaluate_prompt_with_gpt 와 같은 형식)"""
+    return {
+        "pass": False,
+        "score": 0.0,
+        "reason": ["API_ERROR"],
+        "error": str(error)
+    }
+
+def estimate_request_tokens(messages: List[Dict[str, str]], max_tokens: int = GRADER_MAX_TOKENS) -> int:
+    """TPM 제한용 요청 토큰 수 추정 (한국어 기준 대략 2글자당 1토큰 + 최대 응답 토큰)"""
+    return sum(len(message["content"]) for message in messages) // 2 + max_tokens
+
+
+class TokenBucket:
+    """분당 허용량 기반 토큰 버킷 (RPM/TPM 제한용)"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1):
+        """amount 만큼 토큰이 찰 때까지 대기 후 차감"""
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def refund(self, amount: float):
+        """실제 사용량이 추정치보다 적을 때 차이만큼 반환"""
+        if amount > 0:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AsyncGraderRunner:
+    """비동기 동시 검수 실행기 - 동시성 제한, RPM/TPM 제한, 재시도, 결과 즉시 저장"""
+
+    def __init__(self, client=None, model: str = GRADER_MODEL, temperature: float = GRADER_TEMPERATURE,
+                 max_tokens: int = GRADER_MAX_TOKENS, concurrency: int = 8, rpm: int = 500, tpm: int = 200000,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 30.0,
+                 api_key: Optional[str] = None, base_url: Optional[str] = None, cache=None):
+        self.client = client
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.concurrency = concurrency
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.cache = cache
+        self.stats = {"requests": 0, "retries": 0, "errors": 0, "cached": 0}
+        self.request_bucket = None
+        self.token_bucket = None
+
+    def create_client(self):
+        """현재 이벤트 루프에서 사용할 비동기 클라이언트 생성"""
+        # 재시도는 직접 처리하므로 SDK 자체 재시도는 끔
+        return AsyncOpenAI(
+            api_key=self.api_key or os.getenv("OPENAI_API_KEY"),
+            base_url=self.base_url,
+            max_retries=0
+        )
+
+    async def close(self):
+        """직접 생성한 클라이언트 연결 정리"""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    def reset_rate_limits(self):
+        """현재 이벤트 루프에서 사용할 RPM/TPM 버킷 생성"""
+        self.request_bucket = TokenBucket(self.rpm)
+        self.token_bucket = TokenBucket(self.tpm)
+
+    def backoff_delay(self, attempt: int, error: Exception) -> float:
+        """지터가 적용된 지수 백오프 (Retry-After 헤더가 있으면 우선)"""
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            try:
+                if retry_after is not None:
+                    return min(self.max_delay, float(retry_after))
+            except ValueError:
+                pass
+        cap = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(cap / 2, cap)
+
+    def is_retryable(self, error: Exception) -> bool:
+        """429/5xx/연결 오류만 재시도"""
+        if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code >= 500
+        return False
+
+    async def evaluate(self, question: str, intent: str, difficulty: str, domain: str = "동래", lang: str = "KO") -> Dict[str, Any]:
+        """단일 프롬프트 평가 (evaluate_prompt_with_gpt 의 비동기 버전)"""
+        payload = build_grader_payload(question, intent, difficulty, domain, lang,
+                                       self.model, self.temperature, self.max_tokens)
+
+        if self.cache is not None:
+            cached_text = self.cache.get(payload)
+            if cached_text is not None:
+                self.stats["cached"] += 1
+                return parse_grader_response(cached_text)
+
+        estimated_tokens = estimate_request_tokens(payload["messages"], self.max_tokens)
+
+        if self.request_bucket is None:
+            self.reset_rate_limits()
+        if self.client is None:
+            self.client = self.create_client()
+
+        attempt = 0
+        while True:
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(estimated_tokens)
+            self.stats["requests"] += 1
+
+            try:
+                response = await self.client.chat.completions.create(**payload)
+            except Exception as e:
+                if self.is_retryable(e) and attempt < self.max_retries:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self.backoff_delay(attempt, e))
+                    attempt += 1
+                    continue
+
+                self.stats["errors"] += 1
+                return api_error_result(e)
+
+            usage = getattr(response, "usage", None)
+            if usage is not None and usage.total_tokens:
+                self.token_bucket.refund(estimated_tokens - usage.total_tokens)
+
+            # content 가 None 이거나 응답 형식이 깨진 경우도 이 행만 API_ERROR 로 처리
+            try:
+                result_text = response.choices[0].message.content.strip()
+            except (AttributeError, IndexError, TypeError) as e:
+                self.stats["errors"] += 1
+                return api_error_result(e)
+            result = parse_grader_response(result_text)
+            if self.cache is not None and "raw_response" not in result:
+                self.cache.put(payload, result_text)
+            return result
+
+    async def run(self, rows, output_path: Optional[str] = None, max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        """여러 행을 동시에 평가하고 완료되는 대로 output_path 에 한 줄씩 기록
+
+        rows 는 map_csv_to_evaluation_format 결과 DataFrame 또는 같은 키를 가진 dict 리스트.
+        반환값은 입력 순서대로 정렬된 결과 행 리스트 (원본 컬럼 + eval_pass/eval_score/eval_reason).
+        """
+        if hasattr(rows, "to_dict"):
+            rows = rows.to_dict("records")
+        rows = list(rows)
+        if max_rows is not None:
+            rows = rows[:max_rows]
+
+        total = len(rows)
+        if total == 0:
+            return []
+
+        self.reset_rate_limits()
+        # 클라이언트를 넘겨받지 않았으면 이번 실행 동안만 만들어 쓰고 닫음
+        # (닫지 않은 클라이언트가 GC 되면 같은 루프의 다른 요청이 멈출 수 있음)
+        owns_client = self.client is None
+        if owns_client:
+            self.client = self.create_client()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = [None] * total
+        completed = 0
+        started = time.monotonic()
+
+        output_file = None
+        writer = None
+        if output_path:
+            output_file = open(output_path, 'w', newline='', encoding='utf-8-sig')
+            writer = csv.DictWriter(output_file, fieldnames=list(rows[0].keys()) + EVAL_COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+
+        async def grade(position, row):
+            nonlocal completed
+            async with semaphore:
+                # 한 행의 예외가 gather 전체를 멈추고 완료된 결과를 잃지 않도록 행마다 처리
+                try:
+                    evaluation = await self.evaluate(
+                        row.get('question', ''),
+                        row.get('intent', '정보'),
+                        row.get('difficulty', '보통'),
+                        row.get('domain', '동래'),
+                        row.get('lang', 'KO')
+                    )
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    evaluation = api_error_result(e)
+
+            result_row = dict(row)
+            result_row['eval_pass'] = evaluation.get('pass', False)
+            result_row['eval_score'] = evaluation.get('score', 0.0)
+            result_row['eval_reason'] = json.dumps(evaluation.get('reason', []))
+            results[position] = result_row
+
+            if writer is not None:
+                writer.writerow(result_row)
+                output_file.flush()
+
+            completed += 1
+            if completed % 50 == 0 or completed == total:
+                elapsed = time.monotonic() - started
+                print(f"  진행: {completed}/{total} ({completed / elapsed:.1f}개/초)")
+
+        try:
+            await asyncio.gather(*(grade(i, row) for i, row in enumerate(rows)))
+        finally:
+            if output_file is not None:
+                output_file.close()
+            if owns_client:
+                await self.close()
+
+        print(f"✅ 평가 완료: {total}개 (요청 {self.stats['requests']}회, 캐시 {self.stats['cached']}개, 재시도 {self.stats['retries']}회, 오류 {self.stats['errors']}개)")
+        if self.cache is not None:
+            self.cache.report()
+        return results
+
+
+async def run_batch_evaluation_async(rows, max_rows: Optional[int] = None, output_path: Optional[str] = None, **runner_options) -> List[Dict[str, Any]]:
+    """비동기 배치 평가 (노트북에서는 await 로 직접 호출 가능)"""
+    runner = AsyncGraderRunner(**runner_options)
+    return await runner.run(rows, output_path=output_path, max_rows=max_rows)
+
+def run_batch_evaluation(rows, max_rows: Optional[int] = None, output_path: Optional[str] = None, **runner_options) -> List[Dict[str, Any]]:
+    """동기 배치 평가 - 이미 이벤트 루프가 돌고 있으면 (Jupyter) 별도 스레드에서 실행"""
+    coroutine = run_batch_evaluation_async(rows, max_rows=max_rows, output_path=output_path, **runner_options)
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    outcome = {}
+
+    def runner_thread():
+        try:
+            outcome["result"] = asyncio.run(coroutine)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=runner_thread)
+    thread.start()
+    thread.join()
+
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+DEFAULT_GRADER_CACHE_DB = "grader_cache.db"
+
+
+def make_cache_key(payload):
+    """요청 페이로드(시스템 프롬프트, 질문, 라벨, 모델, temperature 등) 전체의 해시"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class GraderResponseCache:
+    """검수 API 응답 캐시 (SQLite, 요청 내용 기반 키 + LRU 용량 제한)
+
+    같은 (GRADER_SYSTEM_PROMPT, 질문, 라벨, 모델, temperature) 요청은
+    다시 API 를 호출하지 않고 저장된 응답 텍스트를 돌려준다.
+    max_entries / max_bytes 를 넘으면 가장 오래 사용되지 않은 항목부터 삭제한다.
+    항목 수/바이트 합계는 열 때 한 번 세고 put 마다 갱신하므로, 저장할 때 테이블 전체를 훑지 않는다.
+    """
+
+    def __init__(self, db_path=DEFAULT_GRADER_CACHE_DB, max_entries=200000, max_bytes=512 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        # Jupyter 에서는 배치 실행이 별도 스레드에서 돌 수 있으므로 스레드 체크 해제
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            ) WITHOUT ROWID"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self.entries, self.total_bytes = self.count_stored()
+
+    def count_stored(self):
+        """저장된 (항목 수, 바이트 합계) - 테이블 전체를 훑으므로 열 때/삭제 직전에만 사용"""
+        return self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def get(self, payload):
+        """캐시된 응답 텍스트 반환 (없으면 None)"""
+        key = make_cache_key(payload)
+        row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put(self, payload, response_text):
+        """응답 텍스트 저장 후 용량 초과 시 LRU 삭제"""
+        key = make_cache_key(payload)
+        now = time.time()
+        size = len(response_text.encode('utf-8'))
+
+        # 같은 키를 덮어쓰면 항목 수는 그대로, 바이트는 차이만큼
+        old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, response, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+            (key, response_text, size, now, now)
+        )
+        self.stats["stores"] += 1
+        if old is None:
+            self.entries += 1
+            self.total_bytes += size
+        else:
+            self.total_bytes += size - old[0]
+        self.evict()
+
+    def over_limit(self):
+        return self.entries > self.max_entries or self.total_bytes > self.max_bytes
+
+    def evict(self, batch_size=1000):
+        """max_entries / max_bytes 를 넘는 만큼 오래된 항목 삭제
+
+        평소에는 카운터 비교만 한다. 넘었을 때만 (다른 프로세스가 같은 DB 를 쓸 수 있으므로)
+        실제 값을 다시 세고, last_access 인덱스 순으로 batch_size 개씩 읽으며 삭제한다.
+        """
+        if not self.over_limit():
+            return
+
+        self.entries, self.total_bytes = self.count_stored()
+        removed = 0
+        while self.over_limit():
+            oldest = self.conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT ?", (batch_size,)
+            ).fetchall()
+            if not oldest:
+                break
+            doomed = []
+            for key, size in oldest:
+                if not self.over_limit():
+                    break
+                doomed.append((key,))
+                self.entries -= 1
+                self.total_bytes -= size
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                self.entries, self.total_bytes = self.count_stored()
+                raise
+            removed += len(doomed)
+
+        self.stats["evictions"] += removed
+
+    def report(self):
+        """적중/미적중 통계 출력 및 반환"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / lookups * 100 if lookups else 0.0
+        count, total_bytes = self.count_stored()
+
+        print("📦 검수 캐시 통계:")
+        print(f"  - 적중: {self.stats['hits']}회 / 미적중: {self.stats['misses']}회 (적중률 {hit_rate:.1f}%)")
+        print(f"  - 신규 저장: {self.stats['stores']}개, LRU 삭제: {self.stats['evictions']}개")
+        print(f"  - 저장된 응답: {count}개 ({total_bytes / 1024:.1f} KB)")
+
+        return dict(self.stats, hit_rate=hit_rate, entries=count, bytes=total_bytes)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from aiohttp import web
+
+STUB_GRADE = {"pass": True, "score": 0.85, "reason": []}
+
+
+def create_app(fail_rate=0.0, latency=0.05, grade=None):
+    """chat-completions 엔드포인트를 흉내내는 오프라인 검수 스텁 서버
+
+    fail_rate 비율만큼 429/500 응답을 섞어 재시도 로직을 확인할 수 있다.
+    """
+    grade = grade or STUB_GRADE
+    stats = {"requests": 0, "failures": 0}
+
+    async def chat_completions(request):
+        payload = await request.json()
+        stats["requests"] += 1
+
+        if latency:
+            await asyncio.sleep(latency)
+
+        if random.random() < fail_rate:
+            stats["failures"] += 1
+            status = random.choice([429, 500, 503])
+            headers = {"retry-after": "0.1"} if status == 429 else {}
+            return web.json_response(
+                {"error": {"message": "stub failure", "type": "stub_error", "code": status}},
+                status=status, headers=headers
+            )
+
+        content = json.dumps(grade, ensure_ascii=False)
+        prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+        return web.json_response({
+            "id": f"chatcmpl-stub-{stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 2,
+                "completion_tokens": len(content) // 2,
+                "total_tokens": prompt_chars // 2 + len(content) // 2
+            }
+        })
+
+    async def stats_handler(request):
+        return web.json_response(stats)
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_get("/stats", stats_handler)
+    app["stats"] = stats
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 검수 스텁 서버")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"🧪 스텁 서버 실행: http://127.0.0.1:{args.port}/v1 (실패율 {args.fail_rate})")
+    print(f"   AsyncGraderRunner(base_url='http://127.0.0.1:{args.port}/v1', api_key='stub') 로 연결하세요")
+    web.run_app(create_app(args.fail_rate, args.latency), host="127.0.0.1", port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
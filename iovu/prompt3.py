@@ -1,11 +1,15 @@
 # pandas 없이도 실행 가능한 iOVU 프롬프트 생성기
 import random
 import itertools
-import re
+import os
+import sys
 import csv
 from datetime import datetime
 from typing import Dict, List, Union
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rewrite_rules import clean_spacing
+
 class IOVUAdvancedPromptGenerator:
     """iOVU 검수 통과 최적화 프롬프트 생성기 v2 (pandas 없이)"""
     
@@ -80,16 +84,10 @@ class IOVUAdvancedPromptGenerator:
 
     def clean_prompt(self, prompt: str) -> str:
         """프롬프트에서 괄호 제거 및 자연스러운 문장으로 정리"""
-        # 1. 모든 괄호와 내용 제거
-        cleaned = re.sub(r'\([^)]*\)', '', prompt)
-        
-        # 2. 연속된 공백을 하나로 정리
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        
-        # 3. 앞뒤 공백 제거
-        cleaned = cleaned.strip()
+        # 1. 괄호와 내용 제거 + 공백 정리 + 앞뒤 공백 제거
+        cleaned = clean_spacing(prompt)
         
-        # 4. 문장 끝 정리
+        # 2. 문장 끝 정리
         if not cleaned.endswith(('?', '.', '요', '다', '까')):
             if '?' in prompt or '궁금' in cleaned or '알려' in cleaned or '어디서' in cleaned:
                 if not cleaned.endswith('요'):
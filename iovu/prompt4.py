@@ -11,6 +11,17 @@ import os
 from datetime import datetime
 from typing import Dict, List, Any
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+import secrets
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from template_space import CompiledTemplate, CompiledTemplateSet
+from prompt_ids import PromptIdGenerator
+from benchmark_suite import main as run_benchmarks
+
+# 병렬 생성 시 한 샤드(조합별 작업 단위)의 최대 프롬프트 수 - 워커 수와 무관하게 고정
+DEFAULT_SHARD_SIZE = 5000
 
 @dataclass
 class IOVUParameters:
@@ -106,15 +117,31 @@ class IOVUKeywordBank:
 class IOVUPromptGenerator:
     """iOVU 프롬프트 생성기"""
     
-    def __init__(self):
+    def __init__(self, seed=None):
         self.params = IOVUParameters()
         self.keywords = IOVUKeywordBank()
         self.generated_prompts = []
+        self.id_generator = PromptIdGenerator("iovu")
+        self.reseed(seed)
+        
+        # 템플릿은 한 번만 만들어 컴파일해 두고, 키워드 풀도 한 번만 구성
+        self.templates = self._prompt_templates()
+        self.compiled_templates = {key: CompiledTemplateSet(value) for key, value in self.templates.items()}
+        self.keyword_pools = {
+            'product': self.keywords.core_attributes,
+            'tech': self.keywords.printing_tech,
+            'slogan': self.keywords.slogans,
+            'meme': self.keywords.meme_mood,
+            'community': self.keywords.community,
+            'size': ['M', 'L', 'XL'],
+            'target': ['개발자', '20-30대', '스타트업 직원', 'IT 업계 종사자'],
+            'metric': [m for metrics in self.params.metrics.values() for m in metrics]
+        }
         
-    def _create_prompt_template(self, intent: str, difficulty: str) -> str:
-        """의도와 난이도에 따른 프롬프트 템플릿 생성"""
+    def _prompt_templates(self) -> Dict[tuple, List[str]]:
+        """의도×난이도별 프롬프트 템플릿 목록"""
         
-        templates = {
+        return {
             # 정보 의도
             ("정보", "쉬움"): [
                 "iOVU {slogan} 슬로건 의미가 뭐야?",
@@ -184,64 +211,71 @@ class IOVUPromptGenerator:
                 "{community} 파트너십 iOVU 제품 유통 채널별 수익성 시뮬레이션해줘."
             ]
         }
-        
-        template_list = templates.get((intent, difficulty), templates[("정보", "쉬움")])
-        return random.choice(template_list)
+    
+    def reseed(self, seed=None):
+        """난수 상태 재설정 (seed 가 같으면 같은 프롬프트가 나옴)"""
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+    
+    def _template_set(self, intent: str, difficulty: str) -> CompiledTemplateSet:
+        """의도×난이도의 컴파일된 템플릿 목록 (없으면 정보·쉬움)"""
+        return self.compiled_templates.get((intent, difficulty), self.compiled_templates[("정보", "쉬움")])
+    
+    def _create_prompt_template(self, intent: str, difficulty: str) -> str:
+        """의도와 난이도에 따른 프롬프트 템플릿 생성"""
+        return self._template_set(intent, difficulty).choose(self.rng).template
     
     def _fill_template(self, template: str, context: Dict[str, Any]) -> str:
-        """템플릿에 키워드를 채워넣어 완성된 프롬프트 생성"""
-        
-        # 키워드 선택
-        keywords = {
-            'product': random.choice(self.keywords.core_attributes),
-            'tech': random.choice(self.keywords.printing_tech),
-            'slogan': random.choice(self.keywords.slogans),
-            'meme': random.choice(self.keywords.meme_mood),
-            'community': random.choice(self.keywords.community),
-            'size': random.choice(['M', 'L', 'XL']),
-            'target': random.choice(['개발자', '20-30대', '스타트업 직원', 'IT 업계 종사자']),
-            'metric': random.choice([m for metrics in self.params.metrics.values() for m in metrics])
-        }
+        """템플릿에 키워드를 채워넣어 완성된 프롬프트 생성 (템플릿에 쓰인 키워드만 선택)"""
+        compiled = CompiledTemplate.compile(template)
         
-        # 템플릿 치환
         try:
-            filled_prompt = template.format(**keywords)
-            return filled_prompt
-        except KeyError as e:
+            return compiled.fill_random(self.keyword_pools, self.rng)
+        except KeyError:
             # 템플릿에 없는 키워드가 있으면 기본 프롬프트 반환
-            return f"iOVU {keywords['product']}에 대해 알려줘."
+            return f"iOVU {self.rng.choice(self.keyword_pools['product'])}에 대해 알려줘."
+    
+    def _random_context(self, intent: str, difficulty: str) -> Dict[str, Any]:
+        """프롬프트 메타데이터용 파라미터 선택"""
+        return {
+            'intent': intent,
+            'difficulty': difficulty,
+            'practice_area': self.rng.choice(self.params.practice_areas),
+            'country': self.rng.choice(self.params.countries),
+            'time_span': self.rng.choice(self.params.time_spans),
+            'source_hint': self.rng.choice(self.params.source_hints)
+        }
     
     def generate_single_prompt(self, intent: str = None, difficulty: str = None) -> Dict[str, Any]:
         """단일 프롬프트 생성"""
         
         # 랜덤 선택 (파라미터가 없는 경우)
         if not intent:
-            intent = random.choice(self.params.intents)
+            intent = self.rng.choice(self.params.intents)
         if not difficulty:
-            difficulty = random.choice(self.params.difficulties)
+            difficulty = self.rng.choice(self.params.difficulties)
             
         # 템플릿 선택 및 프롬프트 생성
         template = self._create_prompt_template(intent, difficulty)
-        context = {
-            'intent': intent,
-            'difficulty': difficulty,
-            'practice_area': random.choice(self.params.practice_areas),
-            'country': random.choice(self.params.countries),
-            'time_span': random.choice(self.params.time_spans),
-            'source_hint': random.choice(self.params.source_hints)
-        }
-        
+        context = self._random_context(intent, difficulty)
         prompt_text = self._fill_template(template, context)
         
+        return self._build_prompt_data(prompt_text, context)
+    
+    def _build_prompt_data(self, prompt_text: str, context: Dict[str, Any], with_id: bool = True) -> Dict[str, Any]:
+        """채워진 프롬프트 → 저장용 레코드 (언어 결정 포함, with_id=False 면 id/created_at 은 병합 단계에서)"""
+        intent = context['intent']
+        difficulty = context['difficulty']
+        
         # 언어 결정 (KO 80%, EN 20%)
-        language = "KO" if random.random() < 0.8 else "EN"
+        language = "KO" if self.rng.random() < 0.8 else "EN"
         
         # 영어 번역 (간단한 예시)
         if language == "EN":
             prompt_text = self._translate_to_english(prompt_text)
         
         prompt_data = {
-            'id': f"iovu_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{random.randint(1000,9999)}",
+            'id': self.id_generator.next_id() if with_id else None,
             'prompt': prompt_text,
             'intent': intent,
             'difficulty': difficulty,
@@ -251,7 +285,7 @@ class IOVUPromptGenerator:
             'country': context['country'],
             'time_span': context['time_span'],
             'source_hint': context['source_hint'],
-            'created_at': datetime.now().isoformat()
+            'created_at': datetime.now().isoformat() if with_id else None
         }
         
         return prompt_data
@@ -281,29 +315,89 @@ class IOVUPromptGenerator:
             
         return korean_text
     
-    def generate_batch_prompts(self, count: int = 100) -> List[Dict[str, Any]]:
-        """배치 프롬프트 생성"""
-        
-        prompts = []
-        
-        # 의도별, 난이도별 분포 (3x3 = 9개 조합)
+    def _combination_counts(self, count: int) -> List[tuple]:
+        """의도×난이도 9개 조합에 count 를 고르게 분배 → [(의도, 난이도, 개수)]"""
         combinations = [
             (intent, difficulty) 
             for intent in self.params.intents 
             for difficulty in self.params.difficulties
         ]
         
-        # 각 조합별로 고르게 분배
         prompts_per_combo = count // len(combinations)
         remaining = count % len(combinations)
         
-        for i, (intent, difficulty) in enumerate(combinations):
-            # 기본 개수 + 나머지 분배
-            combo_count = prompts_per_combo + (1 if i < remaining else 0)
-            
-            for _ in range(combo_count):
-                prompt_data = self.generate_single_prompt(intent, difficulty)
-                prompts.append(prompt_data)
+        # 기본 개수 + 나머지 분배
+        return [
+            (intent, difficulty, prompts_per_combo + (1 if i < remaining else 0))
+            for i, (intent, difficulty) in enumerate(combinations)
+        ]
+    
+    def _generate_combination(self, intent: str, difficulty: str, count: int, with_id: bool = True) -> List[Dict[str, Any]]:
+        """한 조합의 프롬프트 count 개"""
+        # 템플릿 선택과 키워드 인덱스는 NumPy 로 한꺼번에 뽑아 채움
+        texts = self._template_set(intent, difficulty).fill_batch(self.keyword_pools, count, self.np_rng)
+        return [self._build_prompt_data(prompt_text, self._random_context(intent, difficulty), with_id)
+                for prompt_text in texts]
+    
+    def generate_batch_prompts(self, count: int = 100) -> List[Dict[str, Any]]:
+        """배치 프롬프트 생성"""
+        
+        prompts = []
+        
+        # 의도별, 난이도별 분포 (3x3 = 9개 조합)
+        for intent, difficulty, combo_count in self._combination_counts(count):
+            prompts.extend(self._generate_combination(intent, difficulty, combo_count))
+        
+        self.generated_prompts.extend(prompts)
+        return prompts
+    
+    def plan_shards(self, count: int, seed, shard_size: int = DEFAULT_SHARD_SIZE) -> List[tuple]:
+        """병렬 생성 작업 목록 [(의도, 난이도, 개수, 샤드 시드)]
+        
+        조합별 개수를 shard_size 단위로 나누고, 샤드마다 (마스터 시드, 조합 번호, 샤드 번호)
+        에서 파생한 시드를 준다. 워커 수와 상관없이 같은 샤드 목록이 나오므로
+        같은 마스터 시드면 결과도 같다.
+        """
+        shards = []
+        for combo_index, (intent, difficulty, combo_count) in enumerate(self._combination_counts(count)):
+            for shard_index, start in enumerate(range(0, combo_count, shard_size)):
+                sequence = np.random.SeedSequence(entropy=seed, spawn_key=(combo_index, shard_index))
+                shard_seed = int(sequence.generate_state(2, dtype=np.uint64)[0])
+                shards.append((intent, difficulty, min(shard_size, combo_count - start), shard_seed))
+        return shards
+    
+    def generate_batch_prompts_parallel(self, count: int = 100, workers: int = None, seed=None,
+                                        shard_size: int = DEFAULT_SHARD_SIZE, executor=None,
+                                        id_offset: int = 0) -> List[Dict[str, Any]]:
+        """프로세스 풀로 샤드를 나눠 생성한 뒤 순서대로 합침
+        
+        seed 는 마스터 시드 (정수 또는 정수 튜플, 없으면 무작위로 정해 self.last_seed 에 기록).
+        id 는 합칠 때 (시드, 전체 순번) 으로 다시 매겨 실행 내에서 겹치지 않으며,
+        created_at 을 제외한 결과는 같은 시드면 워커 수와 상관없이 같다.
+        executor 를 넘기면 여러 배치에서 같은 프로세스 풀을 재사용한다.
+        """
+        seed = secrets.randbits(64) if seed is None else seed
+        self.last_seed = seed
+        shards = self.plan_shards(count, seed, shard_size)
+        workers = workers or os.cpu_count() or 1
+        
+        if executor is not None:
+            shard_results = list(executor.map(_generate_shard, shards))
+        elif workers > 1 and len(shards) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                shard_results = list(pool.map(_generate_shard, shards))
+        else:
+            shard_results = [_generate_shard(shard) for shard in shards]
+        
+        # 병합: 샤드 순서대로 이어 붙이고 id / created_at 을 한 번에 매김
+        seed_tag = '-'.join(str(part) for part in seed) if isinstance(seed, (tuple, list)) else str(seed)
+        created_at = datetime.now().isoformat()
+        prompts = []
+        for records in shard_results:
+            for record in records:
+                record['id'] = f"iovu_{seed_tag}_{id_offset + len(prompts):08d}"
+                record['created_at'] = created_at
+                prompts.append(record)
         
         self.generated_prompts.extend(prompts)
         return prompts
@@ -361,6 +455,19 @@ class IOVUPromptGenerator:
         
         return stats
 
+_shard_generator = None
+
+
+def _generate_shard(shard: tuple) -> List[Dict[str, Any]]:
+    """워커 프로세스에서 샤드 하나 생성 (생성기는 프로세스당 한 번만 만들고 시드만 바꿈)"""
+    global _shard_generator
+    intent, difficulty, count, shard_seed = shard
+    if _shard_generator is None:
+        _shard_generator = IOVUPromptGenerator()
+    _shard_generator.reseed(shard_seed)
+    return _shard_generator._generate_combination(intent, difficulty, count, with_id=False)
+
+
 def batch_production_mode():
     """대량생산 모드"""
     
@@ -376,11 +483,16 @@ def batch_production_mode():
         total_count = int(input("총 생성할 프롬프트 개수 (기본 1000): ") or "1000")
         batch_size = int(input("배치당 개수 (기본 100): ") or "100")
         file_prefix = input("파일명 접두사 (기본 iovu_batch): ").strip() or "iovu_batch"
+        workers = int(input(f"워커 프로세스 수 (기본 {os.cpu_count() or 1}): ") or str(os.cpu_count() or 1))
+        seed_text = input("마스터 시드 (Enter=무작위): ").strip()
+        master_seed = int(seed_text) if seed_text else secrets.randbits(64)
     except ValueError:
         print("잘못된 입력입니다. 기본값을 사용합니다.")
         total_count = 1000
         batch_size = 100
         file_prefix = "iovu_batch"
+        workers = os.cpu_count() or 1
+        master_seed = secrets.randbits(64)
     
     # 2. 배치 개수 계산
     num_batches = (total_count + batch_size - 1) // batch_size
@@ -390,6 +502,8 @@ def batch_production_mode():
     print(f"   배치 크기: {batch_size}개")
     print(f"   배치 수: {num_batches}개")
     print(f"   파일 접두사: {file_prefix}")
+    print(f"   워커 프로세스: {workers}개")
+    print(f"   마스터 시드: {master_seed} (같은 시드면 워커 수와 상관없이 같은 결과)")
     
     # 확인
     confirm = input(f"\n계속 진행하시겠습니까? (y/n): ").lower()
@@ -402,6 +516,8 @@ def batch_production_mode():
     overall_start = datetime.now()
     all_generated_prompts = []
     generated_files = []
+    # 프로세스 풀은 배치마다 만들지 않고 전체 생산 동안 재사용
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
     
     for batch_num in range(num_batches):
         print(f"\n--- 배치 {batch_num + 1}/{num_batches} ---")
@@ -411,7 +527,11 @@ def batch_production_mode():
         
         # 배치 생성
         batch_start = datetime.now()
-        batch_prompts = generator.generate_batch_prompts(current_batch_size)
+        # 배치마다 (마스터 시드, 배치 번호) 로 시드를 달리하고 id 는 전체 순번으로 이어 매김
+        batch_prompts = generator.generate_batch_prompts_parallel(
+            current_batch_size, workers=workers, seed=(master_seed, batch_num),
+            executor=executor, id_offset=len(all_generated_prompts)
+        )
         batch_end = datetime.now()
         batch_time = (batch_end - batch_start).total_seconds()
         
@@ -433,6 +553,9 @@ def batch_production_mode():
         print(f"   ⏱️ 배치 시간: {batch_time:.2f}초 ({speed:.1f}개/초)")
         print(f"   📊 전체 진행률: {progress:.1f}% ({len(all_generated_prompts):,}/{total_count:,})")
     
+    if executor is not None:
+        executor.shutdown()
+    
     overall_end = datetime.now()
     total_time = (overall_end - overall_start).total_seconds()
     
@@ -464,34 +587,12 @@ def batch_production_mode():
     return all_generated_prompts, generated_files
 
 def speed_test_mode():
-    """속도 테스트 모드"""
+    """속도 테스트 모드 (benchmark_suite 로 측정 - 워밍업, 반복, 실행마다 새 생성기)"""
     
     print("⚡ === iOVU 프롬프트 생성 속도 테스트 ===")
+    print("전체 생성기 비교/회귀 확인은 python benchmark_suite.py --baseline <이전 결과> 를 사용하세요.")
     
-    generator = IOVUPromptGenerator()
-    test_sizes = [10, 50, 100, 500, 1000]
-    
-    print(f"\n🔬 다양한 크기별 속도 테스트:")
-    
-    for size in test_sizes:
-        print(f"\n📊 {size}개 프롬프트 생성 테스트:")
-        
-        # 3회 반복 테스트
-        times = []
-        for attempt in range(3):
-            start_time = datetime.now()
-            prompts = generator.generate_batch_prompts(size)
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            times.append(duration)
-            
-            speed = size / duration if duration > 0 else 0
-            print(f"   시도 {attempt+1}: {duration:.3f}초 ({speed:.1f}개/초)")
-        
-        # 평균 계산
-        avg_time = sum(times) / len(times)
-        avg_speed = size / avg_time if avg_time > 0 else 0
-        print(f"   📈 평균: {avg_time:.3f}초 ({avg_speed:.1f}개/초)")
+    run_benchmarks(["iovu.prompt4", "--output", "iovu_speed_test.json"])
     
     print(f"\n✅ 속도 테스트 완료!")
 
@@ -510,20 +611,25 @@ def continuous_production_mode():
         batch_size = int(input("배치당 생성 개수 (기본 50): ") or "50")
         interval = int(input("생성 간격(초) (기본 10): ") or "10")
         max_batches = int(input("최대 배치 수 (0=무제한, 기본 10): ") or "10")
+        workers = int(input("워커 프로세스 수 (기본 1): ") or "1")
     except ValueError:
         batch_size = 50
         interval = 10
         max_batches = 10
+        workers = 1
+    master_seed = secrets.randbits(64)
     
     print(f"\n🔄 연속 생산 설정:")
     print(f"   배치 크기: {batch_size}개")
     print(f"   생성 간격: {interval}초")
     print(f"   최대 배치: {max_batches}개 ({'무제한' if max_batches == 0 else str(max_batches)})")
+    print(f"   워커 프로세스: {workers}개 (마스터 시드 {master_seed})")
     
     # 연속 생산 실행
     batch_count = 0
     total_generated = 0
     all_files = []
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
     
     try:
         import time
@@ -537,7 +643,10 @@ def continuous_production_mode():
             start_time = datetime.now()
             
             # 프롬프트 생성
-            prompts = generator.generate_batch_prompts(batch_size)
+            prompts = generator.generate_batch_prompts_parallel(
+                batch_size, workers=workers, seed=(master_seed, batch_count),
+                executor=executor, id_offset=total_generated
+            )
             
             # 파일 저장
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -561,6 +670,9 @@ def continuous_production_mode():
     
     except KeyboardInterrupt:
         print(f"\n\n👋 사용자에 의해 중단되었습니다.")
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     # 최종 요약
     print(f"\n🎉 === 연속 생산 완료 ===")
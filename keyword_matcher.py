@@ -0,0 +1,100 @@
+from collections import deque
+
+
+class KeywordAutomaton:
+    """여러 키워드를 질의 한 번 훑기로 모두 찾는 Aho-Corasick 오토마톤
+
+    키워드마다 `keyword in query` 를 반복하는 대신, 전체 키워드로 상태 기계를
+    한 번만 만들어 두고 질의를 한 글자씩 지나가며 겹치는 키워드까지 모두 찾는다.
+    키워드에는 (그룹, 분류, 가중치) 같은 payload 를 여러 개 붙일 수 있다.
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.terminals = [None]
+        self.outputs = [()]
+        self.delta = [{}]
+        self.payloads = {}
+        self.built = False
+
+    def add(self, keyword, payload=None):
+        """키워드와 payload 등록 (같은 키워드를 여러 번 등록하면 payload 가 누적됨)"""
+        if not keyword:
+            return
+
+        state = 0
+        for ch in keyword:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.terminals.append(None)
+                self.outputs.append(())
+            state = next_state
+
+        self.terminals[state] = keyword
+        self.payloads.setdefault(keyword, []).append(payload)
+        self.built = False
+
+    def build(self):
+        """실패 링크 계산 후 결정적 전이표(DFA)로 펼침 (BFS)"""
+        queue = deque()
+        order = []
+        for state in self.goto[0].values():
+            self.fail[state] = 0
+            self.outputs[state] = (self.terminals[state],) if self.terminals[state] else ()
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                fail_state = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = fail_state
+
+                # 이 상태에서 끝나는 키워드 + 실패 링크(접미사)에서 끝나는 키워드
+                own = (self.terminals[next_state],) if self.terminals[next_state] else ()
+                self.outputs[next_state] = own + self.outputs[fail_state]
+
+        # 상태마다 '실패 링크를 따라간 뒤의 전이'까지 미리 합쳐 두면 탐색 시 글자당 조회 1번
+        self.delta = [None] * len(self.goto)
+        self.delta[0] = dict(self.goto[0])
+        for state in order:
+            transitions = dict(self.delta[self.fail[state]])
+            transitions.update(self.goto[state])
+            self.delta[state] = transitions
+
+        self.built = True
+        return self
+
+    def find(self, text):
+        """텍스트에 등장하는 키워드 집합 (여러 번 나와도 한 번만)"""
+        if not self.built:
+            self.build()
+
+        delta = self.delta
+        outputs = self.outputs
+        found = set()
+        state = 0
+
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+
+        return found
+
+    def match(self, text):
+        """텍스트에 등장하는 키워드들의 payload 목록"""
+        return [payload for keyword in self.find(text) for payload in self.payloads[keyword]]
+
+    def __len__(self):
+        return len(self.payloads)
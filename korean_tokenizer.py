@@ -0,0 +1,166 @@
+import re
+from functools import lru_cache
+
+# 조사 / 어미 - 긴 것부터 떼어낸다 (순수 파이썬 대체 토크나이저용)
+PARTICLES = sorted([
+    "에서는", "에서의", "으로는", "으로의", "에게는", "이라도", "이라고", "까지는", "부터는",
+    "에서", "에게", "한테", "께서", "으로", "로서", "로써", "까지", "부터", "처럼", "보다", "마다",
+    "조차", "밖에", "이나", "이랑", "이란", "에는", "와의", "과의", "라도", "라고", "하고",
+    "은", "는", "이", "가", "을", "를", "의", "에", "와", "과", "도", "만", "로", "께", "랑", "란", "나",
+], key=len, reverse=True)
+
+ENDINGS = sorted([
+    "해주실", "해주세요", "알려주세요", "주시겠어요", "주실래요", "할까요", "일까요", "인가요", "한가요",
+    "습니까", "습니다", "합니다", "입니다", "됩니다", "있나요", "없나요", "되나요", "하나요", "할지",
+    "하려면", "하는지", "되는지", "인지", "나요", "가요", "어요", "아요", "해요", "에요", "예요", "세요",
+    "는지", "은지", "을지", "려면", "으면", "는데", "은데", "지만", "해서", "하면", "하고", "하는",
+    "했던", "하던", "되는", "된", "한", "할", "하기", "되기",
+], key=len, reverse=True)
+
+# 붙여 쓴 복합어 뒤쪽에 자주 오는 명사 (이혼관련 → 이혼 + 관련)
+COMPOUND_TAILS = sorted([
+    "관련", "전문", "상담", "비용", "절차", "방법", "문제", "소송", "변호사", "사건", "법무", "분쟁",
+], key=len, reverse=True)
+
+# 혼자서는 의미가 약한 한 글자 의존명사
+BOUND_NOUNS = frozenset(["것", "수", "등", "년", "월", "일", "개", "명", "번", "때", "중", "분", "점", "곳", "데"])
+
+TOKEN_RE = re.compile(r'[가-힣]+|[A-Za-z][A-Za-z0-9]*|\d+(?:\.\d+)?')
+
+# 형태소 분석기 품사 중 토큰으로 남길 것 (체언, 용언 어간, 어근, 외국어/한자/숫자)
+KEEP_TAGS = ("NNG", "NNP", "NR", "VV", "VA", "XR", "SL", "SH", "SN")
+
+DEFAULT_BACKEND = "auto"
+
+
+def suffix_table(suffixes):
+    """접미사 목록 → [(길이, 집합)] (긴 것부터) - 어절마다 길이별 집합 조회 몇 번으로 끝냄"""
+    lengths = sorted({len(suffix) for suffix in suffixes}, reverse=True)
+    return [(length, frozenset(suffix for suffix in suffixes if len(suffix) == length)) for length in lengths]
+
+
+def strip_suffix(word, table):
+    """가장 긴 접미사 하나를 떼어냄 (한 글자 접미사는 두 글자 이상 남을 때만)"""
+    for length, suffixes in table:
+        if len(word) - length >= (1 if length > 1 else 2) and word[-length:] in suffixes:
+            return word[:-length]
+    return word
+
+
+ENDING_TABLE = suffix_table(ENDINGS)
+PARTICLE_TABLE = suffix_table(PARTICLES)
+TAIL_TABLE = suffix_table(COMPOUND_TAILS)
+
+
+def simple_tokenize(text):
+    """순수 파이썬 대체 토크나이저 - 어절에서 조사/어미를 떼고 붙여 쓴 복합어를 나눔"""
+    tokens = []
+    for word in TOKEN_RE.findall(text):
+        if not ('가' <= word[0] <= '힣'):
+            tokens.append(word)
+            continue
+
+        # 어미 → 조사 순서로 떼어냄
+        stem = strip_suffix(word, ENDING_TABLE)
+        stem = strip_suffix(stem, PARTICLE_TABLE)
+        if len(stem) >= 3 and stem.endswith("들"):
+            stem = stem[:-1]
+
+        # 앞에 두 글자 이상 남는 가장 긴 복합어 꼬리
+        tail = None
+        for length, tails in TAIL_TABLE:
+            if len(stem) - length >= 2 and stem[-length:] in tails:
+                stem, tail = stem[:-length], stem[-length:]
+                break
+
+        for token in (stem, tail):
+            if token and token not in BOUND_NOUNS:
+                tokens.append(token)
+
+    return tokens
+
+
+def kiwi_backend():
+    """kiwipiepy 형태소 분석기 (설치되어 있을 때)"""
+    from kiwipiepy import Kiwi
+    kiwi = Kiwi()
+
+    def tokenize_kiwi(text):
+        return [token.form for token in kiwi.tokenize(text) if token.tag.startswith(KEEP_TAGS)]
+
+    return tokenize_kiwi
+
+
+def mecab_backend():
+    """python-mecab-ko 형태소 분석기 (설치되어 있을 때)"""
+    import mecab
+    tagger = mecab.MeCab()
+
+    def tokenize_mecab(text):
+        return [form for form, tag in tagger.pos(text) if tag.startswith(KEEP_TAGS)]
+
+    return tokenize_mecab
+
+
+# 등록 순서가 auto 선택 우선순위
+BACKENDS = {
+    "kiwi": kiwi_backend,
+    "mecab": mecab_backend,
+    "simple": lambda: simple_tokenize,
+}
+
+_backend = {"name": None, "tokenize": None}
+
+
+def register_backend(name, factory):
+    """토크나이저 백엔드 등록 (factory() → text 를 받아 토큰 리스트를 돌려주는 함수)"""
+    BACKENDS[name] = factory
+
+
+def set_backend(name=DEFAULT_BACKEND):
+    """사용할 백엔드 선택 ('auto' 는 설치된 형태소 분석기 → 순수 파이썬 순)"""
+    candidates = list(BACKENDS) if name == "auto" else [name]
+    for candidate in candidates:
+        if candidate not in BACKENDS:
+            raise ValueError(f"알 수 없는 토크나이저 백엔드: {candidate} (사용 가능: {', '.join(BACKENDS)})")
+        try:
+            function = BACKENDS[candidate]()
+        except ImportError:
+            if name != "auto":
+                raise
+            continue
+
+        _backend["name"] = candidate
+        _backend["tokenize"] = function
+        # 백엔드가 바뀌면 이전 결과는 버림
+        tokenize.cache_clear()
+        token_set.cache_clear()
+        return candidate
+
+    raise RuntimeError("사용할 수 있는 토크나이저 백엔드가 없습니다")
+
+
+def backend_name():
+    """현재 백엔드 이름 (아직 고르지 않았으면 auto 로 선택)"""
+    if _backend["tokenize"] is None:
+        set_backend()
+    return _backend["name"]
+
+
+@lru_cache(maxsize=200000)
+def tokenize(text):
+    """명사/어간 토큰 튜플 (같은 문장은 프로세스당 한 번만 분석)"""
+    if _backend["tokenize"] is None:
+        set_backend()
+    return tuple(_backend["tokenize"](text or ""))
+
+
+@lru_cache(maxsize=200000)
+def token_set(text):
+    """유사도/중복 판정용 토큰 집합"""
+    return frozenset(tokenize(text))
+
+
+def cache_info():
+    """tokenize 캐시 적중 통계"""
+    return tokenize.cache_info()
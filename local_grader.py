@@ -0,0 +1,458 @@
+import argparse
+import csv
+import fnmatch
+import glob
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from korean_tokenizer import token_set, tokenize
+
+# D-FINAL v2 검수 기준 키워드 (GRADER_SYSTEM_PROMPT ⑥ Brand Realism 기준)
+SERVICE_KEYWORDS = [
+    "기업법무", "계약법무", "소송", "분쟁해결", "지적재산권", "금융법무",
+    "부동산법무", "노동법무", "조세법무", "형사법무", "개인정보",
+    "IT통신", "IT·통신", "통신", "환경", "의료", "헬스케어", "건설", "인프라"
+]
+
+REGION_KEYWORDS = [
+    "부산", "경남", "부산지방법원", "해운대", "거제동", "법조단지",
+    "경상남도", "영남권", "동남권", "서면", "센텀시티", "남포동", "동래구",
+    "연제구", "수영구", "기장군", "양산", "창원", "김해", "울산"
+]
+
+USP_KEYWORDS = [
+    "30년 업력", "29년 업력", "원스톱", "합리적 수임료", "Busan Legal First-Mover",
+    "법률 파트너", "부산 대표 로펌", "영남권 최고", "전문가 그룹", "지역밀착",
+    "검증된", "신뢰할 수 있는", "전문 노하우"
+]
+
+LAW_KEYWORDS = [
+    "민법", "상법", "형법", "행정법", "노동법", "노동관계법", "근로기준법", "조세법",
+    "국세기본법", "부동산등기법", "주택임대차보호법", "상가건물 임대차보호법", "특허법",
+    "상표법", "저작권법", "개인정보보호법", "정보통신망법", "공정거래법", "자본시장법",
+    "민사소송법", "형사소송법", "국가법령정보센터", "법제처", "대법원 판례", "헌법재판소",
+    "판례", "조문", "법령", "시행령", "시행규칙", "law.go.kr"
+]
+
+CONTEXT_KEYWORDS = [
+    "배경 자세히", "최근 성과", "구체적인 사례", "상세한 절차", "단계별 설명",
+    "실무 경험", "전문가 의견", "심층 분석", "사례", "자세히", "상세", "배경", "최근"
+]
+
+LINK_KEYWORDS = [
+    "링크", "URL", "웹사이트", "홈페이지", "다운로드", "온라인",
+    "접속", "바로가기", "사이트", "페이지", "http", "www."
+]
+
+TRANSLATESE_PATTERNS = [
+    "에 대한", "에 대하여", "에 관하여", "에 관한", "에 있어서", "을 통한", "를 통한",
+    "하였습니다", "되었습니다", "되어지", "것입니다", "하는 것이"
+]
+
+EXPLORE_MARKERS = ["링크", "URL", "홈페이지", "사이트", "페이지", "다운로드", "바로가기", "접속", "어디서", "찾아"]
+DEAL_MARKERS = ["견적", "의뢰", "신청", "계약 조건", "문의드려요", "상담받고 싶습니다", "제안", "협의", "착수금", "성공보수"]
+
+INTENT_ALIASES = {"정보조회": "정보", "탐색비교": "탐색", "거래상담": "거래"}
+DIFFICULTY_LEVELS = {"쉬움": 0, "보통": 1, "어려움": 2}
+
+PASS_THRESHOLD = 0.70
+
+# 저장소에 커밋해 둔 기준 보정 리포트 - 재현: python local_grader.py --output local_grader_calibration.json
+# (인자 없이 실행하면 *검수결과*.csv 전체, 실행마다 만드는 local_grader_calibration_<시각>.json 은 커밋하지 않음)
+CALIBRATION_REPORT = "local_grader_calibration.json"
+
+# score 의 reason 순서 (score_batch 는 비트 마스크로 모았다가 같은 순서로 풀어 씀)
+REASON_ORDER = [
+    "LABEL_MISMATCH", "LEN_RANGE_FAIL", "LOW_INFO_DENS", "TRANSLATESE",
+    "LAW_WEAK", "SERVICE_NONE", "REGION_NONE", "USP_NONE", "NO_LINK"
+]
+
+# 점수 산식 (GRADER_SYSTEM_PROMPT 4. 점수 산식)
+WEIGHTS = {
+    "label": 0.25,
+    "info_dense": 0.15,
+    "length": 0.10,
+    "brand": 0.45,
+    "context": 0.05,
+    "link": 0.05
+}
+LABEL_MISMATCH_PENALTY = 0.09
+TRANSLATESE_PENALTY = 0.05
+
+
+def compile_keywords(keywords):
+    """키워드 목록을 하나의 정규식으로 컴파일 (부분 문자열 포함 여부 판정용)"""
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile('|'.join(re.escape(keyword) for keyword in ordered))
+
+
+def normalize_label(value, aliases=None):
+    """라벨 값 정리 (정보조회 → 정보 등)"""
+    value = str(value or '').strip()
+    return (aliases or {}).get(value, value)
+
+
+def factorize_labels(values, aliases=None):
+    """라벨 컬럼 → (행별 코드, 정리된 고유 라벨) - 결측(코드 -1)은 마지막의 빈 문자열을 가리킴"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    return codes, [normalize_label(value, aliases) for value in uniques] + ['']
+
+
+def label_flags(codes, labels, predicate):
+    """고유 라벨마다 한 번 판정해서 행별 불리언 배열로 펼침"""
+    return np.array([predicate(label) for label in labels], dtype=bool)[codes]
+
+
+class LocalGraderScorer:
+    """D-FINAL v2 검수 기준의 로컬 결정적 재현 (API 호출 전 사전 선별용)
+
+    각 단계(라벨 일치, 어절 수, 정보 밀도, 번역투, 중복, BrandReal 4종 Hit,
+    맥락, 링크)를 규칙으로 판정하고 검수 API 와 같은 reason 코드를 만든다.
+    정책 위반(POLICY_VIOL)은 규칙으로 판정할 수 없으므로 API 검수에 맡긴다.
+    """
+
+    def __init__(self, seen_hashes=None):
+        self.seen_hashes = set(seen_hashes or ())
+        self.service_re = compile_keywords(SERVICE_KEYWORDS)
+        self.region_re = compile_keywords(REGION_KEYWORDS)
+        self.usp_re = compile_keywords(USP_KEYWORDS)
+        self.law_re = re.compile(compile_keywords(LAW_KEYWORDS).pattern + r'|제\s?\d+조|\d{2,4}[다도두누허]\d+')
+        self.context_re = compile_keywords(CONTEXT_KEYWORDS)
+        self.link_re = compile_keywords(LINK_KEYWORDS)
+        self.translatese_re = compile_keywords(TRANSLATESE_PATTERNS)
+        self.explore_re = compile_keywords(EXPLORE_MARKERS)
+        self.deal_re = compile_keywords(DEAL_MARKERS)
+        self.hangul_re = re.compile('[가-힣]')
+
+    def get_prompt_hash(self, prompt):
+        """생성기와 동일한 정규화 해시 (중복 판정용)"""
+        cleaned = ''.join(prompt.split()).replace('?', '').replace('!', '').replace('.', '')
+        return hashlib.md5(cleaned.encode()).hexdigest()
+
+    def infer_intent(self, question):
+        """표지어로 의도 추정 (신호가 없거나 엇갈리면 None)"""
+        explore = self.explore_re.search(question) is not None
+        deal = self.deal_re.search(question) is not None
+        if explore and not deal:
+            return "탐색"
+        if deal and not explore:
+            return "거래"
+        return None
+
+    def count_label_mismatches(self, question, words, intent, difficulty, domain, lang):
+        """라벨 불일치 개수 (확실한 신호가 있을 때만 불일치로 판단)"""
+        mismatches = 0
+
+        inferred_intent = self.infer_intent(question)
+        if inferred_intent is not None and normalize_label(intent, INTENT_ALIASES) != inferred_intent:
+            mismatches += 1
+
+        # 난이도는 두 단계 이상 벗어난 경우만 불일치 (쉬움 ↔ 어려움)
+        level = DIFFICULTY_LEVELS.get(normalize_label(difficulty))
+        if level is not None:
+            if words <= 7 and level == 2:
+                mismatches += 1
+            elif words >= 14 and level == 0:
+                mismatches += 1
+
+        if normalize_label(domain) != "동래":
+            mismatches += 1
+
+        expected_lang = "KO" if self.hangul_re.search(question) else "EN"
+        if normalize_label(lang).upper() != expected_lang:
+            mismatches += 1
+
+        return mismatches
+
+    def score(self, question, intent, difficulty, domain="동래", lang="KO", check_duplicate=True):
+        """단일 질문 평가 → {"pass", "score", "reason"} (검수 API 와 같은 형식)"""
+        question = str(question or '').strip()
+        reasons = []
+
+        if check_duplicate:
+            prompt_hash = self.get_prompt_hash(question)
+            if prompt_hash in self.seen_hashes:
+                return {"pass": False, "score": 0.0, "reason": ["DUPLICATE"]}
+            self.seen_hashes.add(prompt_hash)
+
+        tokens = question.split()
+        word_count = len(tokens)
+
+        # ① Label Match
+        mismatches = self.count_label_mismatches(question, word_count, intent, difficulty, domain, lang)
+        if mismatches:
+            reasons.append("LABEL_MISMATCH")
+        score = max(0.0, WEIGHTS["label"] - LABEL_MISMATCH_PENALTY * mismatches)
+
+        # ② Length Range
+        if 5 <= word_count <= 30:
+            score += WEIGHTS["length"]
+        else:
+            reasons.append("LEN_RANGE_FAIL")
+
+        # ③ Info Density + 번역투 (조사만 다른 어절은 같은 정보로 보고 명사/어간 토큰으로 셈)
+        if len(set(tokenize(question))) >= 8:
+            score += WEIGHTS["info_dense"]
+        else:
+            reasons.append("LOW_INFO_DENS")
+        if self.translatese_re.search(question):
+            reasons.append("TRANSLATESE")
+            score -= TRANSLATESE_PENALTY
+
+        # ⑥ Brand Realism
+        hits = 0
+        if self.law_re.search(question):
+            hits += 1
+        else:
+            reasons.append("LAW_WEAK")
+        if self.service_re.search(question):
+            hits += 1
+        else:
+            reasons.append("SERVICE_NONE")
+        if self.region_re.search(question):
+            hits += 1
+        else:
+            reasons.append("REGION_NONE")
+        if self.usp_re.search(question):
+            hits += 1
+        else:
+            reasons.append("USP_NONE")
+        score += min(1, hits) * WEIGHTS["brand"]
+
+        # ⑦ Context Sens
+        if self.context_re.search(question):
+            score += WEIGHTS["context"]
+
+        # ⑧ Link Presence
+        if self.link_re.search(question):
+            score += WEIGHTS["link"]
+        else:
+            reasons.append("NO_LINK")
+
+        score = round(min(1.0, max(0.0, score)), 3)
+        return {"pass": score >= PASS_THRESHOLD, "score": score, "reason": reasons}
+
+    def score_batch(self, questions, intents, difficulties, domains=None, langs=None):
+        """여러 질문을 한 번에 평가해 컬럼형 결과 반환 (pandas Series/리스트 모두 가능)
+
+        score() 를 행마다 부르지 않고 규칙 판정을 컬럼 단위로 한다. 키워드/번역투/라벨 신호는
+        pyarrow 정규식 커널(RE2)로 한 번에 훑고, 점수와 reason 은 NumPy 배열로 합친다.
+        정보 밀도만 토크나이저가 필요하므로 고유 질문마다 한 번씩 센다.
+        결과는 같은 순서로 score() 를 부른 것과 같다 (중복 판정 포함).
+        """
+        questions = pd.Series(list(questions), dtype=object).fillna('').astype(str)
+        total = len(questions)
+        if not total:
+            return {"eval_pass": [], "eval_score": [], "eval_reason": []}
+
+        # Arrow 의 공백 기준은 str.split()/strip() 과 같음 (유니코드 공백 전체)
+        text = pc.utf8_trim_whitespace(pa.array(questions.to_numpy(), type=pa.string()))
+        words = pc.utf8_split_whitespace(text)
+        word_count = pc.list_value_length(words).to_numpy()
+
+        def has(regex):
+            return pc.match_substring_regex(text, pattern=regex.pattern).to_numpy(zero_copy_only=False)
+
+        # ④ Duplicate - 앞에서 이미 나온 해시(이번 배치 포함)는 0점 (해시는 고유 문자열마다 한 번)
+        cleaned = pc.replace_substring_regex(pc.binary_join(words, ''), pattern='[?!.]', replacement='')
+        codes, uniques = pd.factorize(pd.Series(cleaned.to_numpy(zero_copy_only=False), dtype=object))
+        hashes = [hashlib.md5(value.encode()).hexdigest() for value in uniques]
+        seen = np.array([prompt_hash in self.seen_hashes for prompt_hash in hashes], dtype=bool)
+        duplicate = pd.Series(codes).duplicated().to_numpy() | seen[codes]
+        self.seen_hashes.update(hashes)
+
+        # ① Label Match (라벨 판정은 고유 라벨마다 한 번)
+        explore, deal = has(self.explore_re), has(self.deal_re)
+        codes, labels = factorize_labels(intents, INTENT_ALIASES)
+        mismatches = ((explore & ~deal & ~label_flags(codes, labels, lambda label: label == "탐색")) |
+                      (deal & ~explore & ~label_flags(codes, labels, lambda label: label == "거래"))).astype(np.int64)
+
+        codes, labels = factorize_labels(difficulties)
+        hard = label_flags(codes, labels, lambda label: DIFFICULTY_LEVELS.get(label) == 2)
+        easy = label_flags(codes, labels, lambda label: DIFFICULTY_LEVELS.get(label) == 0)
+        mismatches += ((word_count <= 7) & hard) | ((word_count >= 14) & easy)
+
+        if domains is not None:
+            codes, labels = factorize_labels(domains)
+            mismatches += label_flags(codes, labels, lambda label: label != "동래")
+
+        hangul = has(self.hangul_re)
+        if langs is not None:
+            codes, labels = factorize_labels(langs)
+            is_korean = label_flags(codes, labels, lambda label: label.upper() == "KO")
+            is_english = label_flags(codes, labels, lambda label: label.upper() == "EN")
+            mismatches += np.where(hangul, ~is_korean, ~is_english)
+        else:
+            mismatches += ~hangul
+
+        score = np.maximum(0.0, WEIGHTS["label"] - LABEL_MISMATCH_PENALTY * mismatches)
+
+        # ② Length Range
+        length_ok = (word_count >= 5) & (word_count <= 30)
+        score += np.where(length_ok, WEIGHTS["length"], 0.0)
+
+        # ③ Info Density + 번역투 (토큰 수는 고유 질문마다 한 번)
+        codes, uniques = pd.factorize(pd.Series(text.to_numpy(zero_copy_only=False), dtype=object))
+        dense = np.fromiter((len(token_set(question)) >= 8 for question in uniques), dtype=bool, count=len(uniques))[codes]
+        score += np.where(dense, WEIGHTS["info_dense"], 0.0)
+        translatese = has(self.translatese_re)
+        score -= np.where(translatese, TRANSLATESE_PENALTY, 0.0)
+
+        # ⑥ Brand Realism
+        law, service, region, usp = has(self.law_re), has(self.service_re), has(self.region_re), has(self.usp_re)
+        score += np.where(law | service | region | usp, WEIGHTS["brand"], 0.0)
+
+        # ⑦ Context Sens / ⑧ Link Presence
+        score += np.where(has(self.context_re), WEIGHTS["context"], 0.0)
+        link = has(self.link_re)
+        score += np.where(link, WEIGHTS["link"], 0.0)
+
+        # 점수 조합 수는 적으므로 고유값만 파이썬 round (score() 와 같은 반올림)
+        score = np.minimum(1.0, np.maximum(0.0, score))
+        distinct, inverse = np.unique(score, return_inverse=True)
+        score = np.array([round(value, 3) for value in distinct.tolist()])[inverse]
+        score[duplicate] = 0.0
+
+        flags = [mismatches > 0, ~length_ok, ~dense, translatese, ~law, ~service, ~region, ~usp, ~link]
+        mask = np.zeros(total, dtype=np.int64)
+        for bit, flag in enumerate(flags):
+            mask |= flag.astype(np.int64) << bit
+        mask[duplicate] = -1
+        distinct, inverse = np.unique(mask, return_inverse=True)
+        reasons = np.array([
+            json.dumps(["DUPLICATE"] if value < 0 else [code for bit, code in enumerate(REASON_ORDER) if value >> bit & 1])
+            for value in distinct.tolist()
+        ], dtype=object)[inverse]
+
+        return {
+            "eval_pass": (score >= PASS_THRESHOLD).tolist(),
+            "eval_score": score.tolist(),
+            "eval_reason": reasons.tolist(),
+        }
+
+
+def pearson(xs, ys):
+    """피어슨 상관계수 (분산이 0이면 None)"""
+    n = len(xs)
+    if n < 2:
+        return None
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    var_y = sum((y - mean_y) ** 2 for y in ys)
+    if var_x == 0 or var_y == 0:
+        return None
+    return cov / (var_x * var_y) ** 0.5
+
+
+def find_review_csv_files(pattern="*검수결과*.csv"):
+    """검수 결과 CSV 찾기 (macOS 에서 만든 NFD 파일명도 매칭)"""
+    target = unicodedata.normalize('NFC', pattern)
+    return sorted(
+        path for path in glob.glob("*.csv")
+        if fnmatch.fnmatch(unicodedata.normalize('NFC', path), target)
+    )
+
+
+def calibrate(csv_files, output_path=None):
+    """기존 검수_점수 컬럼과 로컬 점수를 비교한 보정 리포트 생성"""
+    report = {"generated_at": datetime.now().isoformat(timespec='seconds'), "files": {}}
+    all_grader, all_local = [], []
+
+    for csv_file in csv_files:
+        with open(csv_file, 'r', encoding='utf-8-sig') as file:
+            rows = [row for row in csv.DictReader(file) if row.get('검수_점수')]
+
+        rows = [row for row in rows if re.match(r'^\d+(\.\d+)?$', row['검수_점수'].strip())]
+        if not rows:
+            print(f"⚠️ {csv_file}: 검수_점수 데이터가 없습니다.")
+            continue
+
+        scorer = LocalGraderScorer()
+        started = time.perf_counter()
+        columns = scorer.score_batch(
+            (row.get('질문', '') for row in rows),
+            (row.get('원본_의도') or row.get('추출된_의도', '') for row in rows),
+            (row.get('원본_난이도') or row.get('추출된_난이도', '') for row in rows)
+        )
+        elapsed = time.perf_counter() - started
+
+        grader_scores = [float(row['검수_점수']) for row in rows]
+        grader_pass = [row.get('검수_통과', '').strip() in ('통과', 'Y', 'True', 'true') for row in rows]
+        local_scores = columns["eval_score"]
+        local_pass = columns["eval_pass"]
+
+        reason_counts = {}
+        for reasons_json in columns["eval_reason"]:
+            for code in json.loads(reasons_json):
+                reason_counts[code] = reason_counts.get(code, 0) + 1
+
+        n = len(rows)
+        file_report = {
+            "rows": n,
+            "grader_mean": round(sum(grader_scores) / n, 4),
+            "local_mean": round(sum(local_scores) / n, 4),
+            "mae": round(sum(abs(g - l) for g, l in zip(grader_scores, local_scores)) / n, 4),
+            "pearson": pearson(grader_scores, local_scores),
+            "pass_agreement": round(sum(g == l for g, l in zip(grader_pass, local_pass)) / n, 4),
+            "rows_per_sec": round(n / elapsed) if elapsed > 0 else None,
+            "reason_counts": dict(sorted(reason_counts.items(), key=lambda item: -item[1]))
+        }
+        report["files"][csv_file] = file_report
+        all_grader.extend(grader_scores)
+        all_local.extend(local_scores)
+
+        corr = file_report["pearson"]
+        print(f"\n📄 {csv_file} ({n}개)")
+        print(f"  - 평균 점수: 검수 {file_report['grader_mean']:.3f} / 로컬 {file_report['local_mean']:.3f}")
+        print(f"  - MAE: {file_report['mae']:.3f}, 상관계수: {corr:.3f}" if corr is not None else f"  - MAE: {file_report['mae']:.3f}, 상관계수: 계산 불가")
+        print(f"  - 통과 여부 일치율: {file_report['pass_agreement'] * 100:.1f}%")
+        print(f"  - 처리 속도: {file_report['rows_per_sec']}개/초")
+
+    if all_grader:
+        n = len(all_grader)
+        report["overall"] = {
+            "rows": n,
+            "mae": round(sum(abs(g - l) for g, l in zip(all_grader, all_local)) / n, 4),
+            "pearson": pearson(all_grader, all_local)
+        }
+        print(f"\n📈 전체 {n}개: MAE {report['overall']['mae']:.3f}")
+
+    if output_path is None:
+        output_path = f"local_grader_calibration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"💾 보정 리포트 저장: {output_path}")
+
+    return report
+
+
+def main(argv=None):
+    """검수 결과 CSV 와 로컬 점수 보정 리포트 실행"""
+    parser = argparse.ArgumentParser(description="D-FINAL v2 로컬 검수기 보정 리포트")
+    parser.add_argument("csv_files", nargs="*", help="검수 결과 CSV (생략하면 *검수결과*.csv)")
+    parser.add_argument("--output", help=f"리포트 경로 (기준 리포트 갱신: {CALIBRATION_REPORT})")
+    args = parser.parse_args(argv)
+
+    csv_files = args.csv_files or find_review_csv_files()
+    if not csv_files:
+        print("❌ 검수 결과 CSV 파일을 찾을 수 없습니다.")
+        return
+
+    print("🧮 D-FINAL v2 로컬 검수기 보정 리포트")
+    print("=" * 60)
+    calibrate(csv_files, args.output)
+
+
+if __name__ == "__main__":
+    main()
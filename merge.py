@@ -1,6 +1,7 @@
 import csv
 import os
 from datetime import datetime
+from columnar_store import write_parquet, parquet_path
 
 def merge_csv_files(file1_path, file2_path, output_filename=None):
     """
@@ -94,9 +95,12 @@ def merge_csv_files(file1_path, file2_path, output_filename=None):
             writer.writeheader()
             writer.writerows(merged_data)
         
+        # 다음 단계(중복 제거/균형 필터)용 컬럼형 파일도 함께 저장
+        write_parquet(merged_data, parquet_path(output_filename), stage="reviewed")
+        
         # 결과 출력
         print("\n✅ 파일 통합 완료!")
-        print(f"📁 출력 파일: {output_filename}")
+        print(f"📁 출력 파일: {output_filename} (+ {parquet_path(output_filename)})")
         print("📊 통합 결과:")
         print(f"  • 기존 데이터: {len(file1_data)}행")
         print(f"  • 새 데이터: {len(file2_data)}행")
@@ -0,0 +1,347 @@
+import hashlib
+import math
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_COMPRESSION = 100      # t-digest 압축 계수 (중심점 수 ≈ 이 값 근처)
+DEFAULT_MAX_KEYS = 10000       # Distribution 이 정확히 세는 최대 고유값 수
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class RunningStats:
+    """Welford 온라인 평균/분산 (값을 저장하지 않음, Chan 공식으로 병합 가능)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """표본 분산 (값이 2개 미만이면 0)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2,
+                "min": self.min if self.count else None, "max": self.max if self.count else None}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "RunningStats":
+        stats = cls()
+        stats.count, stats.mean, stats.m2 = state["count"], state["mean"], state["m2"]
+        if stats.count:
+            stats.min, stats.max = state["min"], state["max"]
+        return stats
+
+
+class TDigest:
+    """병합형 t-digest 스트리밍 분위수 (Dunning & Ertl, k1 스케일 함수)
+
+    값을 버퍼에 모았다가 정렬 병합으로 중심점(평균, 가중치) 목록을 다시 만든다.
+    꼬리 쪽 중심점일수록 작게 유지되므로 p99 같은 극단 분위수도 정확하고,
+    중심점 목록끼리 합치면 되므로 프로세스/파일 사이에서 병합할 수 있다.
+    """
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.buffer = []
+        self.buffer_size = int(compression * 5)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, weight: float = 1):
+        self.buffer.append((value, weight))
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self.buffer) >= self.buffer_size:
+            self.compress()
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _q(self, k: float) -> float:
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def compress(self):
+        """버퍼 + 기존 중심점을 정렬 병합해 중심점 목록을 다시 만듦"""
+        if not self.buffer:
+            return
+        points = sorted(list(zip(self.means, self.weights)) + self.buffer)
+        self.buffer = []
+        total = sum(weight for _, weight in points)
+
+        means, weights = [], []
+        mean, weight = points[0]
+        so_far = 0
+        limit = self._q(self._k(0) + 1) * total
+        for value, value_weight in points[1:]:
+            if so_far + weight + value_weight <= limit:
+                weight += value_weight
+                mean += (value - mean) * value_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                so_far += weight
+                limit = self._q(self._k(so_far / total) + 1) * total
+                mean, weight = value, value_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        if not other.count:
+            return self
+        self.buffer.extend(zip(other.means, other.weights))
+        self.buffer.extend(other.buffer)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위수 (0 ≤ q ≤ 1, 값이 없으면 None) - 중심점 사이 선형 보간"""
+        self.compress()
+        if not self.count:
+            return None
+        if len(self.means) == 1 or q <= 0:
+            return self.min if q <= 0 else (self.max if q >= 1 else self.means[0])
+        if q >= 1:
+            return self.max
+
+        target = q * self.count
+        first, last = self.weights[0], self.weights[-1]
+        if target < first / 2:
+            return self.min + (self.means[0] - self.min) * target / (first / 2)
+        if target > self.count - last / 2:
+            return self.max - (self.max - self.means[-1]) * (self.count - target) / (last / 2)
+
+        cumulative = first / 2
+        for i in range(len(self.means) - 1):
+            step = (self.weights[i] + self.weights[i + 1]) / 2
+            if cumulative + step >= target:
+                fraction = (target - cumulative) / step
+                return self.means[i] + (self.means[i + 1] - self.means[i]) * fraction
+            cumulative += step
+        return self.means[-1]
+
+    def to_dict(self) -> Dict:
+        self.compress()
+        return {"compression": self.compression, "means": self.means, "weights": self.weights,
+                "count": self.count, "min": self.min if self.count else None,
+                "max": self.max if self.count else None}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "TDigest":
+        digest = cls(state["compression"])
+        digest.means, digest.weights = list(state["means"]), list(state["weights"])
+        digest.count = state["count"]
+        if digest.count:
+            digest.min, digest.max = state["min"], state["max"]
+        return digest
+
+
+class NumericSummary:
+    """수치 스트림 요약 - 평균/표준편차(Welford) + 분위수(t-digest), 병합 가능"""
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.stats = RunningStats()
+        self.digest = TDigest(compression)
+
+    @property
+    def count(self) -> int:
+        return self.stats.count
+
+    def add(self, value: float):
+        self.stats.add(value)
+        self.digest.add(value)
+
+    def merge(self, other: "NumericSummary") -> "NumericSummary":
+        self.stats.merge(other.stats)
+        self.digest.merge(other.digest)
+        return self
+
+    def summary(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict:
+        """{min, max, avg, std, p50, ...} (값이 없으면 통계값은 None)"""
+        empty = not self.stats.count
+        result = {
+            "count": self.stats.count,
+            "min": None if empty else self.stats.min,
+            "max": None if empty else self.stats.max,
+            "avg": 0 if empty else self.stats.mean,
+            "std": 0 if empty else self.stats.std,
+        }
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = self.digest.quantile(q)
+        return result
+
+    def to_dict(self) -> Dict:
+        return {"stats": self.stats.to_dict(), "digest": self.digest.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "NumericSummary":
+        summary = cls()
+        summary.stats = RunningStats.from_dict(state["stats"])
+        summary.digest = TDigest.from_dict(state["digest"])
+        return summary
+
+
+def _hash_key(key: Hashable) -> int:
+    """프로세스와 상관없이 같은 값 (PYTHONHASHSEED 영향 없음)"""
+    return int.from_bytes(hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class CountMinSketch:
+    """Count-Min 스케치 - 고정 크기 표로 빈도를 과대 추정 (같은 크기끼리 더해서 병합)"""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = [[0] * width for _ in range(depth)]
+
+    def _columns(self, key: Hashable) -> List[int]:
+        # 64비트 해시 하나를 둘로 나눠 depth 개의 해시를 만듦 (Kirsch-Mitzenmacher)
+        value = _hash_key(key)
+        first, second = value & 0xFFFFFFFF, value >> 32
+        return [(first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, key: Hashable, count: int = 1):
+        for row, column in zip(self.table, self._columns(key)):
+            row[column] += count
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[column] for row, column in zip(self.table, self._columns(key)))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("크기가 다른 Count-Min 스케치는 병합할 수 없습니다")
+        for row, other_row in zip(self.table, other.table):
+            for column, count in enumerate(other_row):
+                if count:
+                    row[column] += count
+        return self
+
+    def to_dict(self) -> Dict:
+        return {"width": self.width, "depth": self.depth, "table": self.table}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "CountMinSketch":
+        sketch = cls(state["width"], state["depth"])
+        sketch.table = [list(row) for row in state["table"]]
+        return sketch
+
+
+class Distribution:
+    """값별 빈도 - 고유값 max_keys 개까지는 정확히 세고, 넘치면 Count-Min 스케치로 근사
+
+    분포 차원(법무분야/지역 등)은 보통 정확 카운터로 끝나고, 템플릿/교차 조합처럼
+    고유값이 계속 늘 수 있는 차원도 메모리가 max_keys 개 + 스케치 크기로 묶인다.
+    """
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS, width: int = 2048, depth: int = 4):
+        self.max_keys = max_keys
+        self.width = width
+        self.depth = depth
+        self.counts = {}
+        self.total = 0
+        self.overflow = 0          # 스케치로 넘어간 개수
+        self.sketch = None
+
+    @property
+    def exact(self) -> bool:
+        return self.sketch is None
+
+    def add(self, key: Hashable, count: int = 1):
+        self.total += count
+        if key in self.counts:
+            self.counts[key] += count
+        elif len(self.counts) < self.max_keys:
+            self.counts[key] = count
+        else:
+            if self.sketch is None:
+                self.sketch = CountMinSketch(self.width, self.depth)
+            self.sketch.add(key, count)
+            self.overflow += count
+
+    def update(self, keys: Iterable[Hashable]):
+        for key in keys:
+            self.add(key)
+
+    def estimate(self, key: Hashable) -> int:
+        """빈도 (정확히 세는 값은 정확, 그 밖은 스케치 추정치)"""
+        count = self.counts.get(key, 0)
+        if self.sketch is not None:
+            count += self.sketch.estimate(key)
+        return count
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        items = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return items if n is None else items[:n]
+
+    def to_counts(self) -> Dict:
+        """정확히 센 값들의 {값: 개수} (스케치로 넘어간 값은 빠짐)"""
+        return dict(self.counts)
+
+    def merge(self, other: "Distribution") -> "Distribution":
+        for key, count in other.counts.items():
+            self.add(key, count)
+        if other.sketch is not None:
+            if self.sketch is None:
+                self.sketch = CountMinSketch(other.sketch.width, other.sketch.depth)
+            self.sketch.merge(other.sketch)
+            self.overflow += other.overflow
+            self.total += other.overflow
+        return self
+
+    def to_dict(self) -> Dict:
+        return {"max_keys": self.max_keys, "counts": self.counts, "total": self.total,
+                "overflow": self.overflow, "sketch": self.sketch.to_dict() if self.sketch else None}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "Distribution":
+        sketch = state.get("sketch")
+        distribution = cls(state["max_keys"], *((sketch["width"], sketch["depth"]) if sketch else ()))
+        distribution.counts = dict(state["counts"])
+        distribution.total = state["total"]
+        distribution.overflow = state["overflow"]
+        distribution.sketch = CountMinSketch.from_dict(sketch) if sketch else None
+        return distribution
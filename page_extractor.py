@@ -0,0 +1,382 @@
+import glob
+import sys
+import time
+from html.parser import HTMLParser
+from typing import Dict
+
+from bs4 import BeautifulSoup
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# BeautifulSoup(html.parser) 와 같은 규칙을 쓰기 위한 태그 분류
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr', 'image', 'img',
+    'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr',
+])
+PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+# 이 태그 안의 문자열은 get_text() 에 포함되지 않음
+STRING_CONTAINER_TAGS = frozenset(['rt', 'rp', 'style', 'script', 'template'])
+COLLECTED_TAGS = frozenset(['title', 'a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+class PageCollector:
+    """태그 이벤트를 한 번 훑으며 제목/메타/헤딩/링크/본문을 모으는 수집기
+
+    트리를 만들지 않고 열린 태그 스택만 유지한다. 문자열 분할, 공백 문자열 축약,
+    스크립트/스타일 문자열 제외, 닫는 태그 처리는 BeautifulSoup(html.parser) 와
+    같은 규칙을 따르므로 get_text() / find_all() 결과와 같은 값을 만든다.
+    lxml 파서의 target 으로도 그대로 쓸 수 있다 (start / end / data / comment / close).
+    """
+
+    def __init__(self):
+        self.stack = []            # (태그, 수집 버퍼 또는 None)
+        self.open_counts = {}
+        self.pending = []
+        self.preserve_depth = 0
+        self.container_depth = 0
+        self.active = []           # 현재 열려 있는 수집 대상 태그의 버퍼
+
+        self.body = []
+        self.title = None
+        self.meta = {}
+        self.headings = {f'h{i}': [] for i in range(1, 7)}
+        self.links = []
+        self.hrefs = []
+
+    def flush(self, cdata=False):
+        """쌓인 문자열 하나를 확정 (BeautifulSoup.endData 규칙, CDATA 는 항상 본문)"""
+        if not self.pending:
+            return
+        text = ''.join(self.pending)
+        self.pending = []
+
+        if not self.preserve_depth and not text.strip(ASCII_SPACES):
+            text = '\n' if '\n' in text else ' '
+
+        if self.container_depth and not cdata:
+            return
+
+        self.body.append(text)
+        for buffer in self.active:
+            buffer.append(text)
+
+    def start(self, tag, attrs):
+        self.flush()
+        tag = tag.lower()
+        attrs = dict(attrs)
+
+        if tag == 'meta':
+            name = attrs.get('name')
+            if name in ('description', 'keywords') and name not in self.meta:
+                self.meta[name] = attrs.get('content') or ''
+
+        buffer = None
+        if tag in COLLECTED_TAGS:
+            buffer = []
+            if tag == 'a':
+                self.links.append(buffer)
+                if attrs.get('href'):
+                    self.hrefs.append(attrs['href'])
+            elif tag == 'title':
+                if self.title is None:
+                    self.title = buffer
+            else:
+                self.headings[tag].append(buffer)
+            self.active.append(buffer)
+
+        self.stack.append((tag, buffer))
+        self.open_counts[tag] = self.open_counts.get(tag, 0) + 1
+        if tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth += 1
+        if tag in STRING_CONTAINER_TAGS:
+            self.container_depth += 1
+
+    def end(self, tag):
+        self.flush()
+        tag = tag.lower()
+        if not self.open_counts.get(tag):
+            return
+
+        # 가장 최근에 열린 같은 이름의 태그까지 닫음 (BeautifulSoup._popToTag)
+        while self.stack:
+            name, buffer = self.stack.pop()
+            self.open_counts[name] -= 1
+            if name in PRESERVE_WHITESPACE_TAGS:
+                self.preserve_depth -= 1
+            if name in STRING_CONTAINER_TAGS:
+                self.container_depth -= 1
+            if buffer is not None:
+                self.active.pop()
+            if name == tag:
+                break
+
+    def data(self, text):
+        self.pending.append(text)
+
+    def comment(self, text):
+        # 주석/선언은 문자열을 끊기만 하고 본문에는 넣지 않음
+        self.flush()
+
+    def cdata(self, text):
+        self.flush()
+        self.pending.append(text)
+        self.flush(cdata=True)
+
+    def close(self):
+        self.flush()
+        return self
+
+    def result(self, url: str) -> Dict:
+        """parse_page 와 같은 형식의 결과 dict"""
+        title = ''.join(self.title) if self.title is not None else ""
+        link_texts = []
+        for buffer in self.links:
+            text = ''.join(buffer).strip()
+            if text:
+                link_texts.append(text)
+
+        return {
+            'status': 'success',
+            'title': title.strip(),
+            'meta_description': self.meta.get('description', '').strip(),
+            'meta_keywords': self.meta.get('keywords', '').strip(),
+            'body_text': ''.join(self.body).strip(),
+            'headings': {name: [''.join(buffer).strip() for buffer in buffers]
+                         for name, buffers in self.headings.items()},
+            'link_texts': link_texts,
+            'url': url,
+            'links': self.hrefs,
+            'spaced_text': ' '.join(' '.join(self.body).split()),
+        }
+
+
+class StreamingPageParser(HTMLParser):
+    """표준 라이브러리 HTMLParser 이벤트를 PageCollector 로 넘기는 스트리밍 파서
+
+    문자 참조 / 빈 요소 처리는 BeautifulSoup 의 html.parser 빌더와 같게 맞춘다.
+    """
+
+    def __init__(self, collector: PageCollector, original_encoding=None):
+        super().__init__(convert_charrefs=False)
+        self.collector = collector
+        self.original_encoding = original_encoding
+        self.already_closed_empty_element = []
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag)
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        self.collector.start(tag, [(key, '' if value is None else value) for key, value in attrs])
+        if tag in VOID_ELEMENTS and handle_empty_element:
+            self.collector.end(tag)
+            self.already_closed_empty_element.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self.already_closed_empty_element:
+            self.already_closed_empty_element.remove(tag)
+        else:
+            self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def handle_charref(self, name):
+        if name.startswith(('x', 'X')):
+            code = int(name.lstrip('xX'), 16)
+        else:
+            code = int(name)
+
+        data = None
+        if code < 256:
+            for encoding in (self.original_encoding, 'windows-1252'):
+                if not encoding:
+                    continue
+                try:
+                    data = bytearray([code]).decode(encoding)
+                except UnicodeDecodeError:
+                    pass
+        if not data:
+            try:
+                data = chr(code)
+            except (ValueError, OverflowError):
+                pass
+        self.collector.data(data or '\N{REPLACEMENT CHARACTER}')
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.collector.data(character if character is not None else f'&{name}')
+
+    def handle_comment(self, data):
+        self.collector.comment(data)
+
+    def handle_decl(self, decl):
+        self.collector.comment(decl)
+
+    def handle_pi(self, data):
+        self.collector.comment(data)
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            self.collector.cdata(data[len('CDATA['):])
+        else:
+            self.collector.comment(data)
+
+
+def decode_html(html):
+    """bytes 면 BeautifulSoup 과 같은 방식으로 인코딩 판별 → (문자열, 원래 인코딩)"""
+    if isinstance(html, str):
+        return html, None
+    dammit = UnicodeDammit(html, is_html=True)
+    return dammit.unicode_markup, dammit.original_encoding
+
+
+def available_backends():
+    """사용 가능한 파서 백엔드 (빠른 순)"""
+    return (['lxml'] if etree is not None else []) + ['stream', 'soup']
+
+
+def extract_page_soup(url: str, html) -> Dict:
+    """BeautifulSoup 트리 기반 추출 (기준 구현 - 벤치마크/검증용)"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # 메타 정보 추출
+    title = soup.find('title').get_text() if soup.find('title') else ""
+    meta_description = ""
+    meta_keywords = ""
+
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc:
+        meta_description = meta_desc.get('content', '')
+
+    meta_kw = soup.find('meta', attrs={'name': 'keywords'})
+    if meta_kw:
+        meta_keywords = meta_kw.get('content', '')
+
+    # 스크립트, 스타일 태그 제거 후 본문 텍스트
+    for script in soup(["script", "style"]):
+        script.decompose()
+
+    body_text = soup.get_text()
+    spaced_text = soup.get_text(' ')
+
+    # 헤딩 태그 추출
+    headings = {}
+    for i in range(1, 7):
+        h_tags = soup.find_all(f'h{i}')
+        headings[f'h{i}'] = [tag.get_text().strip() for tag in h_tags]
+
+    # 링크 텍스트 + 주소 추출
+    links = soup.find_all('a')
+    link_texts = [link.get_text().strip() for link in links if link.get_text().strip()]
+    hrefs = [link.get('href') for link in links if link.get('href')]
+
+    return {
+        'status': 'success',
+        'title': title.strip(),
+        'meta_description': meta_description.strip(),
+        'meta_keywords': meta_keywords.strip(),
+        'body_text': body_text.strip(),
+        'headings': headings,
+        'link_texts': link_texts,
+        'url': url,
+        'links': hrefs,
+        'spaced_text': ' '.join(spaced_text.split()),
+    }
+
+
+def extract_page_lxml(url: str, html) -> Dict:
+    """lxml(libxml2) 파서에 PageCollector 를 target 으로 연결한 추출"""
+    markup, _ = decode_html(html)
+    collector = PageCollector()
+    parser = etree.HTMLParser(target=collector)
+    parser.feed(markup)
+    parser.close()
+    return collector.result(url)
+
+
+def extract_page(url: str, html, backend: str = 'auto') -> Dict:
+    """HTML → 제목/메타/헤딩/링크/본문을 한 번의 순회로 추출
+
+    backend:
+      'auto'   - lxml 이 설치되어 있으면 'lxml', 아니면 'stream' (기본)
+      'lxml'   - libxml2 C 파서 + PageCollector. 가장 빠르지만 닫히지 않은 태그 등 잘못된
+                 마크업은 libxml2 방식으로 고쳐지므로 그런 페이지에서는 결과가 조금 다를 수 있음
+      'stream' - 표준 HTMLParser 스트리밍. 어떤 페이지든 BeautifulSoup 결과와 동일
+      'soup'   - 기존 BeautifulSoup 트리 방식
+    """
+    if backend == 'auto':
+        backend = 'lxml' if etree is not None else 'stream'
+    if backend == 'lxml' and etree is not None:
+        return extract_page_lxml(url, html)
+    if backend == 'soup':
+        return extract_page_soup(url, html)
+
+    markup, original_encoding = decode_html(html)
+    collector = PageCollector()
+    parser = StreamingPageParser(collector, original_encoding)
+    parser.feed(markup)
+    parser.close()
+    collector.close()
+    return collector.result(url)
+
+
+def benchmark(paths, repeat=3, backends=None):
+    """저장된 HTML 파일들로 백엔드별 추출 시간 비교 + 기준(soup) 결과와 일치 여부 확인"""
+    backends = backends or available_backends()
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append((path, f.read()))
+
+    total_bytes = sum(len(html) for _, html in pages)
+    print(f"📊 HTML 추출 벤치마크: {len(pages)}개 파일, {total_bytes / 1024 / 1024:.1f} MB, 반복 {repeat}회")
+
+    expected = [extract_page_soup(path, html) for path, html in pages]
+    timings = {}
+
+    for backend in backends:
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            results = [extract_page(path, html, backend) for path, html in pages]
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        mismatches = [path for (path, _), result, base in zip(pages, results, expected) if result != base]
+        timings[backend] = best
+        print(f"  - {backend:6s}: {best:.3f}초 ({total_bytes / 1024 / 1024 / best:.1f} MB/s), "
+              f"기준과 다른 파일 {len(mismatches)}개")
+        for path in mismatches[:3]:
+            print(f"      ⚠️ {path}")
+
+    if 'soup' in timings:
+        for backend, elapsed in timings.items():
+            if backend != 'soup':
+                print(f"🚀 {backend}: soup 대비 {timings['soup'] / elapsed:.1f}배 빠름")
+
+    return timings
+
+
+def main():
+    """저장된 HTML 페이지로 백엔드별 벤치마크 (python page_extractor.py <HTML 파일 또는 glob> [...])"""
+    patterns = sys.argv[1:]
+    if not patterns:
+        print("사용법: python page_extractor.py <저장된 HTML 파일 또는 glob> [...]")
+        return
+
+    paths = [path for pattern in patterns for path in sorted(glob.glob(pattern, recursive=True))]
+    if not paths:
+        print("❌ HTML 파일을 찾을 수 없습니다")
+        return
+
+    benchmark(paths, backends=['soup'] + [b for b in available_backends() if b != 'soup'])
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,20 @@ import csv
 import random
 from datetime import datetime
 import hashlib
+from similarity_index import PromptSimilarityIndex
+from korean_tokenizer import token_set
+from fingerprint_store import PromptFingerprintStore, DEFAULT_FINGERPRINT_DB
+from columnar_store import write_parquet, parquet_path
 
 class DongraePromptExpander:
     """법률사무소 프롬프트 확장 생성기 - 중복 방지 및 난이도 조절"""
     
-    def __init__(self, existing_csv_file=None):
-        """기존 CSV 파일이 있다면 로드하여 중복 방지"""
+    def __init__(self, existing_csv_file=None, fingerprint_db=None):
+        """기존 CSV 파일이 있다면 로드하여 중복 방지 (fingerprint_db 지정 시 실행 간 공유 중복 체크)"""
         self.existing_prompts = set()
         self.existing_hashes = set()
+        self.similarity_index = PromptSimilarityIndex()
+        self.fingerprint_store = PromptFingerprintStore(fingerprint_db) if fingerprint_db else None
         
         if existing_csv_file:
             self.load_existing_prompts(existing_csv_file)
@@ -91,6 +97,7 @@ class DongraePromptExpander:
                     prompt = row.get('질문', '').strip()
                     if prompt:
                         self.existing_prompts.add(prompt)
+                        self.similarity_index.add(prompt)
                         # 해시값도 저장하여 유사한 문장 체크
                         prompt_hash = self.get_prompt_hash(prompt)
                         self.existing_hashes.add(prompt_hash)
@@ -119,23 +126,35 @@ class DongraePromptExpander:
         if prompt_hash in self.existing_hashes:
             return True
         
+        if self.fingerprint_store is not None and self.fingerprint_store.contains(prompt_hash):
+            return True
+        
         # 핵심 키워드 기반 유사도 체크
-        for existing in self.existing_prompts:
-            if self.calculate_similarity(prompt, existing) > 0.8:
-                return True
+        if self.similarity_index.has_similar(prompt):
+            return True
         
         return False
 
     def calculate_similarity(self, prompt1, prompt2):
         """두 프롬프트 간 유사도 계산 (간단한 자카드 유사도)"""
-        words1 = set(prompt1.replace('?', '').replace('!', '').split())
-        words2 = set(prompt2.replace('?', '').replace('!', '').split())
+        # 조사/어미를 뗀 명사·어간 토큰 기준 (부산에서 / 부산의 → 부산)
+        words1 = token_set(prompt1)
+        words2 = token_set(prompt2)
         
         intersection = words1.intersection(words2)
         union = words1.union(words2)
         
         return len(intersection) / len(union) if union else 0
 
+    def register_prompt(self, prompt):
+        """생성된 프롬프트를 중복 체크 대상에 추가"""
+        self.existing_prompts.add(prompt)
+        prompt_hash = self.get_prompt_hash(prompt)
+        self.existing_hashes.add(prompt_hash)
+        self.similarity_index.add(prompt)
+        if self.fingerprint_store is not None:
+            self.fingerprint_store.stage(prompt_hash, prompt, source=type(self).__name__)
+
     def generate_easy_prompts(self, target_count=50):
         """쉬움 난이도 프롬프트 생성"""
         prompts = []
@@ -163,8 +182,7 @@ class DongraePromptExpander:
                     'domain': '법무',
                     'language': 'KO'
                 })
-                self.existing_prompts.add(prompt)
-                self.existing_hashes.add(self.get_prompt_hash(prompt))
+                self.register_prompt(prompt)
         
         print(f"✅ 쉬움 난이도 프롬프트 {len(prompts)}개 생성 완료")
         return prompts
@@ -200,8 +218,7 @@ class DongraePromptExpander:
                     'domain': '법무',
                     'language': 'KO'
                 })
-                self.existing_prompts.add(prompt)
-                self.existing_hashes.add(self.get_prompt_hash(prompt))
+                self.register_prompt(prompt)
         
         print(f"✅ 보통 난이도 프롬프트 {len(prompts)}개 생성 완료")
         return prompts
@@ -237,8 +254,7 @@ class DongraePromptExpander:
                     'domain': '법무',
                     'language': 'KO'
                 })
-                self.existing_prompts.add(prompt)
-                self.existing_hashes.add(self.get_prompt_hash(prompt))
+                self.register_prompt(prompt)
         
         print(f"✅ 어려움 난이도 프롬프트 {len(prompts)}개 생성 완료")
         return prompts
@@ -267,6 +283,7 @@ class DongraePromptExpander:
         current_date = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"law_firm_prompts_{filename_suffix}_{current_date}.csv"
         
+        rows = []
         with open(filename, 'w', newline='', encoding='utf-8-sig') as file:
             fieldnames = ['번호', '질문', '의도', '난이도', '도메인', '언어', '어절수', '키워드_포함']
             writer = csv.DictWriter(file, fieldnames=fieldnames)
@@ -285,7 +302,7 @@ class DongraePromptExpander:
                 if any(usp in prompt_data['prompt'] for usp in self.usp_keywords):
                     keywords_found.append('USP')
                 
-                writer.writerow({
+                row = {
                     '번호': i,
                     '질문': prompt_data['prompt'],
                     '의도': prompt_data['intent'],
@@ -294,7 +311,16 @@ class DongraePromptExpander:
                     '언어': prompt_data['language'],
                     '어절수': word_count,
                     '키워드_포함': ', '.join(keywords_found) if keywords_found else '기본'
-                })
+                }
+                writer.writerow(row)
+                rows.append(row)
+        
+        # 같은 내용을 컬럼형(Parquet)으로도 저장 (의도/난이도 등은 사전 인코딩)
+        write_parquet(rows, parquet_path(filename), stage="generated")
+        
+        # 파일을 다 쓴 뒤에야 지문을 공유 저장소에 기록 (중간에 멈춘 실행은 남기지 않음)
+        if self.fingerprint_store is not None:
+            self.fingerprint_store.flush()
         
         return filename
 
@@ -318,7 +344,7 @@ def main():
         easy_count, medium_count, hard_count = 30, 40, 30
     
     # 프롬프트 생성기 초기화
-    expander = DongraePromptExpander(existing_file)
+    expander = DongraePromptExpander(existing_file, fingerprint_db=DEFAULT_FINGERPRINT_DB)
     
     # 추가 프롬프트 생성
     new_prompts = expander.generate_additional_prompts(easy_count, medium_count, hard_count)
@@ -361,6 +387,10 @@ def main():
         print(f"  {i}. [{prompt['difficulty']}] {prompt['prompt']}")
     
     print(f"\n🎉 작업 완료! {filename} 파일을 확인해주세요.")
+    
+    # 지문 저장소 연결 닫기
+    if expander.fingerprint_store is not None:
+        expander.fingerprint_store.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,14 +2,20 @@ import csv
 import random
 from datetime import datetime
 import hashlib
+from similarity_index import PromptSimilarityIndex
+from korean_tokenizer import token_set
+from fingerprint_store import PromptFingerprintStore, DEFAULT_FINGERPRINT_DB
+from columnar_store import write_parquet, parquet_path
 
 class InfoFocusedPromptGenerator:
     """정보 의도 특화 프롬프트 생성기 - 쉬움/어려움 난이도 중심"""
     
-    def __init__(self, existing_csv_file=None):
-        """기존 CSV 파일이 있다면 로드하여 중복 방지"""
+    def __init__(self, existing_csv_file=None, fingerprint_db=None):
+        """기존 CSV 파일이 있다면 로드하여 중복 방지 (fingerprint_db 지정 시 실행 간 공유 중복 체크)"""
         self.existing_prompts = set()
         self.existing_hashes = set()
+        self.similarity_index = PromptSimilarityIndex()
+        self.fingerprint_store = PromptFingerprintStore(fingerprint_db) if fingerprint_db else None
         
         if existing_csv_file:
             self.load_existing_prompts(existing_csv_file)
@@ -93,6 +99,7 @@ class InfoFocusedPromptGenerator:
                     prompt = row.get('질문', '').strip()
                     if prompt:
                         self.existing_prompts.add(prompt)
+                        self.similarity_index.add(prompt)
                         prompt_hash = self.get_prompt_hash(prompt)
                         self.existing_hashes.add(prompt_hash)
             
@@ -117,22 +124,34 @@ class InfoFocusedPromptGenerator:
         if prompt_hash in self.existing_hashes:
             return True
         
-        for existing in self.existing_prompts:
-            if self.calculate_similarity(prompt, existing) > 0.8:
-                return True
+        if self.fingerprint_store is not None and self.fingerprint_store.contains(prompt_hash):
+            return True
+        
+        if self.similarity_index.has_similar(prompt):
+            return True
         
         return False
 
     def calculate_similarity(self, prompt1, prompt2):
         """두 프롬프트 간 유사도 계산"""
-        words1 = set(prompt1.replace('?', '').replace('!', '').split())
-        words2 = set(prompt2.replace('?', '').replace('!', '').split())
+        # 조사/어미를 뗀 명사·어간 토큰 기준 (부산에서 / 부산의 → 부산)
+        words1 = token_set(prompt1)
+        words2 = token_set(prompt2)
         
         intersection = words1.intersection(words2)
         union = words1.union(words2)
         
         return len(intersection) / len(union) if union else 0
 
+    def register_prompt(self, prompt):
+        """생성된 프롬프트를 중복 체크 대상에 추가"""
+        self.existing_prompts.add(prompt)
+        prompt_hash = self.get_prompt_hash(prompt)
+        self.existing_hashes.add(prompt_hash)
+        self.similarity_index.add(prompt)
+        if self.fingerprint_store is not None:
+            self.fingerprint_store.stage(prompt_hash, prompt, source=type(self).__name__)
+
     def generate_info_easy_prompts(self, target_count=100):
         """정보 의도 + 쉬움 난이도 프롬프트 생성"""
         prompts = []
@@ -162,8 +181,7 @@ class InfoFocusedPromptGenerator:
                     'domain': '법무',
                     'language': 'KO'
                 })
-                self.existing_prompts.add(prompt)
-                self.existing_hashes.add(self.get_prompt_hash(prompt))
+                self.register_prompt(prompt)
                 
                 # 진행률 표시
                 if len(prompts) % 20 == 0:
@@ -205,8 +223,7 @@ class InfoFocusedPromptGenerator:
                     'domain': '법무',
                     'language': 'KO'
                 })
-                self.existing_prompts.add(prompt)
-                self.existing_hashes.add(self.get_prompt_hash(prompt))
+                self.register_prompt(prompt)
                 
                 # 진행률 표시
                 if len(prompts) % 20 == 0:
@@ -237,6 +254,7 @@ class InfoFocusedPromptGenerator:
         current_date = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"law_firm_prompts_{filename_suffix}_{current_date}.csv"
         
+        rows = []
         with open(filename, 'w', newline='', encoding='utf-8-sig') as file:
             fieldnames = ['번호', '질문', '의도', '난이도', '도메인', '언어', '어절수', '키워드_포함']
             writer = csv.DictWriter(file, fieldnames=fieldnames)
@@ -257,7 +275,7 @@ class InfoFocusedPromptGenerator:
                 if any(metric in prompt_data['prompt'] for metric in self.info_metrics):
                     keywords_found.append('정보메트릭')
                 
-                writer.writerow({
+                row = {
                     '번호': i,
                     '질문': prompt_data['prompt'],
                     '의도': prompt_data['intent'],
@@ -266,7 +284,16 @@ class InfoFocusedPromptGenerator:
                     '언어': prompt_data['language'],
                     '어절수': word_count,
                     '키워드_포함': ', '.join(keywords_found) if keywords_found else '기본'
-                })
+                }
+                writer.writerow(row)
+                rows.append(row)
+        
+        # 같은 내용을 컬럼형(Parquet)으로도 저장 (의도/난이도 등은 사전 인코딩)
+        write_parquet(rows, parquet_path(filename), stage="generated")
+        
+        # 파일을 다 쓴 뒤에야 지문을 공유 저장소에 기록 (중간에 멈춘 실행은 남기지 않음)
+        if self.fingerprint_store is not None:
+            self.fingerprint_store.flush()
         
         return filename
 
@@ -289,7 +316,7 @@ def main():
         easy_count, hard_count = 100, 100
     
     # 프롬프트 생성기 초기화
-    generator = InfoFocusedPromptGenerator(existing_file)
+    generator = InfoFocusedPromptGenerator(existing_file, fingerprint_db=DEFAULT_FINGERPRINT_DB)
     
     # 정보 의도 프롬프트 생성
     new_prompts = generator.generate_info_prompts(easy_count, hard_count)
@@ -340,6 +367,10 @@ def main():
         print(f"    {i}. {prompt['prompt'][:80]}...")
     
     print(f"\n🎉 작업 완료! {filename} 파일을 확인해주세요.")
+    
+    # 지문 저장소 연결 닫기
+    if generator.fingerprint_store is not None:
+        generator.fingerprint_store.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,16 +1,26 @@
 import csv
-import random
 from datetime import datetime
 import hashlib
 import re
+from similarity_index import PromptSimilarityIndex
+from korean_tokenizer import token_set
+from fingerprint_store import PromptFingerprintStore, DEFAULT_FINGERPRINT_DB
+from columnar_store import write_parquet, parquet_path
+from local_grader import LocalGraderScorer
+from template_space import TemplateSpace
+from rewrite_rules import GRADER_REWRITER
 
 class DongraeGraderOptimizedGenerator:
     """동래 법률사무소 검수 기준 최적화 프롬프트 생성기"""
     
-    def __init__(self, existing_csv_file=None):
-        """기존 CSV 파일이 있다면 로드하여 중복 방지"""
+    def __init__(self, existing_csv_file=None, fingerprint_db=None):
+        """기존 CSV 파일이 있다면 로드하여 중복 방지 (fingerprint_db 지정 시 실행 간 공유 중복 체크)"""
         self.existing_prompts = set()
         self.existing_hashes = set()
+        self.similarity_index = PromptSimilarityIndex()
+        self.fingerprint_store = PromptFingerprintStore(fingerprint_db) if fingerprint_db else None
+        self.local_scorer = LocalGraderScorer()
+        self.template_spaces = {}
         
         if existing_csv_file:
             self.load_existing_prompts(existing_csv_file)
@@ -157,6 +167,7 @@ class DongraeGraderOptimizedGenerator:
                     prompt = row.get('질문', '').strip()
                     if prompt:
                         self.existing_prompts.add(prompt)
+                        self.similarity_index.add(prompt)
                         prompt_hash = self.get_prompt_hash(prompt)
                         self.existing_hashes.add(prompt_hash)
             
@@ -181,16 +192,19 @@ class DongraeGraderOptimizedGenerator:
         if prompt_hash in self.existing_hashes:
             return True
         
-        for existing in self.existing_prompts:
-            if self.calculate_similarity(prompt, existing) > 0.8:
-                return True
+        if self.fingerprint_store is not None and self.fingerprint_store.contains(prompt_hash):
+            return True
+        
+        if self.similarity_index.has_similar(prompt):
+            return True
         
         return False
 
     def calculate_similarity(self, prompt1, prompt2):
         """두 프롬프트 간 유사도 계산"""
-        words1 = set(prompt1.replace('?', '').replace('!', '').split())
-        words2 = set(prompt2.replace('?', '').replace('!', '').split())
+        # 조사/어미를 뗀 명사·어간 토큰 기준 (부산에서 / 부산의 → 부산)
+        words1 = token_set(prompt1)
+        words2 = token_set(prompt2)
         
         intersection = words1.intersection(words2)
         union = words1.union(words2)
@@ -215,137 +229,104 @@ class DongraeGraderOptimizedGenerator:
             # 너무 길면 간소화
             prompt = ' '.join(prompt.split()[:28]) + " 알려주세요"
         
-        # 2. 번역체 제거
-        translations = [
-            ("입니다", "이에요"), ("습니다", "어요"), ("하였습니다", "했어요"),
-            ("되었습니다", "됐어요"), ("있습니다", "있어요"), ("~에 대해", "~관련"),
-            ("관하여", "관련해서"), ("대하여", "관련")
-        ]
-        
-        for old, new in translations:
-            prompt = prompt.replace(old, new)
-        
-        # 3. 자연스러운 한국어로 조정
-        if "에 대한" in prompt:
-            prompt = prompt.replace("에 대한", "관련")
+        # 2. 번역체 제거 + 자연스러운 한국어로 조정 (rewrite_rules.GRADER_RULES, 한 번 훑어서 치환)
+        prompt = GRADER_REWRITER.apply(prompt)
         
         return prompt
 
-    def generate_optimized_prompt(self, intent, difficulty):
-        """검수 기준 최적화된 프롬프트 생성"""
-        
-        # 템플릿 선택 간소화
+    def get_templates(self, intent, difficulty):
+        """의도/난이도에 맞는 템플릿 목록"""
         if intent == "정보":
             if difficulty == "쉬움":
-                templates = self.info_easy_templates
+                return self.info_easy_templates
             elif difficulty == "보통":
-                templates = self.info_medium_templates
+                return self.info_medium_templates
             else:  # 어려움
-                templates = self.info_hard_templates
+                return self.info_hard_templates
         elif intent == "탐색":
             if difficulty == "쉬움":
-                templates = self.explore_easy_templates
+                return self.explore_easy_templates
             elif difficulty == "보통":
-                templates = self.explore_medium_templates
+                return self.explore_medium_templates
             else:  # 어려움
-                templates = self.explore_hard_templates
+                return self.explore_hard_templates
         else:  # 거래
             if difficulty == "쉬움":
-                templates = self.deal_easy_templates
+                return self.deal_easy_templates
             elif difficulty == "보통":
-                templates = self.deal_medium_templates
+                return self.deal_medium_templates
             else:  # 어려움
-                templates = self.deal_hard_templates
-        
-        if not templates:
+                return self.deal_hard_templates
+
+    def keyword_pools(self):
+        """자리표시자별 키워드 풀"""
+        return {
+            'area': self.practice_areas,
+            'region': self.region_keywords,
+            'usp': self.usp_keywords,
+            'law': self.law_keywords,
+            'context': self.context_keywords,
+            'link': self.link_keywords,
+            'modern': self.modern_law_keywords,
+            'metric': ["전문성"],  # 기본 메트릭
+        }
+
+    def get_template_space(self, intent, difficulty):
+        """의도/난이도별 전체 조합 공간 (처음 요청할 때 한 번 만들고 재사용)"""
+        key = (intent, difficulty)
+        if key not in self.template_spaces:
+            templates = self.get_templates(intent, difficulty)
+            if not templates:
+                return None
+            self.template_spaces[key] = TemplateSpace(templates, self.keyword_pools())
+        return self.template_spaces[key]
+
+    def generate_optimized_prompt(self, intent, difficulty):
+        """검수 기준 최적화된 프롬프트 생성 (조합 공간에서 중복 없이 추출 - 재시도 없음)"""
+        space = self.get_template_space(intent, difficulty)
+        if space is None:
             print(f"⚠️ 템플릿을 찾을 수 없음: {intent}-{difficulty}")
             return None
         
-        max_attempts = 10  # 시도 횟수 줄임
-        attempts = 0
-        
-        while attempts < max_attempts:
-            attempts += 1
+        # 꺼낸 조합은 다시 나오지 않으므로, 기존 파일/지문 DB 에 이미 있는 것만 건너뜀
+        for prompt in space:
+            # 간단한 정리만
+            prompt = self.ensure_grader_compliance(prompt)
             
-            try:
-                # 랜덤 템플릿 선택
-                template = random.choice(templates)
-                
-                # 키워드 치환
-                prompt = template.format(
-                    area=random.choice(self.practice_areas),
-                    region=random.choice(self.region_keywords),
-                    usp=random.choice(self.usp_keywords),
-                    law=random.choice(self.law_keywords),
-                    context=random.choice(self.context_keywords),
-                    link=random.choice(self.link_keywords),
-                    modern=random.choice(self.modern_law_keywords),
-                    metric="전문성"  # 기본 메트릭
-                )
-                
-                # 간단한 정리만
-                prompt = self.ensure_grader_compliance(prompt)
-                
-                # 중복 체크 완화 (해시만 체크)
-                prompt_hash = self.get_prompt_hash(prompt)
-                if prompt_hash not in self.existing_hashes:
-                    self.existing_hashes.add(prompt_hash)
-                    return prompt
-                
-            except Exception as e:
-                print(f"  템플릿 처리 오류: {e}")
+            # 중복 체크 완화 (해시만 체크)
+            prompt_hash = self.get_prompt_hash(prompt)
+            if self.fingerprint_store is not None and self.fingerprint_store.contains(prompt_hash):
                 continue
+            if prompt_hash not in self.existing_hashes:
+                self.existing_hashes.add(prompt_hash)
+                if self.fingerprint_store is not None:
+                    self.fingerprint_store.stage(prompt_hash, prompt, source=type(self).__name__)
+                return prompt
         
-        print(f"⚠️ {intent}-{difficulty} 생성 실패 (시도: {max_attempts})")
+        print(f"⚠️ {intent}-{difficulty} 조합 공간 소진 (전체 {space.size:,}개)")
         return None
 
+    def report_template_spaces(self, target_counts):
+        """생성 전에 카테고리별 조합 공간과 목표 개수 비교 → 부족한 카테고리 목록"""
+        short = []
+        print("🧮 조합 공간:")
+        for (intent, difficulty), count in target_counts.items():
+            space = self.get_template_space(intent, difficulty)
+            available = space.remaining if space is not None else 0
+            mark = "✅" if count <= available else "⚠️"
+            print(f"  {mark} {intent}-{difficulty}: 목표 {count}개 / 남은 조합 {available:,}개")
+            if count > available:
+                short.append((intent, difficulty))
+        
+        if short:
+            print("⚠️ 목표가 조합 공간보다 큰 카테고리는 가능한 만큼만 생성됩니다 "
+                  "(키워드/템플릿을 늘리면 공간이 커집니다)")
+        return short
+
     def calculate_expected_score(self, prompt, intent, difficulty):
-        """예상 검수 점수 계산"""
-        score = 0.0
-        
-        # 1. Label Match (0.25 점)
-        score += 0.25  # 라벨은 정확히 매칭되도록 생성
-        
-        # 2. Length Range (0.15 점)
-        word_count = self.count_word_segments(prompt)
-        if 5 <= word_count <= 30:
-            score += 0.15
-        
-        # 3. Info Density (0.10 점)
-        unique_words = len(set(prompt.split()))
-        if unique_words >= 8:
-            score += 0.10
-        
-        # 4. Brand Realism (0.45 점)
-        brand_score = 0
-        
-        # ServiceHit
-        if any(area in prompt for area in self.practice_areas):
-            brand_score += 1
-        
-        # RegionHit  
-        if any(region in prompt for region in self.region_keywords):
-            brand_score += 1
-            
-        # USPHit
-        if any(usp in prompt for usp in self.usp_keywords):
-            brand_score += 1
-            
-        # LawHit
-        if any(law in prompt for law in self.law_keywords):
-            brand_score += 1
-        
-        score += min(1, brand_score) * 0.45
-        
-        # 5. Context Sens (0.10 점)
-        if any(context in prompt for context in self.context_keywords):
-            score += 0.10
-        
-        # 6. Link Presence (0.05 점)
-        if any(link in prompt for link in self.link_keywords):
-            score += 0.05
-        
-        return min(1.0, score)
+        """예상 검수 점수 계산 (D-FINAL v2 로컬 검수기 기준)"""
+        result = self.local_scorer.score(prompt, intent, difficulty, check_duplicate=False)
+        return result['score']
 
     def generate_high_quality_batch(self, target_counts):
         """고품질 배치 생성 (간소화)"""
@@ -354,6 +335,7 @@ class DongraeGraderOptimizedGenerator:
         total_target = sum(target_counts.values())
         
         print(f"🎯 목표: {total_target}개 프롬프트 생성")
+        self.report_template_spaces(target_counts)
         print("🔍 생성 중...")
         
         for (intent, difficulty), count in target_counts.items():
@@ -384,7 +366,9 @@ class DongraeGraderOptimizedGenerator:
                     if (i + 1) % 5 == 0:
                         print(f"  진행: {len(category_results)}/{count}")
                 else:
-                    print(f"  {i+1}번째 생성 실패")
+                    # 조합 공간을 다 쓴 경우뿐이므로 더 시도하지 않음
+                    print(f"  {i+1}번째부터 생성 불가 - 남은 조합 없음")
+                    break
             
             results.extend(category_results)
             print(f"✅ {intent}-{difficulty}: {len(category_results)}/{count}개 완료")
@@ -403,6 +387,7 @@ class DongraeGraderOptimizedGenerator:
             '어절수', '예상점수', '키워드_포함'
         ]
         
+        rows = []
         with open(filename, 'w', newline='', encoding='utf-8-sig') as file:
             writer = csv.DictWriter(file, fieldnames=fieldnames)
             writer.writeheader()
@@ -425,7 +410,7 @@ class DongraeGraderOptimizedGenerator:
                 if any(link in prompt for link in self.link_keywords):
                     keywords_found.append('링크')
                 
-                writer.writerow({
+                row = {
                     '번호': i,
                     '질문': result['prompt'],
                     '의도': result['intent'],
@@ -435,7 +420,16 @@ class DongraeGraderOptimizedGenerator:
                     '어절수': result['word_count'],
                     '예상점수': f"{result['expected_score']:.3f}",
                     '키워드_포함': ', '.join(keywords_found) if keywords_found else '기본'
-                })
+                }
+                writer.writerow(row)
+                rows.append(row)
+        
+        # 같은 내용을 컬럼형(Parquet)으로도 저장 (의도/난이도 등은 사전 인코딩)
+        write_parquet(rows, parquet_path(filename), stage="optimized")
+        
+        # 파일을 다 쓴 뒤에야 지문을 공유 저장소에 기록 (중간에 멈춘 실행은 남기지 않음)
+        if self.fingerprint_store is not None:
+            self.fingerprint_store.flush()
         
         print(f"💾 파일 저장 완료: {filename}")
         return filename
@@ -497,7 +491,7 @@ def main():
     print(f"\n🎯 총 목표: {total_target}개")
     
     # 생성기 초기화
-    generator = DongraeGraderOptimizedGenerator(existing_file)
+    generator = DongraeGraderOptimizedGenerator(existing_file, fingerprint_db=DEFAULT_FINGERPRINT_DB)
     
     # 고품질 프롬프트 생성
     results = generator.generate_high_quality_batch(target_counts)
@@ -568,6 +562,10 @@ def main():
             print(f"  샘플: {test_template}")
         else:
             print(f"  템플릿 테스트: 실패")
+    
+    # 지문 저장소 연결 닫기
+    if generator.fingerprint_store is not None:
+        generator.fingerprint_store.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
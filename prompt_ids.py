@@ -0,0 +1,73 @@
+import os
+import secrets
+import threading
+import time
+
+# Crockford Base32 (ULID 와 같은 문자표 - 사전순 정렬 = 숫자 순서)
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# 두 글자(10비트)씩 한 번에 변환하는 표
+PAIRS = [a + b for a in ALPHABET for b in ALPHABET]
+
+TIME_CHARS = 10      # 밀리초 타임스탬프 48비트 (10글자 = 50비트)
+NODE_CHARS = 6       # 프로세스별 무작위 노드 30비트
+COUNTER_CHARS = 10   # 프로세스 내 증가 카운터 50비트
+NODE_BITS = NODE_CHARS * 5
+COUNTER_MASK = (1 << (COUNTER_CHARS * 5)) - 1
+
+
+def encode_base32(value: int, length: int) -> str:
+    """정수 → 고정 길이 Crockford Base32 (length 는 짝수)"""
+    chunks = []
+    for _ in range(length // 2):
+        chunks.append(PAIRS[value & 0x3FF])
+        value >>= 10
+    return ''.join(reversed(chunks))
+
+
+def decode_time(prompt_id: str) -> float:
+    """ID 에 들어 있는 생성 시각 (epoch 초)"""
+    body = prompt_id.rsplit('_', 1)[-1]
+    millis = 0
+    for char in body[:TIME_CHARS]:
+        millis = millis * 32 + ALPHABET.index(char)
+    return millis / 1000.0
+
+
+class PromptIdGenerator:
+    """시간순으로 정렬되는 충돌 없는 프롬프트 ID (ULID / snowflake 방식)
+
+    ID = 접두사_ + 밀리초 시각(10) + 노드(6) + 카운터(10), 26글자 Crockford Base32.
+    노드는 프로세스마다 무작위로 정하고 (fork 되면 새로 뽑음), 카운터는 프로세스 안에서
+    계속 증가하므로 같은 밀리초에 여러 프로세스가 수천 개를 만들어도 겹치지 않는다.
+    시계가 뒤로 가면 마지막 시각을 유지해 같은 프로세스의 ID 는 항상 증가한다.
+    """
+
+    def __init__(self, prefix: str = "iovu"):
+        self.prefix = f"{prefix}_" if prefix else ""
+        self.lock = threading.Lock()
+        self.pid = None
+        self.last_millis = -1
+        self.head = ""
+
+    def reset_node(self):
+        """새 프로세스용 노드/카운터 (카운터 시작값도 무작위 - 재시작 후에도 겹치지 않게)"""
+        self.pid = os.getpid()
+        self.node = encode_base32(secrets.randbits(NODE_BITS), NODE_CHARS)
+        self.counter = secrets.randbits(COUNTER_CHARS * 5 - 10)
+        self.last_millis = -1
+
+    def next_id(self) -> str:
+        with self.lock:
+            if self.pid != os.getpid():
+                self.reset_node()
+
+            millis = time.time_ns() // 1000000
+            if millis > self.last_millis:
+                self.last_millis = millis
+                # 시각 + 노드 부분은 밀리초가 바뀔 때만 다시 만듦
+                self.head = self.prefix + encode_base32(millis, TIME_CHARS) + self.node
+
+            self.counter = (self.counter + 1) & COUNTER_MASK
+            return self.head + encode_base32(self.counter, COUNTER_CHARS)
+
+    __call__ = next_id
@@ -0,0 +1,154 @@
+from typing import Dict, Iterator, Optional, Tuple
+
+from fanout_writer import DEFAULT_BUFFER_SIZE, JsonlSink, iter_jsonl
+from template_space import CompiledTemplate
+
+HEADER_KEY = "_dictionary"
+FORMAT_VERSION = 1
+# 레코드에만 있는 키 (렌더링 결과에는 풀어서 들어감)
+RECORD_KEYS = ("template_id", "final_parameters", "extracted")
+# 렌더링 결과에만 있는 키 (레코드로 바꿀 때 버림 - 공유 사전에서 다시 만들 수 있음)
+RENDERED_KEYS = ("prompt", "extracted_keywords", "template_used", "brand_info")
+
+
+class PromptRecordRenderer:
+    """정규화 레코드 ↔ 완성 프롬프트 dict (파일마다 한 번 저장하는 공유 사전 기준)
+
+    레코드는 질의, 템플릿 id, 파라미터 값, 질의에서 추출된 파라미터 이름만 담는다.
+    브랜드 정보/응답 가이드라인/질의 템플릿은 공유 사전(dictionary)에 한 번만 두고
+    필요할 때 렌더링하므로, 렌더링 결과는 원래 생성 결과와 글자 하나까지 같다.
+
+    dictionary 키:
+      brand_info       결과 dict 에 붙는 브랜드 정보
+      brand_slots      프롬프트 틀의 브랜드 자리 {슬롯: 문자열}
+      prompt_template  시스템 프롬프트 틀 (단순 {슬롯} 형식)
+      prompt_slots     {슬롯: [파라미터 이름, 기본값]}
+      templates        {템플릿 id: 질의 템플릿}
+      param_defaults   질의 템플릿에서 params 에 없는 자리의 기본값
+      extracted_fields 추출 키워드 dict 의 키 순서
+      param_fields     (선택) 파일에 파라미터를 값 목록으로 저장할 때의 키 순서
+    """
+
+    def __init__(self, dictionary: Dict):
+        self.dictionary = dictionary
+        self.brand_info = dictionary["brand_info"]
+        self.brand_slots = dictionary["brand_slots"]
+        self.prompt_slots = dictionary["prompt_slots"]
+        self.param_defaults = dictionary["param_defaults"]
+        self.extracted_fields = dictionary["extracted_fields"]
+        self.param_fields = dictionary.get("param_fields")
+        self.prompt_template = CompiledTemplate.compile(dictionary["prompt_template"])
+        self.templates = {template_id: CompiledTemplate.compile(template)
+                          for template_id, template in dictionary["templates"].items()}
+        # 렌더링 없이 프롬프트 길이를 구하기 위한 고정 부분 길이
+        self.fixed_length = sum(len(part) for part in self.prompt_template.parts[0::2])
+
+    def prompt_values(self, record: Dict) -> Dict[str, str]:
+        params = record["final_parameters"]
+        values = dict(self.brand_slots)
+        values["user_query"] = record["query"]
+        for slot, (name, default) in self.prompt_slots.items():
+            values[slot] = params.get(name, default)
+        return values
+
+    def render_prompt(self, record: Dict) -> str:
+        return self.prompt_template.fill(self.prompt_values(record))
+
+    def prompt_length(self, record: Dict) -> int:
+        """렌더링한 프롬프트의 글자 수 (실제로 렌더링하지 않음)"""
+        values = self.prompt_values(record)
+        return self.fixed_length + sum(len(values[slot]) for slot in self.prompt_template.slots)
+
+    def render_template(self, record: Dict) -> str:
+        template = self.templates[record["template_id"]]
+        params = record["final_parameters"]
+        return template.fill({name: params.get(name, self.param_defaults.get(name)) for name in template.fields})
+
+    def extracted_keywords(self, record: Dict) -> Dict:
+        params = record["final_parameters"]
+        extracted = set(record["extracted"])
+        return {name: params[name] if name in extracted else None for name in self.extracted_fields}
+
+    def render(self, record: Dict) -> Dict:
+        """레코드 → generate_dongrae_prompt 와 같은 결과 dict (레코드의 나머지 키는 뒤에 붙임)"""
+        result = {
+            "prompt": self.render_prompt(record),
+            "extracted_keywords": self.extracted_keywords(record),
+            "final_parameters": record["final_parameters"],
+            "template_used": self.render_template(record),
+            "template_id": record["template_id"],
+            "brand_info": self.brand_info,
+        }
+        for key, value in record.items():
+            if key not in RECORD_KEYS:
+                result[key] = value
+        return result
+
+    @staticmethod
+    def normalize(result: Dict) -> Dict:
+        """렌더링 결과 dict → 정규화 레코드 (이미 레코드면 그대로)
+
+        추출 키워드는 값이 있는 것만 최종 파라미터를 덮어쓰므로 이름 목록만 남긴다.
+        """
+        if "prompt" not in result:
+            return result
+        record = {
+            "template_id": result["template_id"],
+            "final_parameters": result["final_parameters"],
+            "extracted": [name for name, value in result["extracted_keywords"].items() if value],
+        }
+        for key, value in result.items():
+            if key not in RENDERED_KEYS and key not in record:
+                record[key] = value
+        return record
+
+    def pack(self, record: Dict) -> Dict:
+        """파일 저장용 - 파라미터 키 순서가 param_fields 와 같으면 값 목록으로 줄임"""
+        params = record["final_parameters"]
+        if not self.param_fields or list(params) != self.param_fields:
+            return record
+        packed = dict(record)
+        packed["final_parameters"] = list(params.values())
+        return packed
+
+    def unpack(self, record: Dict) -> Dict:
+        """pack 의 반대 - 값 목록을 다시 {키: 값} 으로"""
+        params = record["final_parameters"]
+        if isinstance(params, list):
+            record["final_parameters"] = dict(zip(self.param_fields, params))
+        return record
+
+
+class PromptRecordSink(JsonlSink):
+    """정규화 레코드 JSONL - 첫 줄에 공유 사전을 한 번 쓰고, 이후 한 줄에 레코드 하나
+
+    FanoutWriter 의 sink 로 쓸 수 있고, 렌더링 결과 dict 를 넘겨도 레코드로 바꿔 저장한다.
+    """
+
+    def __init__(self, path: str, renderer: PromptRecordRenderer, compression: Optional[str] = None,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, level: Optional[int] = None):
+        super().__init__(path, compression, buffer_size, level)
+        self.renderer = renderer
+        self.out.write(self.encode({HEADER_KEY: renderer.dictionary, "format": FORMAT_VERSION}) + "\n")
+
+    def write(self, index: int, record: Dict):
+        super().write(index, self.renderer.pack(PromptRecordRenderer.normalize(record)))
+
+
+def open_prompt_records(path: str) -> Tuple[PromptRecordRenderer, Iterator[Dict]]:
+    """정규화 레코드 파일 → (파일의 공유 사전으로 만든 렌더러, 레코드 이터레이터)"""
+    records = iter_jsonl(path)
+    header = next(records, None)
+    if not header or HEADER_KEY not in header:
+        raise ValueError(f"정규화 레코드 파일이 아닙니다 (첫 줄에 {HEADER_KEY} 없음): {path}")
+    if header.get("format", FORMAT_VERSION) > FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 레코드 형식 버전: {header['format']} ({path})")
+    renderer = PromptRecordRenderer(header[HEADER_KEY])
+    return renderer, (renderer.unpack(record) for record in records)
+
+
+def iter_rendered_prompts(path: str) -> Iterator[Dict]:
+    """정규화 레코드 파일을 읽으면서 하나씩 완성 프롬프트 dict 로 렌더링"""
+    renderer, records = open_prompt_records(path)
+    for record in records:
+        yield renderer.render(record)
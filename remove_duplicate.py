@@ -1,12 +1,36 @@
+import csv
+import heapq
+import math
+import os
+import shutil
+import sys
+import tempfile
 import pandas as pd
+import pyarrow.parquet as pq
 from datetime import datetime
+from columnar_store import csv_to_parquet, infer_stage, read_table, write_parquet, parquet_path
+
+STREAM_CHUNK_ROWS = 50000                   # 한 번에 읽을 행 수
+STREAM_PARTITION_BYTES = 64 * 1024 * 1024   # 파티션 하나가 메모리에 올라갈 대략적인 크기
+SEQ_COLUMN = '__seq'                        # 원본 순서 보존용 임시 컬럼
+
+
+def print_duplicate_report(duplicate_counts, limit=10):
+    """중복된 질문 목록 출력 (duplicate_counts: 처음 등장한 순서의 질문 → 등장 횟수)"""
+    print(f"\n📋 중복된 질문 목록 (처음 {limit}개):")
+    
+    for question, count in list(duplicate_counts.items())[:limit]:
+        print(f"  - {count}번 중복: '{question[:70]}{'...' if len(question) > 70 else ''}'")
+    
+    if len(duplicate_counts) > limit:
+        print(f"  ... 그 외 {len(duplicate_counts) - limit}개 더 있음")
 
 def remove_duplicate_questions(input_file, output_file=None):
-    """CSV 파일에서 중복된 질문을 제거하는 함수"""
+    """CSV / Parquet 파일에서 중복된 질문을 제거하는 함수"""
     
     # 파일 읽기
     print(f"📂 파일 읽는 중: {input_file}")
-    df = pd.read_csv(input_file, encoding='utf-8')
+    df = read_table(input_file)
     
     # 원본 정보
     original_count = len(df)
@@ -23,19 +47,10 @@ def remove_duplicate_questions(input_file, output_file=None):
     print(f"  - 고유한 질문 개수: {unique_count}")
     print(f"  - 중복된 질문 개수: {duplicate_count}")
     
-    # 중복된 질문들 출력 (처음 10개만)
+    # 중복된 질문들 출력 (처음 10개만) - groupby 한 번으로 질문별 등장 횟수 계산
     if duplicate_count > 0:
-        duplicated = df[df['질문'].duplicated(keep=False)]
-        print(f"\n📋 중복된 질문 목록 (처음 10개):")
-        
-        duplicate_questions = []
-        for question in duplicated['질문'].unique()[:10]:
-            count = (df['질문'] == question).sum()
-            duplicate_questions.append((question, count))
-            print(f"  - {count}번 중복: '{question[:70]}{'...' if len(question) > 70 else ''}'")
-        
-        if len(duplicated['질문'].unique()) > 10:
-            print(f"  ... 그 외 {len(duplicated['질문'].unique()) - 10}개 더 있음")
+        question_counts = df.groupby('질문', sort=False).size()
+        print_duplicate_report(question_counts[question_counts > 1])
     
     # 중복 제거 (첫 번째 항목만 유지)
     print(f"\n🧹 중복 제거 중...")
@@ -55,7 +70,9 @@ def remove_duplicate_questions(input_file, output_file=None):
     
     # 정리된 파일 저장
     df_clean.to_csv(output_file, index=False, encoding='utf-8')
-    print(f"\n💾 중복 제거된 파일이 '{output_file}'로 저장되었습니다.")
+    # 입력 컬럼으로 단계를 정함 (생성기 출력에 검수 단계 컬럼이 null 로 붙지 않도록)
+    write_parquet(df_clean, parquet_path(output_file), stage=infer_stage(df_clean.columns))
+    print(f"\n💾 중복 제거된 파일이 '{output_file}'로 저장되었습니다. (+ {parquet_path(output_file)})")
     
     # 통계 요약
     print(f"\n📈 최종 결과 요약:")
@@ -64,8 +81,184 @@ def remove_duplicate_questions(input_file, output_file=None):
     
     return df_clean, removed_count
 
+def iter_input_chunks(input_files, chunksize=STREAM_CHUNK_ROWS):
+    """여러 CSV / Parquet 파일을 (파일명, 문자열 DataFrame 청크) 로 순서대로 읽기"""
+    for input_file in input_files:
+        if input_file.endswith('.parquet'):
+            for batch in pq.ParquetFile(input_file).iter_batches(batch_size=chunksize):
+                chunk = batch.to_pandas()
+                yield input_file, chunk.astype(object).where(chunk.notna(), '').astype(str)
+        else:
+            # 모든 값을 문자열 그대로 읽어 숫자 형식이 바뀌지 않도록 함
+            for chunk in pd.read_csv(input_file, encoding='utf-8-sig', dtype=str,
+                                     keep_default_na=False, chunksize=chunksize):
+                yield input_file, chunk
+
+
+def read_input_columns(input_file):
+    """입력 파일의 컬럼명 (데이터는 읽지 않음)"""
+    if input_file.endswith('.parquet'):
+        return list(pq.ParquetFile(input_file).schema_arrow.names)
+    return list(pd.read_csv(input_file, encoding='utf-8-sig', dtype=str, nrows=0).columns)
+
+
+def union_input_columns(input_files):
+    """모든 입력 파일의 컬럼 합집합 (처음 나온 순서) - 파일마다 없는 컬럼은 빈 값으로 채워짐"""
+    file_columns = {input_file: read_input_columns(input_file) for input_file in input_files}
+    
+    missing_question = [f for f, names in file_columns.items() if '질문' not in names]
+    if missing_question:
+        raise ValueError(f"'질문' 컬럼이 없는 파일: {', '.join(missing_question)}")
+    
+    columns = []
+    for names in file_columns.values():
+        columns.extend(name for name in names if name not in columns)
+    
+    for input_file, names in file_columns.items():
+        missing = [name for name in columns if name not in names]
+        if missing:
+            print(f"  ⚠️ {input_file}: 없는 컬럼 {missing} 은 빈 값으로 채웁니다")
+    return columns
+
+
+def remove_duplicate_questions_stream(input_files, output_file=None, chunksize=STREAM_CHUNK_ROWS,
+                                      partitions=None, work_dir=None):
+    """대용량 / 여러 파일용 중복 제거 (해시 파티션 기반, 메모리 사용량 제한)
+
+    1) 입력을 청크 단위로 읽어 질문 해시로 파티션 파일에 나눠 기록하고
+    2) 파티션마다 groupby 한 번으로 중복 횟수를 세고 첫 번째 항목만 남긴 뒤
+    3) 원래 행 순서대로 병합해 CSV 로 저장하고, 같은 내용의 Parquet 도 청크 단위로 만든다.
+    같은 질문은 항상 같은 파티션에 들어가므로 결과는 remove_duplicate_questions 와 같다.
+    파일마다 컬럼이 다르면 전체 컬럼 합집합으로 맞춘다 (없는 컬럼은 빈 값).
+    """
+    if isinstance(input_files, str):
+        input_files = [input_files]
+    
+    missing = [f for f in input_files if not os.path.exists(f)]
+    if missing:
+        raise FileNotFoundError(missing[0])
+    
+    if partitions is None:
+        total_bytes = sum(os.path.getsize(f) for f in input_files)
+        partitions = max(1, math.ceil(total_bytes / STREAM_PARTITION_BYTES))
+    
+    print(f"📂 스트리밍 중복 제거 시작: {len(input_files)}개 파일, 파티션 {partitions}개")
+    
+    temp_dir = tempfile.mkdtemp(prefix="dedup_", dir=work_dir)
+    try:
+        # 1단계: 해시 파티셔닝 (모든 파일의 헤더를 먼저 읽어 컬럼을 합집합으로 고정)
+        columns = union_input_columns(input_files)
+        print(f"  - 컬럼명: {columns}")
+        original_count = 0
+        file_counts = {}
+        partition_paths = [os.path.join(temp_dir, f"part_{p:04d}.csv") for p in range(partitions)]
+        partition_started = [False] * partitions
+        
+        for input_file, chunk in iter_input_chunks(input_files, chunksize):
+            chunk = chunk.reindex(columns=columns, fill_value='')
+            chunk.insert(0, SEQ_COLUMN, range(original_count, original_count + len(chunk)))
+            
+            original_count += len(chunk)
+            file_counts[input_file] = file_counts.get(input_file, 0) + len(chunk)
+            
+            hashes = pd.util.hash_pandas_object(chunk['질문'], index=False).to_numpy()
+            for p, part in chunk.groupby(hashes % partitions, sort=False):
+                part.to_csv(partition_paths[p], mode='a', index=False, header=not partition_started[p], encoding='utf-8')
+                partition_started[p] = True
+            
+            print(f"  진행: {original_count:,}행 분배 완료")
+        
+        if original_count == 0:
+            print("❌ 입력 데이터가 없습니다.")
+            return None, 0
+        
+        print(f"\n📊 원본 데이터 정보:")
+        for input_file, count in file_counts.items():
+            print(f"  - {input_file}: {count}행")
+        print(f"  - 총 행 수: {original_count}")
+        print(f"  - 총 컬럼 수: {len(columns)}")
+        
+        # 2단계: 파티션별 중복 집계 + 첫 번째 항목만 유지
+        unique_count = 0
+        duplicate_parts = []
+        kept_paths = []
+        
+        for p in range(partitions):
+            if not partition_started[p]:
+                continue
+            part = pd.read_csv(partition_paths[p], dtype=str, keep_default_na=False, encoding='utf-8')
+            part[SEQ_COLUMN] = part[SEQ_COLUMN].astype('int64')
+            
+            stats = part.groupby('질문', sort=False)[SEQ_COLUMN].agg(['size', 'min'])
+            unique_count += len(stats)
+            duplicate_parts.append(stats[stats['size'] > 1])
+            
+            kept = part.drop_duplicates(subset=['질문'], keep='first')
+            kept_path = os.path.join(temp_dir, f"kept_{p:04d}.csv")
+            kept.to_csv(kept_path, index=False, header=False, encoding='utf-8')
+            kept_paths.append(kept_path)
+            os.remove(partition_paths[p])
+        
+        duplicate_count = original_count - unique_count
+        print(f"\n🔍 중복 분석:")
+        print(f"  - 고유한 질문 개수: {unique_count}")
+        print(f"  - 중복된 질문 개수: {duplicate_count}")
+        
+        if duplicate_count > 0:
+            duplicates = pd.concat(duplicate_parts).sort_values('min')
+            print_duplicate_report(duplicates['size'])
+        
+        # 3단계: 원래 순서대로 병합 저장
+        if output_file is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = f"remove_deduplicated_{timestamp}_stream.csv"
+        
+        print(f"\n🧹 중복 제거 결과 병합 중...")
+        final_count = 0
+        kept_files = [open(path, 'r', encoding='utf-8', newline='') for path in kept_paths]
+        try:
+            readers = [csv.reader(f) for f in kept_files]
+            with open(output_file, 'w', encoding='utf-8', newline='') as out:
+                writer = csv.writer(out)
+                writer.writerow(columns)
+                for row in heapq.merge(*readers, key=lambda r: int(r[0])):
+                    writer.writerow(row[1:])
+                    final_count += 1
+        finally:
+            for f in kept_files:
+                f.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    removed_count = original_count - final_count
+    print(f"\n✅ 중복 제거 완료:")
+    print(f"  - 남은 행 수: {final_count}")
+    print(f"  - 제거된 행 수: {removed_count}")
+    print(f"  - 제거율: {removed_count/original_count*100:.1f}%")
+    
+    # remove_duplicate_questions 와 같은 Parquet 사본 (출력 CSV 를 청크 단위로 변환)
+    csv_to_parquet(output_file, parquet_path(output_file), stage=infer_stage(columns), chunksize=chunksize)
+    print(f"\n💾 중복 제거된 파일이 '{output_file}'로 저장되었습니다. (+ {parquet_path(output_file)})")
+    
+    print(f"\n📈 최종 결과 요약:")
+    print(f"  원본: {original_count}개 → 정리 후: {final_count}개")
+    print(f"  중복 제거: {removed_count}개 ({removed_count/original_count*100:.1f}%)")
+    
+    return output_file, removed_count
+
 # 실행
 if __name__ == "__main__":
+    # 인자로 파일들을 주면 스트리밍 모드로 한꺼번에 중복 제거
+    if len(sys.argv) > 1:
+        try:
+            remove_duplicate_questions_stream(sys.argv[1:])
+        except FileNotFoundError as e:
+            print(f"❌ 파일을 찾을 수 없습니다: {e}")
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        sys.exit(0)
+    
     input_filename = "remove_deduplicated_20250704_160833_without_2.csv"
     
     try:
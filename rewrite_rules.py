@@ -0,0 +1,517 @@
+import argparse
+import contextlib
+import csv
+import functools
+import glob
+import inspect
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS = os.path.join(ROOT_DIR, "rewrite_corpus.jsonl")
+# 회귀 코퍼스 입력으로 쓰는 CSV 컬럼 (생성기 출력 / 검수 결과)
+CORPUS_COLUMNS = ("질문", "prompt", "query", "template_used")
+
+PAREN_RE = re.compile(r'\([^)]*\)')
+
+
+class RewriteRule:
+    """문자열 치환 규칙 하나
+
+    count 가 0 이면 모두, 1 이상이면 앞에서부터 그 횟수만큼만 바꾼다.
+    unless_present 면 입력에 이미 replacement 가 있을 때 이 규칙을 건너뛴다.
+    """
+
+    def __init__(self, pattern: str, replacement: str, count: int = 0, unless_present: bool = False):
+        if not pattern:
+            raise ValueError("빈 패턴은 치환 규칙으로 쓸 수 없습니다")
+        self.pattern = pattern
+        self.replacement = replacement
+        self.count = count
+        self.unless_present = unless_present
+
+    def __repr__(self):
+        return f"RewriteRule({self.pattern!r} → {self.replacement!r})"
+
+
+def rules_from_pairs(pairs, count: int = 0, unless_present: bool = False) -> List[RewriteRule]:
+    """[(패턴, 치환)] 또는 {패턴: 치환} → 규칙 목록"""
+    items = pairs.items() if isinstance(pairs, dict) else pairs
+    return [RewriteRule(pattern, replacement, count, unless_present) for pattern, replacement in items]
+
+
+def trie_regex(keys: Iterable[str]) -> str:
+    """문자열 목록 → 접두사를 공유하는 트라이 모양 정규식 (탐욕적 선택 → 가장 긴 키가 이김)"""
+    trie = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if end:
+            return body + '?' if len(branches) == 1 and len(branches[0]) == 1 else '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class RewriteEngine:
+    """치환 규칙 표를 정규식 하나로 컴파일해 한 번의 스캔으로 적용
+
+    모든 패턴을 트라이 정규식으로 합쳐 왼쪽부터 한 번 훑으며, 같은 위치에서는 가장 긴
+    패턴을 고른다(longest match). 치환 결과는 다시 훑지 않으므로 규칙 순서와 상관없이
+    결과가 같다. 패턴 전체를 한 그룹으로 감싼 split 으로 [문장, 일치, ...] 를 얻어 일치
+    부분만 표에서 바꿔 끼우며, 횟수/조건이 있는 규칙은 일치했을 때만 확인한다.
+    apply_sequential 은 예전처럼 규칙 순서대로 str.replace 를 반복하는 기준 구현이다
+    (벤치마크 비교용, 회귀 코퍼스는 아래 reference_* 원래 함수로 만든다).
+    """
+
+    def __init__(self, rules: Sequence[RewriteRule], name: str = ""):
+        self.name = name
+        self.rules = list(rules)
+        self.by_pattern = {}
+        for rule in self.rules:
+            if rule.pattern in self.by_pattern:
+                raise ValueError(f"같은 패턴의 규칙이 두 번 있습니다: {rule.pattern}")
+            self.by_pattern[rule.pattern] = rule
+        # 패턴 전체를 그룹 하나로 감싸 split → [문장, 일치, 문장, 일치, ..., 문장]
+        self.split = re.compile('(' + trie_regex(self.by_pattern) + ')').split if self.rules else None
+        self.table = {rule.pattern: rule.replacement for rule in self.rules}
+        # 횟수/조건이 있는 규칙만 따로 (일치한 경우에만 확인)
+        self.limited = {rule.pattern: rule for rule in self.rules if rule.count or rule.unless_present}
+
+    def apply(self, text: str) -> str:
+        if self.split is None:
+            return text
+        parts = self.split(text)
+        if len(parts) == 1:
+            return text
+
+        table = self.table
+        if not self.limited:
+            parts[1::2] = [table[key] for key in parts[1::2]]
+            return ''.join(parts)
+
+        limited = self.limited
+        used = {}
+        for i in range(1, len(parts), 2):
+            key = parts[i]
+            rule = limited.get(key)
+            if rule is None:
+                parts[i] = table[key]
+                continue
+            # 조건은 입력 문장 기준 (이미 강화된 단어가 있으면 건너뜀)
+            if rule.unless_present and rule.replacement in text:
+                continue
+            if rule.count:
+                if used.get(key, 0) >= rule.count:
+                    continue
+                used[key] = used.get(key, 0) + 1
+            parts[i] = rule.replacement
+        return ''.join(parts)
+
+    __call__ = apply
+
+    def apply_sequential(self, text: str) -> str:
+        """기준 구현 - 규칙 순서대로 str.replace (앞 규칙의 결과를 뒤 규칙이 다시 바꿀 수 있음)"""
+        for rule in self.rules:
+            if rule.unless_present:
+                if rule.pattern not in text or rule.replacement in text:
+                    continue
+            text = text.replace(rule.pattern, rule.replacement, rule.count or -1)
+        return text
+
+    def apply_batch(self, texts: Iterable[str]) -> List[str]:
+        """여러 문장 - 같은 문장은 한 번만 변환"""
+        cache = {}
+        results = []
+        for text in texts:
+            result = cache.get(text)
+            if result is None:
+                result = cache[text] = self.apply(text)
+            results.append(result)
+        return results
+
+    def apply_series(self, series):
+        """pandas Series → 같은 인덱스의 Series (결측은 빈 문자열, 같은 문장은 한 번만 변환)"""
+        series = series.fillna("").astype(str)
+        return series.map({text: self.apply(text) for text in series.unique()})
+
+
+def clean_spacing(text: str) -> str:
+    """괄호와 그 안의 내용을 지우고 공백을 하나로 모은 뒤 앞뒤 공백 제거
+
+    re.sub(r'\\([^)]*\\)', '') → re.sub(r'\\s+', ' ') → strip() 과 같은 결과.
+    공백 정리는 str.split/join 한 번(정규식 \\s 와 같은 공백 기준)으로 끝내고,
+    괄호가 없는 문장은 괄호 정규식을 돌리지 않는다.
+    """
+    if '(' in text:
+        text = PAREN_RE.sub('', text)
+    return ' '.join(text.split())
+
+
+def clean_spacing_sequential(text: str) -> str:
+    """기준 구현 - 예전 clean_prompt 1~3단계"""
+    cleaned = re.sub(r'\([^)]*\)', '', text)
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+    return cleaned.strip()
+
+
+# ==================== 규칙 표 ====================
+# prompt9 ensure_grader_compliance - 번역체 제거 + "에 대한" 조정
+GRADER_RULES = rules_from_pairs([
+    ("입니다", "이에요"), ("습니다", "어요"), ("하였습니다", "했어요"),
+    ("되었습니다", "됐어요"), ("있습니다", "있어요"), ("~에 대해", "~관련"),
+    ("관하여", "관련해서"), ("대하여", "관련"), ("에 대한", "관련"),
+])
+
+# dongrae/prompt4 improve_prompt_naturalness - 번역투 개선 (모두) + 정보 밀도 강화 (이미 없을 때 첫 번째만)
+NATURALNESS_RULES = rules_from_pairs({
+    '를 알려줘요': '가 궁금해요',
+    '를 알려줘': '를 알려주세요',
+    '를 제공해주세요': '를 설명해주세요',
+    '기준으로': '바탕으로',
+    '관련해서': '에 대해',
+    '정리해주세요': '분석해주세요',
+    '설명해 주세요': '설명해주세요',
+    '비교해 주세요': '비교해주세요',
+}) + rules_from_pairs({
+    '부산': '부산지방법원 관할',
+    '변호사': '전문 변호사',
+    '로펌': '법무법인',
+    '비용': '비용 체계',
+    '상담': '전문 상담',
+}, count=1, unless_present=True)
+
+GRADER_REWRITER = RewriteEngine(GRADER_RULES, "grader")
+NATURALNESS_REWRITER = RewriteEngine(NATURALNESS_RULES, "naturalness")
+
+# 벤치마크 대상: 이름 → (새 구현, 기준 구현)
+REWRITERS = {
+    "grader": (GRADER_REWRITER.apply, GRADER_REWRITER.apply_sequential),
+    "naturalness": (NATURALNESS_REWRITER.apply, NATURALNESS_REWRITER.apply_sequential),
+    "clean": (clean_spacing, clean_spacing_sequential),
+}
+
+
+# ==================== 기준 구현 ====================
+# 치환 엔진 도입 전의 원래 함수 그대로 (회귀 코퍼스 기대 출력용 - 규칙 표를 쓰지 않고 따로 둠)
+
+def reference_ensure_grader_compliance(prompt: str) -> str:
+    """prompt9 DongraeGraderOptimizedGenerator.ensure_grader_compliance 원래 구현"""
+    word_count = len(prompt.split())
+    if word_count < 5:
+        prompt += " 상세한 설명과 배경 자세히 알려주세요"
+    elif word_count > 30:
+        prompt = ' '.join(prompt.split()[:28]) + " 알려주세요"
+
+    translations = [
+        ("입니다", "이에요"), ("습니다", "어요"), ("하였습니다", "했어요"),
+        ("되었습니다", "됐어요"), ("있습니다", "있어요"), ("~에 대해", "~관련"),
+        ("관하여", "관련해서"), ("대하여", "관련")
+    ]
+    for old, new in translations:
+        prompt = prompt.replace(old, new)
+
+    if "에 대한" in prompt:
+        prompt = prompt.replace("에 대한", "관련")
+    return prompt
+
+
+def reference_improve_prompt_naturalness(prompt: str) -> str:
+    """dongrae/prompt4 improve_prompt_naturalness 원래 구현"""
+    improvements = {
+        '를 알려줘요': '가 궁금해요',
+        '를 알려줘': '를 알려주세요',
+        '를 제공해주세요': '를 설명해주세요',
+        '기준으로': '바탕으로',
+        '관련해서': '에 대해',
+        '정리해주세요': '분석해주세요',
+        '설명해 주세요': '설명해주세요',
+        '비교해 주세요': '비교해주세요'
+    }
+    density_enhancers = {
+        '부산': '부산지방법원 관할',
+        '변호사': '전문 변호사',
+        '로펌': '법무법인',
+        '비용': '비용 체계',
+        '상담': '전문 상담'
+    }
+
+    improved = prompt
+    for old, new in improvements.items():
+        improved = improved.replace(old, new)
+    for old, new in density_enhancers.items():
+        if old in improved and new not in improved:
+            improved = improved.replace(old, new, 1)
+    return improved
+
+
+def reference_clean_prompt(prompt: str, question_markers=('궁금', '알려'), naturalness=False) -> str:
+    """clean_prompt / enhanced_clean_prompt 원래 구현
+
+    question_markers: 문장 끝을 '요' 로 맺을 단서 (iovu/prompt3 는 '어디서' 도 포함)
+    naturalness: enhanced_clean_prompt 처럼 공백 정리 뒤 improve_prompt_naturalness 적용
+    """
+    cleaned = re.sub(r'\([^)]*\)', '', prompt)
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+    cleaned = cleaned.strip()
+    if naturalness:
+        cleaned = reference_improve_prompt_naturalness(cleaned)
+
+    if not cleaned.endswith(('?', '.', '요', '다', '까')):
+        if '?' in prompt or any(marker in cleaned for marker in question_markers):
+            if not cleaned.endswith('요'):
+                cleaned += '요'
+        else:
+            if not cleaned.endswith('.'):
+                cleaned += '.'
+    return cleaned
+
+
+# 코퍼스 대상 함수: 이름 → (저장소 기준 파일, 함수/메서드 경로, 기준 구현)
+CORPUS_FUNCTIONS = {
+    "ensure_grader_compliance": ("prompt9.py", "DongraeGraderOptimizedGenerator.ensure_grader_compliance",
+                                 reference_ensure_grader_compliance),
+    "improve_prompt_naturalness": ("dongrae/prompt4.py", "improve_prompt_naturalness",
+                                   reference_improve_prompt_naturalness),
+    "enhanced_clean_prompt": ("dongrae/prompt4.py", "enhanced_clean_prompt",
+                              functools.partial(reference_clean_prompt, naturalness=True)),
+    "clean_prompt[dongrae/prompt4]": ("dongrae/prompt4.py", "DongrageLawIntegratedSystem.clean_prompt",
+                                      reference_clean_prompt),
+    "clean_prompt[dongrae/prompt3]": ("dongrae/prompt3.py", "DongrageLawIntegratedSystem.clean_prompt",
+                                      reference_clean_prompt),
+    "clean_prompt[iovu/prompt3]": ("iovu/prompt3.py", "IOVUAdvancedPromptGenerator.clean_prompt",
+                                   functools.partial(reference_clean_prompt,
+                                                     question_markers=('궁금', '알려', '어디서'))),
+}
+
+# 의도한 차이: 예전에는 짧은 '습니다' 규칙이 먼저 잡아 '하였어요/되었어요' 가 됐다
+INTENDED_FUNCTION = "ensure_grader_compliance"
+INTENDED_NOTE = "'하였습니다/되었습니다' → '했어요/됐어요' (기준: '하였어요/되었어요')"
+INTENDED_INPUTS = [
+    "검토하였습니다", "완료되었습니다", "계약을 해지하였습니다 어떻게 하나요",
+    "소송이 제기되었습니다 대응 방법이 궁금해요", "하였습니다되었습니다습니다",
+    "이미 합의하였습니다 그런데 위약금이 청구되었습니다 부산 변호사 상담 가능한가요",
+]
+
+
+def intended_output(baseline: str) -> str:
+    """기준 출력 → 의도한 차이만 반영한 출력"""
+    return baseline.replace("하였어요", "했어요").replace("되었어요", "됐어요")
+
+
+# 실제 데이터에 잘 안 나오는 경계 사례
+EDGE_CASES = [
+    "", " ", "  (괄호만)  ", "((중첩) 괄호) 남음", "(닫히지 않은 괄호 입니다", "줄\n바꿈\t탭  공백",
+    "부산 부산 부산 변호사 변호사", "부산지방법원 관할 부산 변호사", "전문 변호사 변호사 비용 비용 체계",
+    "로펌 비용을 알려줘요 를 알려줘 를 알려줘요", "설명해 주세요 비교해 주세요 정리해주세요",
+    "검토하였습니다 완료되었습니다 있습니다 입니다 습니다", "~에 대해 관하여 대하여 에 대한 ~에 대한",
+    "기준으로 관련해서 를 제공해주세요", "(부산) 변호사 (비용)  상담　전각 공백",
+]
+
+
+CORPUS_LIMIT = 300         # 코퍼스에 넣을 CSV 문장 수 (변형/경계 사례 별도)
+BENCHMARK_LIMIT = 3000     # 벤치마크에 쓸 CSV 문장 수
+PER_PATTERN = 5            # 규칙 패턴마다 먼저 골라 둘 문장 수
+
+
+def read_csv_texts(paths: Sequence[str]) -> List[str]:
+    """CSV 문장 컬럼 → 중복 없는 문장 목록 (정렬)"""
+    texts = set()
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                for row in csv.DictReader(f):
+                    for column in CORPUS_COLUMNS:
+                        if row.get(column):
+                            texts.add(row[column])
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            print(f"⚠️ 코퍼스 입력을 읽지 못했습니다 ({path}): {e}")
+    return sorted(texts)
+
+
+def load_corpus_inputs(paths: Sequence[str], limit: int = CORPUS_LIMIT, seed: int = 0) -> List[str]:
+    """CSV 문장 + 괄호/공백을 섞은 변형 + 경계 사례 → 중복 없는 입력 목록
+
+    규칙 패턴(과 괄호)마다 그 패턴이 들어간 문장을 PER_PATTERN 개씩 먼저 고르고,
+    나머지는 무작위로 채워 적은 입력으로도 모든 규칙이 코퍼스에 나오게 한다.
+    """
+    rng = random.Random(seed)
+    texts = read_csv_texts(paths)
+    chosen = set()
+    for pattern in [rule.pattern for rule in GRADER_RULES + NATURALNESS_RULES] + ['(']:
+        matching = [text for text in texts if pattern in text and text not in chosen]
+        chosen.update(rng.sample(matching, min(PER_PATTERN, len(matching))))
+    rest = [text for text in texts if text not in chosen]
+    chosen.update(rng.sample(rest, min(max(limit - len(chosen), 0), len(rest))))
+    inputs = sorted(chosen)
+
+    # clean 규칙용 - 어절 일부를 괄호로 감싸고 공백을 늘린 변형
+    variants = []
+    for text in inputs[: limit // 3]:
+        words = text.split()
+        for i in range(len(words)):
+            if rng.random() < 0.2:
+                words[i] = f"({words[i]})"
+        variants.append(rng.choice(["  ", " \n", "\t"]).join(words) + rng.choice(["", " ", "  "]))
+    return list(dict.fromkeys(inputs + variants + EDGE_CASES))
+
+
+def load_module_source(path: str) -> Dict:
+    """저장소 파일을 실행한 이름공간 (import 시 배너 출력은 숨김)"""
+    full_path = os.path.join(ROOT_DIR, path)
+    with open(full_path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    for directory in (ROOT_DIR, os.path.dirname(full_path)):
+        if directory not in sys.path:
+            sys.path.append(directory)
+
+    namespace = {"__name__": f"rewrite_corpus.{path}", "__file__": full_path}
+    with contextlib.redirect_stdout(io.StringIO()):
+        exec(compile(source, full_path, 'exec'), namespace)
+    return namespace
+
+
+def bind_function(namespace: Dict, qualname: str):
+    """이름공간에서 함수/메서드를 꺼냄
+
+    메서드는 __init__ 없이 만든 인스턴스에 묶고, 모듈 함수의 self 인자는 None 으로 채운다.
+    """
+    owner_name, _, function_name = qualname.rpartition('.')
+    if owner_name:
+        owner = namespace[owner_name]
+        return getattr(owner.__new__(owner), function_name)
+    function = namespace[function_name]
+    if next(iter(inspect.signature(function).parameters), None) == "self":
+        return functools.partial(function, None)
+    return function
+
+
+def load_corpus_functions() -> Dict:
+    """CORPUS_FUNCTIONS 전체 → {이름: 현재 함수} (같은 파일은 한 번만 실행)"""
+    modules = {}
+    functions = {}
+    for name, (path, qualname, _) in CORPUS_FUNCTIONS.items():
+        if path not in modules:
+            modules[path] = load_module_source(path)
+        functions[name] = bind_function(modules[path], qualname)
+    return functions
+
+
+def build_corpus(inputs: Sequence[str], path: str = DEFAULT_CORPUS) -> Dict[str, Tuple[int, int, int]]:
+    """입력마다 함수별 기대 출력(기준 구현 = 치환 엔진 도입 전 원래 함수 결과)을 JSONL 로 저장
+
+    현재 함수가 기준과 다르면서 의도한 차이(intended_output)와 정확히 같은 경우만
+    expected 를 현재 출력으로 두고 baseline/intended 를 함께 따로 표시한다.
+    그 밖의 차이는 expected 를 기준 출력으로 남겨 확인 단계에서 실패하게 한다.
+    → 함수별 (건수, 의도한 차이 건수, 예상 밖 차이 건수)
+    """
+    baseline = {name: reference for name, (_, _, reference) in CORPUS_FUNCTIONS.items()}
+    current = load_corpus_functions()
+    known = set(inputs)
+    stats = {}
+    with open(path, 'w', encoding='utf-8') as f:
+        for name in CORPUS_FUNCTIONS:
+            texts = list(inputs)
+            if name == INTENDED_FUNCTION:
+                texts += [text for text in INTENDED_INPUTS if text not in known]
+            intended = unexpected = 0
+            for text in texts:
+                expected = baseline[name](text)
+                actual = current[name](text)
+                case = {"function": name, "input": text, "expected": expected}
+                if actual != expected:
+                    if name == INTENDED_FUNCTION and actual == intended_output(expected):
+                        case = dict(case, expected=actual, baseline=expected, intended=INTENDED_NOTE)
+                        intended += 1
+                    else:
+                        unexpected += 1
+                f.write(json.dumps(case, ensure_ascii=False) + "\n")
+            stats[name] = (len(texts), intended, unexpected)
+    return stats
+
+
+def check_corpus(path: str = DEFAULT_CORPUS) -> Tuple[int, int, List[Dict]]:
+    """코퍼스의 모든 사례를 현재 함수로 다시 돌려 비교 → (사례 수, 의도한 차이 수, 실패 목록)"""
+    functions = load_corpus_functions()
+    total, intended, failures = 0, 0, []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            case = json.loads(line)
+            total += 1
+            intended += "intended" in case
+            actual = functions[case["function"]](case["input"])
+            if actual != case["expected"]:
+                failures.append(dict(case, actual=actual))
+    return total, intended, failures
+
+
+def benchmark(inputs: Sequence[str], repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    """규칙별 순차 구현 vs 컴파일 엔진 처리량 (문장/초)"""
+    timings = {}
+    print(f"📊 치환 엔진 벤치마크: 문장 {len(inputs):,}개 × {repeat}회")
+    for name, (apply, sequential) in REWRITERS.items():
+        # 두 구현을 번갈아 돌려 최솟값 - 한쪽만 시스템 잡음을 맞는 일을 줄임
+        best = {"sequential": float('inf'), "compiled": float('inf')}
+        for _ in range(repeat):
+            for label, function in (("sequential", sequential), ("compiled", apply)):
+                started = time.perf_counter()
+                for text in inputs:
+                    function(text)
+                best[label] = min(best[label], time.perf_counter() - started)
+        timings[name] = {label: len(inputs) / elapsed if elapsed else float('inf')
+                         for label, elapsed in best.items()}
+        speedup = timings[name]["compiled"] / timings[name]["sequential"]
+        print(f"  - {name:12s}: 순차 {timings[name]['sequential']:>12,.0f}개/초, "
+              f"컴파일 {timings[name]['compiled']:>12,.0f}개/초 ({speedup:.2f}배)")
+    return timings
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """회귀 코퍼스 확인 (기본) / 코퍼스 다시 만들기 / 처리량 벤치마크"""
+    parser = argparse.ArgumentParser(description="프롬프트 치환 규칙 회귀 코퍼스 확인 및 벤치마크")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--build", action="store_true", help="CSV 에서 입력을 모아 코퍼스를 다시 만듦")
+    parser.add_argument("--inputs", nargs="*", help="코퍼스 입력 CSV (기본: 저장소 최상위 *.csv)")
+    parser.add_argument("--limit", type=int, default=CORPUS_LIMIT, help="코퍼스에 넣을 CSV 문장 수")
+    parser.add_argument("--benchmark", action="store_true", help=f"CSV 문장 {BENCHMARK_LIMIT:,}개로 처리량 비교")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    paths = args.inputs or sorted(glob.glob(os.path.join(os.path.dirname(args.corpus) or ".", "*.csv")))
+    if args.build:
+        inputs = load_corpus_inputs(paths, args.limit)
+        for name, (count, intended, unexpected) in build_corpus(inputs, args.corpus).items():
+            print(f"{'✅' if not unexpected else '❌'} {name}: {count:,}건 기록 "
+                  f"(의도한 차이 {intended}건, 예상 밖 차이 {unexpected}건)")
+
+    total, intended, failures = check_corpus(args.corpus)
+    for case in failures[:10]:
+        print(f"❌ [{case['function']}] {case['input']!r}\n   기대: {case['expected']!r}\n   실제: {case['actual']!r}")
+    print(f"{'✅' if not failures else '❌'} 회귀 코퍼스 {total:,}건 중 불일치 {len(failures)}건 "
+          f"(기준 구현 대비 의도한 차이 {intended}건 별도 표시)")
+
+    if args.benchmark:
+        inputs = read_csv_texts(paths)
+        inputs = random.Random(0).sample(inputs, min(BENCHMARK_LIMIT, len(inputs))) + EDGE_CASES
+        benchmark(inputs, args.repeat)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import math
+
+from korean_tokenizer import token_set
+
+
+class PromptSimilarityIndex:
+    """프롬프트 유사도 인덱스 - 자카드 유사도 기반 중복 후보를 빠르게 조회
+
+    기존에는 새 프롬프트마다 저장된 모든 프롬프트와 calculate_similarity 를
+    돌렸기 때문에 후보 1개당 O(N) 비교가 필요했다.
+    여기서는 토큰 집합을 한 번만 만들어 두고 prefix filtering 역인덱스로
+    "자카드 유사도 > threshold 인 이웃이 있는가?" 를 후보 몇 개만 보고 판단한다.
+    판정 기준(토큰화, 임계값, 초과 비교)은 calculate_similarity 와 동일하다.
+    """
+
+    def __init__(self, threshold=0.8):
+        self.threshold = threshold
+        self.token_sets = []
+        self.postings = {}
+
+    def tokenize(self, prompt):
+        """calculate_similarity 와 같은 토큰 집합 (korean_tokenizer, 프로세스 내 캐시)"""
+        return token_set(prompt)
+
+    def prefix_length(self, size):
+        """자카드 >= threshold 를 만족하려면 반드시 공유해야 하는 prefix 길이"""
+        # 부동소수 오차로 prefix 가 짧아지지 않도록 보수적으로 계산
+        return size - math.ceil(self.threshold * size - 1e-9) + 1
+
+    def prefix_tokens(self, tokens):
+        """정렬된 토큰 중 prefix 부분만 반환"""
+        ordered = sorted(tokens)
+        return ordered[:self.prefix_length(len(ordered))]
+
+    def add(self, prompt):
+        """프롬프트를 인덱스에 추가"""
+        tokens = self.tokenize(prompt)
+        if not tokens:
+            return
+
+        doc_id = len(self.token_sets)
+        self.token_sets.append(tokens)
+        for token in self.prefix_tokens(tokens):
+            self.postings.setdefault(token, []).append(doc_id)
+
+    def has_similar(self, prompt):
+        """자카드 유사도가 threshold 를 넘는 기존 프롬프트가 있는지 확인"""
+        tokens = self.tokenize(prompt)
+        if not tokens:
+            return False
+
+        size = len(tokens)
+        min_size = self.threshold * size
+        max_size = size / self.threshold if self.threshold > 0 else float('inf')
+        checked = set()
+
+        for token in self.prefix_tokens(tokens):
+            for doc_id in self.postings.get(token, ()):
+                if doc_id in checked:
+                    continue
+                checked.add(doc_id)
+
+                other = self.token_sets[doc_id]
+                # 크기 필터: 길이 차이가 크면 임계값을 넘을 수 없음
+                if len(other) < min_size or len(other) > max_size:
+                    continue
+
+                intersection = len(tokens & other)
+                union = size + len(other) - intersection
+                if intersection / union > self.threshold:
+                    return True
+
+        return False
+
+    def __len__(self):
+        return len(self.token_sets)
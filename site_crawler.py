@@ -0,0 +1,249 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+
+from autocomplete_harvester import RateLimiter, run_sync
+from page_extractor import extract_page
+
+DEFAULT_CRAWL_CACHE = "site_crawl_cache.json"
+DEFAULT_HTML_BACKEND = "auto"   # lxml 이 있으면 lxml, 없으면 표준 HTMLParser 스트리밍
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+# 본문이 아닌 리소스 링크는 따라가지 않음
+SKIP_EXTENSIONS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.pdf', '.zip', '.hwp',
+    '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.mp3', '.mp4', '.css', '.js',
+)
+
+
+def parse_page(url: str, html, backend: str = DEFAULT_HTML_BACKEND) -> Dict:
+    """HTML → fetch_website_content 와 같은 형식의 결과 dict (page_extractor 한 번 순회 추출)
+
+    추가 키: 'links' (a 태그 href 목록), 'spaced_text' (문자열 사이를 공백으로 이은 본문 텍스트)
+    """
+    return extract_page(url, html, backend)
+
+
+def strip_extras(page: Dict) -> Dict:
+    """parse_page 결과에서 추가 키를 뺀 fetch_website_content 형식"""
+    return {key: value for key, value in page.items() if key not in ('links', 'spaced_text')}
+
+
+def normalize_url(url: str) -> str:
+    """프래그먼트(#...) 제거, 빈 경로는 '/' 로"""
+    url, _ = urldefrag(url)
+    parsed = urlparse(url)
+    if not parsed.path:
+        url = parsed._replace(path='/').geturl()
+    return url
+
+
+def same_site(netloc: str, other: str) -> bool:
+    """www. 유무는 같은 사이트로 취급"""
+    strip = lambda host: host.lower()[4:] if host.lower().startswith('www.') else host.lower()
+    return strip(netloc) == strip(other)
+
+
+class SiteCrawler:
+    """같은 도메인 링크를 따라가는 비동기 사이트 크롤러 (BFS, 페이지/깊이 예산)
+
+    robots.txt 를 지키고 Crawl-delay 가 있으면 요청 간격에 반영한다.
+    ETag / Last-Modified 를 캐시 파일에 저장해 두었다가 다음 실행에서 조건부 GET 을
+    보내고, 304 면 저장해 둔 파싱 결과를 그대로 사용한다.
+    HTML 파싱은 워커 프로세스 풀에서 하고, 파싱된 페이지는 on_page 콜백으로 바로 넘긴다.
+    start_url 을 site_fixture_server 주소로 바꾸면 오프라인으로 시험할 수 있다.
+    """
+
+    def __init__(self, start_url: str, max_pages: int = 30, max_depth: int = 3, concurrency: int = 4,
+                 rate: float = 2.0, workers: int = 2, timeout: float = 10.0,
+                 user_agent: str = DEFAULT_USER_AGENT, cache_path: Optional[str] = DEFAULT_CRAWL_CACHE,
+                 respect_robots: bool = True, html_backend: str = DEFAULT_HTML_BACKEND, verbose: bool = True):
+        self.start_url = normalize_url(start_url)
+        self.netloc = urlparse(self.start_url).netloc
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.concurrency = concurrency
+        self.rate = rate
+        self.workers = workers
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.cache_path = cache_path
+        self.respect_robots = respect_robots
+        self.html_backend = html_backend
+        self.verbose = verbose
+
+        self.robots = None
+        self.validators = self.load_validators()
+        self.stats = {"fetched": 0, "not_modified": 0, "robots_blocked": 0, "skipped": 0, "errors": 0}
+
+    def load_validators(self) -> Dict[str, Dict]:
+        """이전 실행의 ETag / Last-Modified + 파싱 결과 로드"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 크롤 캐시를 읽지 못했습니다 ({self.cache_path}): {e}")
+            return {}
+
+    def save_validators(self):
+        if not self.cache_path:
+            return
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(self.validators, f, ensure_ascii=False)
+
+    def allowed(self, url: str) -> bool:
+        """같은 사이트 + 리소스 파일 아님 + robots.txt 허용"""
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or not same_site(parsed.netloc, self.netloc):
+            return False
+        if parsed.path.lower().endswith(SKIP_EXTENSIONS):
+            return False
+        if self.robots is not None and not self.robots.can_fetch(self.user_agent, url):
+            self.stats["robots_blocked"] += 1
+            return False
+        return True
+
+    async def load_robots(self, session: aiohttp.ClientSession):
+        """robots.txt 로드 (없거나 실패하면 전체 허용)"""
+        robots_url = urljoin(self.start_url, '/robots.txt')
+        parser = RobotFileParser(robots_url)
+        try:
+            async with session.get(robots_url) as response:
+                if response.status == 200:
+                    parser.parse((await response.text()).splitlines())
+                else:
+                    parser.parse([])
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if self.verbose:
+                print(f"   ⚠️ robots.txt 확인 실패 ({e}) - 전체 허용으로 진행")
+            parser.parse([])
+
+        self.robots = parser
+        delay = parser.crawl_delay(self.user_agent)
+        if delay:
+            self.rate = min(self.rate, 1.0 / float(delay)) if self.rate else 1.0 / float(delay)
+
+    async def fetch(self, session: aiohttp.ClientSession, limiter: RateLimiter, url: str):
+        """조건부 GET → ('fetched', 본문 bytes, 최종 URL) / ('not_modified', None, url) / (None, None, url)"""
+        headers = {}
+        cached = self.validators.get(url)
+        if cached and cached.get('page'):
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        await limiter.wait()
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and cached and cached.get('page'):
+                    self.stats["not_modified"] += 1
+                    return 'not_modified', None, url
+
+                if response.status != 200:
+                    print(f"   ❌ {url} HTTP 오류: {response.status}")
+                    self.stats["errors"] += 1
+                    return None, None, url
+
+                if 'html' not in response.headers.get('Content-Type', 'text/html'):
+                    self.stats["skipped"] += 1
+                    return None, None, url
+
+                body = await response.read()
+                final_url = normalize_url(str(response.url))
+                self.validators[url] = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
+                self.stats["fetched"] += 1
+                return 'fetched', body, final_url
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"   ❌ {url} 접근 오류: {e}")
+            self.stats["errors"] += 1
+            return None, None, url
+
+    async def crawl_async(self, on_page: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """시작 URL 부터 BFS 크롤링 → 파싱된 페이지 목록 (발견 순서)"""
+        pages = []
+        seen = {self.start_url}
+        frontier = [self.start_url]
+        started = time.monotonic()
+
+        loop = asyncio.get_running_loop()
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def visit(session, limiter, url):
+            async with semaphore:
+                state, body, final_url = await self.fetch(session, limiter, url)
+            if state == 'not_modified':
+                return self.validators[url]['page']
+            if state is None:
+                return None
+            # 파싱은 CPU 작업이라 워커 풀에서 (workers<=1 이면 현재 프로세스)
+            page = await loop.run_in_executor(executor, parse_page, final_url, body, self.html_backend)
+            self.validators[url]['page'] = page
+            return page
+
+        try:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                             headers={'User-Agent': self.user_agent}) as session:
+                if self.respect_robots:
+                    await self.load_robots(session)
+                limiter = RateLimiter(self.rate)
+
+                if not self.allowed(self.start_url):
+                    print(f"   ❌ 시작 주소를 크롤링할 수 없습니다 (robots.txt 또는 도메인): {self.start_url}")
+                    return pages
+
+                for depth in range(self.max_depth + 1):
+                    budget = self.max_pages - len(pages)
+                    if not frontier or budget <= 0:
+                        break
+
+                    batch, frontier = frontier[:budget], []
+                    if self.verbose:
+                        print(f"🕸️ 깊이 {depth}: {len(batch)}개 페이지 수집 중...")
+
+                    results = await asyncio.gather(*(visit(session, limiter, url) for url in batch))
+
+                    for page in results:
+                        if page is None:
+                            continue
+                        pages.append(page)
+                        if on_page is not None:
+                            on_page(page)
+
+                        for href in page.get('links', []):
+                            link = normalize_url(urljoin(page['url'], href))
+                            if link not in seen:
+                                seen.add(link)
+                                if self.allowed(link):
+                                    frontier.append(link)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            self.save_validators()
+
+        if self.verbose:
+            elapsed = time.monotonic() - started
+            print(f"📊 크롤링 완료: {len(pages)}페이지 (새로 받음 {self.stats['fetched']}, "
+                  f"변경 없음 {self.stats['not_modified']}, robots 제외 {self.stats['robots_blocked']}, "
+                  f"오류 {self.stats['errors']}), {elapsed:.2f}초")
+
+        return pages
+
+    def crawl(self, on_page: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """동기 크롤링 (이미 이벤트 루프가 돌고 있으면 별도 스레드에서 실행)"""
+        return run_sync(self.crawl_async(on_page))
@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import hashlib
+import mimetypes
+import os
+from email.utils import formatdate
+
+from aiohttp import web
+
+SYNTHETIC_SECTIONS = {
+    "civil": ("민사소송", ["손해배상", "채권회수", "부당이득", "계약분쟁"]),
+    "criminal": ("형사변호", ["사기", "폭행", "음주운전", "보이스피싱"]),
+    "family": ("가사소송", ["이혼", "양육권", "재산분할", "상속"]),
+    "corporate": ("기업법무", ["계약검토", "노무", "지식재산권", "회생파산"]),
+}
+
+ROBOTS_TXT = "User-agent: *\nDisallow: /admin/\n"
+
+
+def synthetic_site(pages_per_section=4):
+    """법무법인 홈페이지를 흉내낸 정적 사이트 {경로: HTML} (링크로 서로 연결됨)"""
+    site = {}
+    nav = "".join(f'<li><a href="/{slug}/">{name}</a></li>' for slug, (name, _) in SYNTHETIC_SECTIONS.items())
+
+    site["/"] = (
+        "<html><head><title>법무법인 동래 | 부산 연제구 변호사</title>"
+        '<meta name="description" content="부산 연제구 거제역 법무법인 동래 법률상담">'
+        '<meta name="keywords" content="법무법인 동래, 연제 변호사, 부산 법률상담">'
+        "<style>body { color: #333; }</style></head><body>"
+        f"<nav><ul>{nav}</ul></nav><h1>법무법인 동래</h1>"
+        "<p>부산 연제구 거제역 인근 법무법인 동래입니다. 민사, 형사, 가사, 기업법무 상담을 제공합니다.</p>"
+        '<a href="/admin/">관리자</a> <a href="https://example.com/">외부 링크</a> '
+        '<a href="/files/brochure.pdf">소개서</a> <a href="#top">맨 위로</a>'
+        "<script>var tracking = '추적 스크립트';</script></body></html>"
+    )
+    site["/admin/"] = "<html><head><title>관리자</title></head><body><h1>관리자 전용</h1></body></html>"
+
+    for slug, (name, topics) in SYNTHETIC_SECTIONS.items():
+        links = "".join(f'<li><a href="/{slug}/{i}.html">{topics[i % len(topics)]} 사례 {i}</a></li>'
+                        for i in range(pages_per_section))
+        site[f"/{slug}/"] = (
+            f"<html><head><title>{name} | 법무법인 동래</title></head><body><nav><ul>{nav}</ul></nav>"
+            f"<h1>{name}</h1><h2>연제 {name} 변호사</h2><p>{name} 전문 변호사가 직접 상담합니다.</p>"
+            f"<ul>{links}</ul></body></html>"
+        )
+        for i in range(pages_per_section):
+            topic = topics[i % len(topics)]
+            site[f"/{slug}/{i}.html"] = (
+                f"<html><head><title>{topic} 사례 {i} | {name}</title></head><body>"
+                f'<a href="/">홈</a> <a href="/{slug}/">{name}</a>'
+                f"<h2>{topic} 사건 해결 사례</h2><h3>부산 {topic} 상담</h3>"
+                f"<p>연제구 의뢰인의 {topic} 사건을 법무법인 동래가 해결한 사례입니다. "
+                f"{topic} 절차와 비용, 준비 서류를 안내합니다.</p></body></html>"
+            )
+
+    return site
+
+
+def load_static_site(root):
+    """디렉터리의 파일들을 {경로: 내용} 으로 로드 (index.html 은 디렉터리 경로로도 제공)"""
+    site = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            full_path = os.path.join(dirpath, filename)
+            route = "/" + os.path.relpath(full_path, root).replace(os.sep, "/")
+            with open(full_path, "rb") as f:
+                site[route] = f.read()
+            if filename == "index.html":
+                site[route[:-len("index.html")]] = site[route]
+    return site
+
+
+def create_app(site=None, robots=ROBOTS_TXT, latency=0.01):
+    """정적 사이트 픽스처 서버 (ETag / Last-Modified 조건부 GET 지원)
+
+    site 는 {경로: HTML 문자열 또는 bytes}. 없으면 synthetic_site() 를 쓴다.
+    같은 내용이면 ETag 가 같으므로 두 번째 크롤링부터 304 를 돌려준다.
+    """
+    site = synthetic_site() if site is None else site
+    last_modified = formatdate(usegmt=True)
+    stats = {"requests": 0, "not_modified": 0, "paths": {}}
+
+    async def serve(request):
+        path = request.path
+        stats["requests"] += 1
+        stats["paths"][path] = stats["paths"].get(path, 0) + 1
+
+        if latency:
+            await asyncio.sleep(latency)
+
+        if path == "/robots.txt" and robots is not None and path not in site:
+            return web.Response(text=robots, content_type="text/plain")
+        if path not in site:
+            return web.Response(status=404, text="not found")
+
+        body = site[path]
+        body = body.encode("utf-8") if isinstance(body, str) else body
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+
+        if request.headers.get("If-None-Match") == etag or (
+                "If-None-Match" not in request.headers and request.headers.get("If-Modified-Since") == last_modified):
+            stats["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag, "Last-Modified": last_modified})
+
+        content_type = mimetypes.guess_type(path)[0] if not path.endswith("/") else "text/html"
+        return web.Response(body=body, headers={"ETag": etag, "Last-Modified": last_modified},
+                            content_type=content_type or "text/html", charset="utf-8")
+
+    async def stats_handler(request):
+        return web.json_response(stats)
+
+    app = web.Application()
+    app.router.add_get("/__stats", stats_handler)
+    app.router.add_get("/{tail:.*}", serve)
+    app["stats"] = stats
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사이트 크롤러용 정적 사이트 픽스처 서버")
+    parser.add_argument("--port", type=int, default=8092)
+    parser.add_argument("--root", help="제공할 정적 사이트 디렉터리 (없으면 내장 가짜 사이트)")
+    parser.add_argument("--pages", type=int, default=4, help="내장 사이트의 분야별 사례 페이지 수")
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    site = load_static_site(args.root) if args.root else synthetic_site(args.pages)
+    print(f"🧪 사이트 픽스처 서버 실행: http://127.0.0.1:{args.port}/ ({len(site)}개 경로)")
+    print(f"   SiteCrawler('http://127.0.0.1:{args.port}/') 로 연결하세요")
+    web.run_app(create_app(site, latency=args.latency), host="127.0.0.1", port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+import argparse
+import random
+import time
+from bisect import bisect_right
+from string import Formatter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class CompiledTemplate:
+    """str.format 템플릿을 한 번만 파싱해 둔 [문자열, 슬롯, 문자열, ...] 목록
+
+    매번 format 문자열을 다시 파싱하지 않고, 실제로 쓰는 자리표시자(fields)만
+    채우므로 템플릿에 없는 키워드 풀에서 random.choice 를 돌릴 필요가 없다.
+    결과는 같은 값으로 template.format(**values) 한 것과 같다.
+    """
+
+    _cache = {}
+
+    def __init__(self, template: str):
+        self.template = template
+        self.parts = []   # 짝수 자리는 고정 문자열, 홀수 자리는 슬롯 이름
+        literal = []
+        for text, name, spec, conversion in Formatter().parse(template):
+            literal.append(text)
+            if name is None:
+                continue
+            if not name or spec or conversion or not name.isidentifier():
+                raise ValueError(f"단순 {{이름}} 자리표시자만 지원합니다: {template}")
+            self.parts.append(''.join(literal))
+            self.parts.append(name)
+            literal = []
+        self.parts.append(''.join(literal))
+        self.slots = self.parts[1::2]
+        self.fields = tuple(dict.fromkeys(self.slots))
+
+    @classmethod
+    def compile(cls, template: str) -> "CompiledTemplate":
+        """같은 문자열은 프로세스당 한 번만 컴파일"""
+        compiled = cls._cache.get(template)
+        if compiled is None:
+            compiled = cls._cache[template] = cls(template)
+        return compiled
+
+    def fill(self, values: Dict[str, str]) -> str:
+        """{슬롯: 값} 으로 채움 (없는 슬롯은 KeyError - str.format 과 동일)"""
+        parts = self.parts[:]
+        for i in range(1, len(parts), 2):
+            parts[i] = values[parts[i]]
+        return ''.join(parts)
+
+    def fill_random(self, pools: Dict[str, Sequence[str]], rng=random) -> str:
+        """쓰이는 슬롯만 풀에서 하나씩 골라 채움"""
+        return self.fill({name: rng.choice(pools[name]) for name in self.fields})
+
+    def fill_batch(self, pools: Dict[str, Sequence[str]], count: int, rng=None) -> List[str]:
+        """count 개를 한 번에 채움 - 슬롯별 무작위 인덱스를 NumPy 로 한꺼번에 뽑음"""
+        rng = rng if rng is not None else np.random.default_rng()
+        columns = []
+        for name in self.fields:
+            pool = pools[name]
+            picks = rng.integers(0, len(pool), size=count)
+            columns.append([pool[i] for i in picks.tolist()])
+
+        position = {name: i for i, name in enumerate(self.fields)}
+        order = [position[name] for name in self.slots]
+        literals = self.parts[0::2]
+        results = []
+        for row in zip(*columns) if columns else [()] * count:
+            parts = [literals[0]]
+            for i, column in enumerate(order):
+                parts.append(row[column])
+                parts.append(literals[i + 1])
+            results.append(''.join(parts))
+        return results
+
+
+class CompiledTemplateSet:
+    """템플릿 목록을 한 번에 컴파일 - 무작위 템플릿 + 필요한 키워드만 채움"""
+
+    def __init__(self, templates: Sequence[str]):
+        self.templates = [CompiledTemplate.compile(template) for template in templates]
+        self.fields = tuple(dict.fromkeys(name for template in self.templates for name in template.fields))
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def choose(self, rng=random) -> CompiledTemplate:
+        return rng.choice(self.templates)
+
+    def fill(self, values: Dict[str, str], rng=random) -> str:
+        """무작위 템플릿 하나를 주어진 값으로 채움"""
+        return self.choose(rng).fill(values)
+
+    def fill_random(self, pools: Dict[str, Sequence[str]], rng=random) -> str:
+        return self.choose(rng).fill_random(pools, rng)
+
+    def fill_batch(self, pools: Dict[str, Sequence[str]], count: int, rng=None) -> List[str]:
+        """count 개를 한 번에 생성 - 템플릿 선택과 슬롯 인덱스를 NumPy 로 한꺼번에 뽑음
+
+        템플릿별로 모아 채운 뒤 원래 뽑힌 순서대로 돌려준다.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        choices = rng.integers(0, len(self.templates), size=count)
+        results = [None] * count
+        for position, template in enumerate(self.templates):
+            rows = np.flatnonzero(choices == position)
+            if not len(rows):
+                continue
+            for row, prompt in zip(rows.tolist(), template.fill_batch(pools, len(rows), rng)):
+                results[row] = prompt
+        return results
+
+
+class LazyPermutation:
+    """[0, size) 의 무작위 순열을 한 개씩 꺼내는 지연 Fisher-Yates
+
+    전체 배열을 만들지 않고 바뀐 자리만 dict 에 기억하므로
+    꺼낼 때마다 O(1), 메모리는 꺼낸 개수만큼만 쓴다.
+    """
+
+    def __init__(self, size: int, rng: Optional[random.Random] = None):
+        self.size = size
+        self.drawn = 0
+        self.swaps = {}
+        self.rng = rng or random.Random()
+
+    @property
+    def remaining(self) -> int:
+        return self.size - self.drawn
+
+    def next(self) -> Optional[int]:
+        """다음 인덱스 (다 꺼냈으면 None)"""
+        if self.drawn >= self.size:
+            return None
+        i = self.drawn
+        j = self.rng.randrange(i, self.size)
+        value_i = self.swaps.get(i, i)
+        value_j = self.swaps.get(j, j)
+        self.swaps[j] = value_i
+        self.swaps.pop(i, None)
+        self.drawn += 1
+        return value_j
+
+
+class TemplateSpace:
+    """템플릿 목록 × 키워드 풀의 전체 조합 공간 - 중복 없이 무작위 추출
+
+    템플릿마다 실제로 쓰는 자리표시자의 풀 크기를 곱한 만큼의 조합이 있고,
+    전체 공간은 그 합이다. 0..size-1 인덱스를 템플릿 구간(누적 합) + 혼합 기수
+    (mixed radix)로 풀어 조합 하나에 대응시키므로, 무작위 순열에서 인덱스를 꺼내면
+    재시도 없이 매번 처음 보는 조합이 나온다.
+    """
+
+    def __init__(self, templates: Sequence[str], pools: Dict[str, Sequence[str]],
+                 rng: Optional[random.Random] = None):
+        self.templates = list(templates)
+        self.pools = {name: list(values) for name, values in pools.items()}
+        self.fields = []
+        self.offsets = []
+        self.compiled = [CompiledTemplate.compile(template) for template in self.templates]
+        size = 0
+
+        for template, compiled in zip(self.templates, self.compiled):
+            fields = list(compiled.fields)
+            missing = [name for name in fields if not self.pools.get(name)]
+            if missing:
+                raise KeyError(f"키워드 풀이 없는 자리표시자: {', '.join(missing)} ({template})")
+            self.fields.append(fields)
+            self.offsets.append(size)
+            count = 1
+            for name in fields:
+                count *= len(self.pools[name])
+            size += count
+
+        self.size = size
+        self.permutation = LazyPermutation(size, rng)
+
+    @property
+    def remaining(self) -> int:
+        """아직 꺼내지 않은 조합 수"""
+        return self.permutation.remaining
+
+    def locate(self, index: int) -> Tuple[int, Dict[str, str]]:
+        """인덱스 → (템플릿 번호, {자리표시자: 키워드})"""
+        position = bisect_right(self.offsets, index) - 1
+        rest = index - self.offsets[position]
+        values = {}
+        for name in reversed(self.fields[position]):
+            pool = self.pools[name]
+            rest, digit = divmod(rest, len(pool))
+            values[name] = pool[digit]
+        return position, values
+
+    def decode(self, index: int) -> Tuple[str, Dict[str, str]]:
+        """인덱스 → (템플릿, {자리표시자: 키워드})"""
+        position, values = self.locate(index)
+        return self.templates[position], values
+
+    def render(self, index: int) -> str:
+        position, values = self.locate(index)
+        return self.compiled[position].fill(values)
+
+    def draw(self) -> Optional[str]:
+        """처음 보는 조합 하나를 채운 문장 (공간을 다 썼으면 None)"""
+        index = self.permutation.next()
+        if index is None:
+            return None
+        return self.render(index)
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            prompt = self.draw()
+            if prompt is None:
+                return
+            yield prompt
+
+
+def format_all(templates: Sequence[str], pools: Dict[str, Sequence[str]]) -> str:
+    """기존 방식 - 매번 템플릿을 파싱하고 모든 풀에서 키워드를 뽑아 str.format"""
+    template = random.choice(templates)
+    return template.format(**{name: random.choice(pool) for name, pool in pools.items()})
+
+
+def benchmark(templates: Sequence[str], pools: Dict[str, Sequence[str]], count: int = 1000000,
+              chunk: int = 100000) -> Dict[str, float]:
+    """같은 템플릿/풀로 count 개 생성 시간 비교 (기존 str.format / 컴파일 / NumPy 배치)"""
+    compiled = CompiledTemplateSet(templates)
+    rng = np.random.default_rng()
+    runs = {
+        "format": lambda n: [format_all(templates, pools) for _ in range(n)],
+        "compiled": lambda n: [compiled.fill_random(pools) for _ in range(n)],
+        "batch": lambda n: compiled.fill_batch(pools, n, rng),
+    }
+
+    print(f"📊 템플릿 채우기 벤치마크: 템플릿 {len(templates)}개, {count:,}개 생성")
+    timings = {}
+    for name, run in runs.items():
+        started = time.perf_counter()
+        done = 0
+        while done < count:
+            done += len(run(min(chunk, count - done)))
+        timings[name] = time.perf_counter() - started
+        print(f"  - {name:8s}: {timings[name]:.2f}초 ({count / timings[name]:,.0f}개/초)")
+
+    for name in ("compiled", "batch"):
+        print(f"🚀 {name}: format 대비 {timings['format'] / timings[name]:.1f}배 빠름")
+    return timings
+
+
+def main():
+    """prompt9 의 템플릿/키워드로 채우기 방식별 처리량 측정"""
+    parser = argparse.ArgumentParser(description="템플릿 채우기 방식별 처리량 벤치마크")
+    parser.add_argument("--count", type=int, default=1000000)
+    args = parser.parse_args()
+
+    from prompt9 import DongraeGraderOptimizedGenerator
+
+    generator = DongraeGraderOptimizedGenerator()
+    templates = [template
+                 for intent in ("정보", "탐색", "거래")
+                 for difficulty in ("쉬움", "보통", "어려움")
+                 for template in generator.get_templates(intent, difficulty)]
+    benchmark(templates, generator.keyword_pools(), args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
 import pandas as pd
+import codecs
+import csv
 import json
 import os
 from datetime import datetime
 
+STREAM_READ_SIZE = 64 * 1024      # 한 번에 읽을 바이트 수
+STREAM_CHUNK_ROWS = 500           # CSV 에 한 번에 기록할 행 수
+STREAM_PROGRESS_BYTES = 1024 * 1024  # 진행률 출력 간격 (바이트)
+
 def debug_json_file(file_path):
     """JSON 파일의 구조와 문제점을 진단하는 함수"""
     print(f"🔍 JSON 파일 진단 시작: {file_path}")
@@ -100,8 +106,165 @@ def safe_flatten_json(nested_json, parent_key='', sep='_'):
     
     return dict(items)
 
-def convert_json_to_csv_safe(json_file_name):
-    """안전한 JSON → CSV 변환"""
+def iter_json_array(file_path, read_size=STREAM_READ_SIZE):
+    """최상위 JSON 배열을 항목 단위로 읽어 (인덱스, 항목, 읽은 바이트 수) 를 반환
+
+    json.load 로 파일 전체를 올리지 않고 read_size 만큼씩 읽으면서
+    JSONDecoder.raw_decode 로 항목을 하나씩 꺼내므로 메모리는 항목 크기 수준으로 유지된다.
+    최상위가 배열이 아니면 ValueError.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+    with open(file_path, 'rb') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+
+        def read_more():
+            nonlocal buffer, pos, eof
+            chunk = f.read(read_size)
+            if not chunk:
+                eof = True
+                buffer = buffer[pos:] + text_decoder.decode(b'', final=True)
+            else:
+                buffer = buffer[pos:] + text_decoder.decode(chunk)
+            pos = 0
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return
+                read_more()
+
+        skip_whitespace()
+        if pos >= len(buffer) or buffer[pos] != '[':
+            raise ValueError("최상위가 JSON 배열이 아닙니다")
+        pos += 1
+
+        index = 0
+        skip_whitespace()
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+
+        while True:
+            skip_whitespace()
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # 숫자 등이 버퍼 끝에서 잘렸을 수 있으므로 끝에 닿으면 더 읽고 다시 해석
+                if end == len(buffer) and not eof:
+                    raise json.JSONDecodeError("버퍼 끝", buffer, end)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                read_more()
+                continue
+
+            pos = end
+            yield index, item, f.tell()
+            index += 1
+
+            skip_whitespace()
+            if pos >= len(buffer):
+                raise ValueError("JSON 배열이 닫히지 않았습니다 (']' 누락)")
+            if buffer[pos] == ']':
+                return
+            if buffer[pos] != ',':
+                raise ValueError(f"항목 {index} 뒤에 ',' 또는 ']' 가 필요합니다")
+            pos += 1
+
+            # 처리한 앞부분은 버려서 버퍼가 계속 커지지 않도록 함
+            buffer = buffer[pos:]
+            pos = 0
+
+
+def flatten_json_item(i, item):
+    """배열 항목 하나를 CSV 행으로 변환 (건너뛸 항목이면 None) + 경고 메시지"""
+    if item is None:
+        return None, f"⚠️ 항목 {i}: None 값 건너뜀"
+
+    if not isinstance(item, dict):
+        return {'item_index': i, 'raw_data': str(item)}, f"⚠️ 항목 {i}: dict가 아님 ({type(item).__name__}) - 문자열로 변환"
+
+    if len(item) == 0:
+        return None, f"⚠️ 항목 {i}: 빈 dict 건너뜀"
+
+    try:
+        flattened = safe_flatten_json(item)
+        flattened['item_index'] = i  # 원본 인덱스 추가
+        return flattened, None
+    except Exception as e:
+        return {'item_index': i, 'error': str(e), 'raw_data': str(item)[:500]}, f"❌ 항목 {i} 처리 오류: {e}"
+
+
+def debug_json_file_stream(file_path):
+    """JSON 배열을 스트리밍으로 진단하고 CSV 컬럼 목록을 수집 (전체 로드 없음)"""
+    print(f"🔍 JSON 파일 스트리밍 진단 시작: {file_path}")
+
+    file_size = os.path.getsize(file_path)
+    columns = {}
+    counts = {"total": 0, "none": 0, "empty": 0, "non_dict": 0}
+    error_items = []
+    first_valid = None
+    next_report = STREAM_PROGRESS_BYTES
+
+    try:
+        for i, item, bytes_read in iter_json_array(file_path):
+            counts["total"] += 1
+            if item is None:
+                counts["none"] += 1
+            elif isinstance(item, dict) and len(item) == 0:
+                counts["empty"] += 1
+            elif not isinstance(item, dict):
+                counts["non_dict"] += 1
+                if len(error_items) < 5:
+                    error_items.append((i, type(item).__name__))
+            elif first_valid is None:
+                first_valid = item
+
+            row, _ = flatten_json_item(i, item)
+            if row is not None:
+                # dict 는 삽입 순서를 유지하므로 DataFrame 과 같은 컬럼 순서가 됨
+                columns.update(dict.fromkeys(row))
+
+            if bytes_read >= next_report:
+                print(f"  진단 진행: {bytes_read:,}/{file_size:,} bytes ({bytes_read/file_size*100:.1f}%)")
+                next_report = bytes_read + STREAM_PROGRESS_BYTES
+    except ValueError as e:
+        print(f"❌ 오류 발생: {str(e)}")
+        return None, 0
+
+    valid_items = counts["total"] - counts["none"] - counts["empty"] - counts["non_dict"]
+
+    print(f"✅ JSON 스트리밍 진단 완료")
+    print(f"📊 리스트 형태 - 총 {counts['total']}개 항목")
+    print(f"📈 데이터 품질 분석:")
+    print(f"  - None 항목: {counts['none']}개")
+    print(f"  - 빈 dict 항목: {counts['empty']}개")
+    print(f"  - dict가 아닌 항목: {counts['non_dict']}개")
+    if error_items:
+        print(f"  - dict가 아닌 항목들: {error_items}...")
+    print(f"  - 유효한 항목: {valid_items}개")
+
+    if first_valid:
+        print(f"🔍 첫 번째 유효 항목 구조:")
+        print(f"  - 키 개수: {len(first_valid.keys())}")
+        print(f"  - 키 목록: {list(first_valid.keys())}")
+        if 'prompt' in first_valid:
+            prompt = first_valid['prompt']
+            print(f"  - prompt 길이: {len(str(prompt))}")
+            print(f"  - prompt 미리보기: {str(prompt)[:100]}...")
+
+    return list(columns), valid_items
+
+def convert_json_to_csv_safe(json_file_name, stream=False):
+    """안전한 JSON → CSV 변환 (stream=True 면 항목 단위 스트리밍 변환)"""
+    if stream:
+        return convert_json_to_csv_stream(json_file_name)
+
     print(f"🚀 JSON → CSV 변환 시작")
     print(f"📁 작업 디렉토리: {os.getcwd()}")
     print(f"📄 대상 파일: {json_file_name}")
@@ -223,6 +386,106 @@ def convert_json_to_csv_safe(json_file_name):
     
     return True
 
+def convert_json_to_csv_stream(json_file_name, chunk_rows=STREAM_CHUNK_ROWS):
+    """스트리밍 JSON → CSV 변환 (메모리 사용량 일정)
+
+    1차로 배열을 훑어 진단과 컬럼 수집을 하고, 2차로 다시 훑으면서
+    safe_flatten_json 결과를 chunk_rows 행씩 CSV 에 바로 기록한다.
+    """
+    print(f"🚀 JSON → CSV 스트리밍 변환 시작")
+    print(f"📁 작업 디렉토리: {os.getcwd()}")
+    print(f"📄 대상 파일: {json_file_name}")
+
+    if not os.path.exists(json_file_name):
+        print(f"❌ 파일을 찾을 수 없습니다: {json_file_name}")
+        return False
+
+    file_size = os.path.getsize(json_file_name)
+    print(f"📏 파일 크기: {file_size:,} bytes ({file_size/1024/1024:.2f} MB)")
+
+    # 최상위가 배열이 아니면(단일 객체) 기존 방식으로 처리
+    with open(json_file_name, 'r', encoding='utf-8-sig') as f:
+        first_char = f.read(1)
+        while first_char and first_char.isspace():
+            first_char = f.read(1)
+    if first_char != '[':
+        print("📊 단일 객체 형태 - 기존 방식으로 변환")
+        return convert_json_to_csv_safe(json_file_name)
+
+    columns, expected_count = debug_json_file_stream(json_file_name)
+    if columns is None:
+        print("❌ JSON 파일을 읽을 수 없습니다.")
+        return False
+    if not columns:
+        print("❌ 처리된 데이터가 없습니다.")
+        return False
+
+    print(f"\n🔄 데이터 변환 시작 (예상 {expected_count}개 항목, {len(columns)}개 컬럼)")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base_name = json_file_name.replace('.json', '')
+    output_filename = f"{base_name}_fixed_{timestamp}.csv"
+
+    total_items = 0
+    written = 0
+    error_count = 0
+    previews = []
+    next_report = 0
+
+    try:
+        with open(output_filename, 'w', encoding='utf-8', newline='') as out:
+            writer = csv.DictWriter(out, fieldnames=columns, restval='', lineterminator='\n')  # pandas to_csv 와 같은 줄바꿈
+            writer.writeheader()
+            chunk = []
+
+            for i, item, bytes_read in iter_json_array(json_file_name):
+                total_items += 1
+                if bytes_read >= next_report:
+                    print(f"진행률: {bytes_read:,}/{file_size:,} bytes ({bytes_read/file_size*100:.1f}%)")
+                    next_report = bytes_read + STREAM_PROGRESS_BYTES
+
+                row, message = flatten_json_item(i, item)
+                if message:
+                    print(message)
+                    if 'error' in (row or {}):
+                        error_count += 1
+                if row is None:
+                    continue
+
+                if len(previews) < 3 and 'prompt' in row:
+                    previews.append(str(row['prompt']))
+
+                chunk.append({k: ('' if v is None else v) for k, v in row.items()})
+                if len(chunk) >= chunk_rows:
+                    writer.writerows(chunk)
+                    written += len(chunk)
+                    chunk = []
+
+            if chunk:
+                writer.writerows(chunk)
+                written += len(chunk)
+    except (ValueError, OSError) as e:
+        print(f"❌ CSV 저장 오류: {e}")
+        return False
+
+    print(f"\n📊 처리 결과:")
+    print(f"  - 원본 항목 수: {total_items}")
+    print(f"  - 성공적으로 처리된 항목: {written}")
+    print(f"  - 오류 발생 항목: {error_count}")
+    print(f"✅ CSV 저장 성공: {output_filename}")
+
+    output_size = os.path.getsize(output_filename)
+    print(f"📏 출력 파일 크기: {output_size:,} bytes ({output_size/1024/1024:.2f} MB)")
+
+    print(f"\n📋 결과 미리보기:")
+    print(f"컬럼명 (총 {len(columns)}개): {columns[:10]}...")
+    if previews:
+        print(f"\nPrompt 샘플 (처음 {len(previews)}개):")
+        for i, prompt in enumerate(previews, 1):
+            print(f"  {i}. {prompt[:100]}...")
+
+    return True
+
 # 실행 부분
 if __name__ == "__main__":
     # ★★★ 여기에 실제 JSON 파일명을 입력하세요! ★★★
@@ -231,7 +494,8 @@ if __name__ == "__main__":
     print("=== JSON → CSV 안전 변환기 ===")
     print("문제점을 진단하고 안전하게 변환합니다.\n")
     
-    success = convert_json_to_csv_safe(JSON_FILE_NAME)
+    # 큰 파일도 메모리 사용량이 일정하도록 스트리밍 모드로 변환
+    success = convert_json_to_csv_safe(JSON_FILE_NAME, stream=True)
     
     if success:
         print("\n🎉 변환 완료!")